@@ -0,0 +1,348 @@
+"""
+Навантажувальний тест API: сценарії типового трафіку бібліотеки.
+
+Засіває в БД каталог з префіксом ISBN bench-load-, після чого кожен сценарій
+по черзі ганяє --concurrency клієнтів протягом --duration секунд:
+
+    catalog            сторінки каталогу з переходом за next_cursor і картки книг
+    search             фільтр за жанрами та повнотекстовий пошук
+    reservation_storm  усі клієнти бронюють одну книгу з --hot-copies примірниками
+    login_burst        паралельні логіни (bcrypt)
+    reviews            сторінки відгуків популярної книги
+
+Результат — JSON з RPS, p50/p95/p99 і кодами відповідей по сценаріях та
+ревізією git; --baseline додає зміну відносно збереженого прогону.
+Без --base-url запити йдуть у застосунок в тому ж процесі (ASGITransport),
+з --base-url — у запущений сервер, що дивиться в ту саму DATABASE_URL.
+
+    DATABASE_URL=... python -m benchmarks.load --output before.json
+    DATABASE_URL=... python -m benchmarks.load --baseline before.json
+    DATABASE_URL=... python -m benchmarks.load --scenario search --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+import httpx
+from sqlalchemy import delete, func, or_, select
+
+from benchmarks.stats import compare, summarize
+from src.api.main import app
+from src.api.models.bookdb import Book
+from src.api.models.favorite import Favorite
+from src.api.models.mail_outbox import MailOutbox
+from src.api.models.reservation import Reservation
+from src.api.models.review import Review
+from src.api.models.user import User, UserRole
+from src.core import security
+from src.core.catalog_cache import invalidate_books
+from src.core.database import engine, async_session_maker
+from src.core.migrations import run_migrations
+
+ISBN_PREFIX = "bench-load-"
+EMAIL_DOMAIN = "bench-load.example.com"
+PASSWORD = "bench12345"
+
+GENRES = ["history", "programming", "fantasy", "science", "poetry", "travel", "biography", "art"]
+TITLE_WORDS = ["river", "shadow", "garden", "engine", "winter", "atlas", "silence", "harbor", "letters", "orbit"]
+
+
+@dataclass
+class Fixture:
+    """Засіяні дані, на які посилаються сценарії."""
+    book_ids: list[str]
+    hot_book_id: str
+    review_book_id: str
+    reviews: int
+    login_email: str
+
+
+@dataclass
+class Scenario:
+    name: str
+    # (клієнт, дані, стан воркера, rng) -> відповідь
+    request: Callable[[httpx.AsyncClient, Fixture, dict, random.Random], Awaitable[httpx.Response]]
+    expected: frozenset[int] = frozenset({200})
+    # розігрів змінює дані (бронювання) — такі сценарії міряються з першого запиту
+    warmup: bool = True
+    check: Callable[[Fixture], Awaitable[dict]] | None = field(default=None)
+
+
+async def catalog(client, fx, state, rng):
+    cursor = state.get("cursor")
+    if cursor is None and rng.random() < 0.25:
+        return await client.get(f"/api/books/{rng.choice(fx.book_ids)}")
+
+    params = {"limit": 20, "sort": state.setdefault("sort", rng.choice(["title", "rating"]))}
+    if cursor:
+        params["cursor"] = cursor
+    resp = await client.get("/api/books/", params=params)
+    # читач гортає до п'яти сторінок, потім починає спочатку
+    state["pages"] = state.get("pages", 0) + 1
+    next_cursor = resp.json().get("next_cursor") if resp.status_code == 200 else None
+    if next_cursor and state["pages"] < 5:
+        state["cursor"] = next_cursor
+    else:
+        state.clear()
+    return resp
+
+
+async def search(client, fx, state, rng):
+    if rng.random() < 0.5:
+        genres = rng.sample(GENRES, rng.randint(1, 2))
+        return await client.get("/api/books/search", params={"genres": genres, "available_only": True, "limit": 20})
+    return await client.get("/api/books/search/text", params={"q": rng.choice(TITLE_WORDS), "limit": 20})
+
+
+async def reservation_storm(client, fx, state, rng):
+    # кожен запит — новий читач: конкурують різні користувачі за останні примірники
+    email = f"storm-{uuid4().hex[:12]}@{EMAIL_DOMAIN}"
+    return await client.post("/api/reservations/", json={"book_id": fx.hot_book_id}, headers={"X-User-Email": email})
+
+
+async def check_storm(fx) -> dict:
+    """Інваріант після шторму: видано не більше примірників, ніж є."""
+    async with async_session_maker() as session:
+        book = await session.get(Book, UUID(fx.hot_book_id))
+        reservations = await session.scalar(
+            select(func.count()).select_from(Reservation).where(Reservation.book_id == book.id)
+        )
+    return {
+        "total_copies": book.total_copies,
+        "reserved_count": book.reserved_count,
+        "reservations": reservations,
+        "oversold": book.reserved_count > book.total_copies or reservations != book.reserved_count,
+    }
+
+
+async def login_burst(client, fx, state, rng):
+    return await client.post("/api/users/login", json={"email": fx.login_email, "password": PASSWORD})
+
+
+async def reviews(client, fx, state, rng):
+    skip = rng.randrange(0, max(fx.reviews, 1), 20)
+    return await client.get(f"/api/books/{fx.review_book_id}/reviews", params={"skip": skip, "limit": 20})
+
+
+SCENARIOS = {
+    s.name: s for s in [
+        Scenario("catalog", catalog),
+        Scenario("search", search),
+        Scenario(
+            "reservation_storm", reservation_storm,
+            # 409 — примірники закінчились, очікуваний результат для більшості клієнтів
+            expected=frozenset({201, 409}), warmup=False, check=check_storm,
+        ),
+        Scenario("login_burst", login_burst),
+        Scenario("reviews", reviews),
+    ]
+}
+
+
+async def cleanup() -> None:
+    bench_books = select(Book.id).where(Book.isbn.like(f"{ISBN_PREFIX}%"))
+    bench_users = select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+    async with async_session_maker() as session:
+        for model in (Reservation, Favorite):
+            await session.execute(
+                delete(model).where(or_(model.book_id.in_(bench_books), model.user_id.in_(bench_users)))
+            )
+        await session.execute(delete(MailOutbox).where(MailOutbox.to_email.like(f"%@{EMAIL_DOMAIN}")))
+        # відгуки видаляються каскадом
+        await session.execute(delete(Book).where(Book.isbn.like(f"{ISBN_PREFIX}%")))
+        await session.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+        await session.commit()
+    invalidate_books()
+
+
+async def prepare(books: int, review_count: int, hot_copies: int, seed: int) -> Fixture:
+    await run_migrations()
+    await cleanup()
+    rng = random.Random(seed)
+
+    rows = [
+        Book(
+            title=f"{rng.choice(TITLE_WORDS).title()} {rng.choice(TITLE_WORDS)} {i}",
+            author=f"Author {i % 97}",
+            isbn=f"{ISBN_PREFIX}{i}",
+            genres=rng.sample(GENRES, rng.randint(1, 3)),
+            total_copies=rng.randint(1, 5),
+            reserved_count=0,
+        )
+        for i in range(books)
+    ]
+    hot = Book(title="Hot release", author="Bench", isbn=f"{ISBN_PREFIX}hot", total_copies=hot_copies, reserved_count=0)
+    popular = Book(title="Much reviewed", author="Bench", isbn=f"{ISBN_PREFIX}reviewed", total_copies=1, reserved_count=0)
+    reader = User(
+        id=uuid4(), email=f"login@{EMAIL_DOMAIN}",
+        password_hash=security.hash_password(PASSWORD), role=UserRole.user,
+    )
+    reviewers = [
+        User(id=uuid4(), email=f"reviewer-{i}@{EMAIL_DOMAIN}", password_hash="x", role=UserRole.user)
+        for i in range(review_count)
+    ]
+
+    async with async_session_maker() as session:
+        session.add_all([*rows, hot, popular, reader, *reviewers])
+        await session.flush()
+        ratings = [rng.randint(1, 5) for _ in reviewers]
+        session.add_all(
+            Review(user_id=user.id, book_id=popular.id, rating=rating, comment="Bench review " * 4)
+            for user, rating in zip(reviewers, ratings)
+        )
+        popular.review_count, popular.rating_sum = len(ratings), sum(ratings)
+        await session.commit()
+
+    return Fixture(
+        book_ids=[str(b.id) for b in rows],
+        hot_book_id=str(hot.id),
+        review_book_id=str(popular.id),
+        reviews=review_count,
+        login_email=reader.email,
+    )
+
+
+async def drive(client, scenario: Scenario, fx: Fixture, concurrency: int, duration: float, seed: int):
+    """Ганяє воркерів сценарію duration секунд; повертає (затримки, коди, час)."""
+    timings: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        state: dict = {}
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                resp = await scenario.request(client, fx, state, rng)
+                status = str(resp.status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            timings.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return timings, statuses, time.perf_counter() - started
+
+
+async def run_scenario(client, scenario: Scenario, fx: Fixture, concurrency: int, duration: float,
+                       warmup: float, seed: int) -> dict:
+    if warmup and scenario.warmup:
+        await drive(client, scenario, fx, concurrency, warmup, seed)
+
+    timings, statuses, elapsed = await drive(client, scenario, fx, concurrency, duration, seed)
+    expected = {str(code) for code in scenario.expected}
+    result = {
+        "concurrency": concurrency,
+        **summarize(timings, elapsed),
+        "errors": sum(count for status, count in statuses.items() if status not in expected),
+        "statuses": dict(sorted(statuses.items())),
+    }
+    if scenario.check:
+        result["check"] = await scenario.check(fx)
+    return result
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(
+        scenarios: list[str],
+        concurrency: int,
+        duration: float,
+        warmup: float = 1.0,
+        books: int = 2_000,
+        review_count: int = 200,
+        hot_copies: int = 10,
+        seed: int = 1,
+        base_url: str | None = None,
+) -> dict:
+    fx = await prepare(books, review_count, hot_copies, seed)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    if base_url:
+        client = httpx.AsyncClient(
+            base_url=base_url, timeout=30,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30)
+
+    results = {}
+    async with client:
+        for name in scenarios:
+            results[name] = await run_scenario(
+                client, SCENARIOS[name], fx, concurrency, duration, warmup, seed
+            )
+
+    await cleanup()
+    await engine.dispose()
+    return {
+        "benchmark": "load",
+        "revision": git_revision(),
+        "started_at": started_at,
+        "target": base_url or "in-process",
+        "params": {
+            "concurrency": concurrency,
+            "duration": duration,
+            "warmup": warmup,
+            "books": books,
+            "reviews": review_count,
+            "hot_copies": hot_copies,
+            "seed": seed,
+        },
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="за замовчуванням — усі")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--books", type=int, default=2_000)
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--hot-copies", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url")
+    parser.add_argument("--output", type=Path, help="записати JSON у файл")
+    parser.add_argument("--baseline", type=Path, help="JSON попереднього прогону для порівняння")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(
+        args.scenario or list(SCENARIOS), args.concurrency, args.duration, args.warmup,
+        args.books, args.reviews, args.hot_copies, args.seed, args.base_url,
+    ))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        result["baseline"] = {
+            "revision": baseline.get("revision"),
+            "change_pct": compare(result["scenarios"], baseline["scenarios"]),
+        }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
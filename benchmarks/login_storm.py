@@ -0,0 +1,105 @@
+"""
+Логін-шторм: N паралельних логінів + зонд /api/health.
+
+Показує пропускну здатність логіну та p99 затримки непов'язаного
+ендпоінта, поки йде хешування bcrypt. Режим inline відтворює стару
+поведінку (bcrypt прямо в event loop) для порівняння.
+
+    DATABASE_URL=... python -m benchmarks.login_storm --mode pool
+    DATABASE_URL=... python -m benchmarks.login_storm --mode inline
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from sqlalchemy import delete
+
+from benchmarks.stats import summarize
+from src.api.main import app
+from src.api.models.user import User, UserRole
+from src.api.routes import users as users_route
+from src.core import security
+from src.core.database import engine, async_session_maker
+from src.core.migrations import run_migrations
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "bench12345"
+
+
+async def prepare_user():
+    await run_migrations()
+    async with async_session_maker() as session:
+        await session.execute(delete(User).where(User.email == EMAIL))
+        session.add(User(
+            email=EMAIL,
+            password_hash=security.hash_password(PASSWORD),
+            role=UserRole.user,
+        ))
+        await session.commit()
+
+
+async def run(mode: str, concurrency: int, duration: float, probe_interval: float) -> dict:
+    if mode == "inline":
+        async def verify_inline(plain, hashed):
+            return security.verify_password(plain, hashed)
+        users_route.verify_password_async = verify_inline
+
+    await prepare_user()
+
+    logins: list[float] = []
+    probes: list[float] = []
+    errors = 0
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+
+        async def login_worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                resp = await client.post("/api/users/login", json={"email": EMAIL, "password": PASSWORD})
+                if resp.status_code != 200:
+                    errors += 1
+                logins.append(time.perf_counter() - started)
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get("/api/health")
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(probe_interval)
+
+        started = time.perf_counter()
+        await asyncio.gather(probe(), *(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+    return {
+        "scenario": "login_storm",
+        "mode": mode,
+        "bcrypt_rounds": security.BCRYPT_ROUNDS,
+        "hash_workers": security.PASSWORD_HASH_WORKERS,
+        "concurrency": concurrency,
+        "errors": errors,
+        "login": summarize(logins, elapsed),
+        "unrelated_endpoint": summarize(probes, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["pool", "inline"], default="pool")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.mode, args.concurrency, args.duration, args.probe_interval))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
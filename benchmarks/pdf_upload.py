@@ -0,0 +1,144 @@
+"""
+Пропускна здатність завантаження PDF + зонд /api/health.
+
+N паралельних клієнтів завантажують файли розміром --size-mb у тимчасове
+сховище. Показує MB/s, затримки завантажень і p99 непов'язаного ендпоінта.
+Режим inline виконує запис і хешування прямо в event loop (як старий
+shutil.copyfileobj) для порівняння; --unique вимикає дедуплікацію вмісту.
+
+    DATABASE_URL=... python -m benchmarks.pdf_upload --mode pool
+    DATABASE_URL=... python -m benchmarks.pdf_upload --mode inline
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete
+
+from benchmarks.stats import summarize
+from src.api.main import app
+from src.api.models.bookdb import Book
+from src.api.models.user import User, UserRole
+from src.core import storage as storage_module
+from src.core.database import engine, async_session_maker
+from src.core.migrations import run_migrations
+from src.core.security import create_token
+from src.core.storage import LocalStorage
+from src.services import ebook_service
+
+ISBN_PREFIX = "bench-pdf-"
+EMAIL = "bench-pdf@example.com"
+CHUNK = 64 * 1024
+
+
+async def prepare(books: int) -> tuple[list, dict]:
+    await run_migrations()
+    async with async_session_maker() as session:
+        await session.execute(delete(Book).where(Book.isbn.like(f"{ISBN_PREFIX}%")))
+        await session.execute(delete(User).where(User.email == EMAIL))
+        librarian = User(id=uuid4(), email=EMAIL, password_hash="x", role=UserRole.librarian)
+        rows = [
+            Book(title=f"Bench {i}", author="Bench", isbn=f"{ISBN_PREFIX}{i}", total_copies=1, reserved_count=0)
+            for i in range(books)
+        ]
+        session.add_all([librarian, *rows])
+        await session.commit()
+        token = create_token({"sub": str(librarian.id), "role": UserRole.librarian})
+        return [b.id for b in rows], {"Authorization": f"Bearer {token}"}
+
+
+def make_pdf(size: int, unique: bool) -> bytes:
+    salt = os.urandom(16).hex().encode() if unique else b""
+    body = b"%PDF-1.7\n%" + salt + b"\n"
+    return body + b"0" * max(size - len(body) - 6, 0) + b"%%EOF\n"
+
+
+async def body_stream(data: bytes):
+    for i in range(0, len(data), CHUNK):
+        yield data[i:i + CHUNK]
+
+
+async def run(mode: str, concurrency: int, uploads: int, size_mb: float, unique: bool, probe_interval: float) -> dict:
+    if mode == "inline":
+        async def inline(fn, *args, **kwargs):
+            return fn(*args, **kwargs)
+        storage_module.asyncio.to_thread = inline
+
+    size = int(size_mb * 1024 * 1024)
+    book_ids, headers = await prepare(concurrency)
+
+    timings: list[float] = []
+    probes: list[float] = []
+    errors = 0
+    transport = httpx.ASGITransport(app=app)
+
+    with tempfile.TemporaryDirectory() as root:
+        ebook_service.ebook_storage = LocalStorage(root)
+        queue = asyncio.Queue()
+        for _ in range(uploads):
+            queue.put_nowait(make_pdf(size, unique))
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            done = asyncio.Event()
+
+            async def uploader(book_id):
+                nonlocal errors
+                while not queue.empty():
+                    data = queue.get_nowait()
+                    started = time.perf_counter()
+                    resp = await client.put(f"/api/books/{book_id}/pdf", content=body_stream(data), headers=headers)
+                    if resp.status_code != 200:
+                        errors += 1
+                    timings.append(time.perf_counter() - started)
+
+            async def probe():
+                while not done.is_set():
+                    started = time.perf_counter()
+                    await client.get("/api/health")
+                    probes.append(time.perf_counter() - started)
+                    await asyncio.sleep(probe_interval)
+
+            probe_task = asyncio.create_task(probe())
+            started = time.perf_counter()
+            await asyncio.gather(*(uploader(book_id) for book_id in book_ids))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await probe_task
+
+    await engine.dispose()
+    return {
+        "scenario": "pdf_upload",
+        "mode": mode,
+        "concurrency": concurrency,
+        "size_mb": size_mb,
+        "unique_content": unique,
+        "errors": errors,
+        "throughput_mb_s": round(len(timings) * size / 1024 / 1024 / elapsed, 1) if elapsed else 0.0,
+        "upload": summarize(timings, elapsed),
+        "unrelated_endpoint": summarize(probes, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["pool", "inline"], default="pool")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--uploads", type=int, default=64)
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--unique", action="store_true")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(
+        args.mode, args.concurrency, args.uploads, args.size_mb, args.unique, args.probe_interval
+    ))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
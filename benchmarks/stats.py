@@ -0,0 +1,36 @@
+import math
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Перцентиль методом nearest-rank (samples — у секундах)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float], duration: float) -> dict:
+    """Кількість, RPS і затримки (мс) для набору вимірів."""
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / duration, 1) if duration else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples, default=0.0) * 1000, 2),
+    }
+
+
+def compare(current: dict, baseline: dict, keys=("rps", "p50_ms", "p95_ms", "p99_ms")) -> dict:
+    """Зміна метрик (%) кожного сценарію відносно попереднього прогону."""
+    changes = {}
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: round((result[key] - before[key]) / before[key] * 100, 1) if before.get(key) else None
+            for key in keys
+        }
+    return changes
@@ -55,6 +55,16 @@ function getCoverUrl(book) {
   return "";
 }
 
+// Ширина обкладинки в сітці каталогу (для вибору варіанта з srcset)
+const COVER_SIZES = "(max-width: 600px) 50vw, 280px";
+
+// {"160w": url, ...} -> "url 160w, ..." для srcset
+function toSrcset(byWidth) {
+  return Object.entries(byWidth || {})
+    .map(([width, url]) => `${escapeHtml(url)} ${escapeHtml(width)}`)
+    .join(", ");
+}
+
 function renderCover(book) {
   const coverUrl = getCoverUrl(book);
   const title = escapeHtml(book.title || "книгу");
@@ -65,14 +75,28 @@ function renderCover(book) {
     </div>`;
   }
 
+  // зменшені копії: браузер сам обирає ширину під розмір картки
+  const variants = book.cover_variants;
+  const webpSource = variants?.webp
+    ? `<source type="image/webp" srcset="${toSrcset(variants.webp)}" sizes="${COVER_SIZES}" />`
+    : "";
+  const jpegSrcset = variants?.jpeg
+    ? `srcset="${toSrcset(variants.jpeg)}" sizes="${COVER_SIZES}"`
+    : "";
+
   return `
     <div class="book__cover" data-has-cover>
+      <picture>
+      ${webpSource}
       <img
+        ${jpegSrcset}
+        loading="lazy"
         src="${coverUrl}"
         alt="Обкладинка ${title}"
         onload="this.closest('.book__cover')?.classList.add('is-loaded')"
         onerror="this.style.display='none'; this.closest('.book__cover')?.classList.add('is-broken')"
       />
+      </picture>
       <div class="book__cover--blank">Обкладинка</div>
     </div>
   `;
@@ -371,7 +395,12 @@ async function loadBooks() {
       .map((g) => g.trim())
       .filter(Boolean);
 
-    const url = new URL(`${apiBase().replace(/\/$/, "")}/books/search`, window.location.origin);
+    const query = $("#bookQuery")?.value.trim() || "";
+
+    // З текстом запиту — серверний пошук з ранжуванням, інакше — фільтр каталогу
+    const path = query ? "/books/search/text" : "/books/search";
+    const url = new URL(`${apiBase().replace(/\/$/, "")}${path}`, window.location.origin);
+    if (query) url.searchParams.set("q", query);
     if (availableOnly) url.searchParams.set("available_only", "true");
     genres.forEach((g) => url.searchParams.append("genres", g));
 
@@ -379,7 +408,8 @@ async function loadBooks() {
     const res = await fetch(url, { headers: getAuthHeaders() });
     if (!res.ok) throw new Error(await res.text());
 
-    const books = await res.json();
+    const data = await res.json();
+    const books = query ? data.items : data;
     const list = $("#books");
     list.innerHTML = "";
 
@@ -962,6 +992,9 @@ function escapeHtml(s) {
 document.addEventListener("DOMContentLoaded", () => {
   // Books / favorites / reservations – only if elements exist
   addListener("#loadBooks", "click", loadBooks);
+  $("#bookQuery")?.addEventListener("keydown", (event) => {
+    if (event.key === "Enter") loadBooks();
+  });
   addListener("#loadFavs", "click", loadFavorites);
   addListener("#countFavs", "click", countFavorites);
   addListener("#clearFavs", "click", clearFavorites);
@@ -1,6 +1,7 @@
 from sqlalchemy.future import select
 from src.core.database import SessionLocal
 from src.api.models.bookdb import Book
+from src.core.catalog_cache import invalidate_books
 
 
 async def get_books():
@@ -21,6 +22,7 @@ async def create_book(data: dict):
         db.add(book)
         await db.commit()
         await db.refresh(book)
+        invalidate_books(book.id)
         return book
 
 
@@ -31,4 +33,5 @@ async def delete_book(book_id: int):
             return None
         await db.delete(book)
         await db.commit()
+        invalidate_books(book_id)
         return True
@@ -1,27 +1,56 @@
+import os
+import time
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 from fastapi.staticfiles import StaticFiles
 
 from src.api.routes import books, reservations, users, reminders, reviews
 from src.api.routes.favorites import router as favorites_router
-from src.core.database import Base, engine
+from src.api.routes.pdf import router as pdf_router
+from src.api.routes.covers import router as covers_router
+from src.core.catalog_cache import catalog_cache
+from src.core.database import engine, async_session_maker, pool_stats
+from src.core.migrations import run_migrations
+from src.core.metrics import MetricsMiddleware, render_metrics
+from src.services.mail_outbox_service import mail_worker, get_outbox_stats
+from src.services.reservation_expiry_service import reservation_sweeper
+from src.services.cover_service import shutdown_cover_workers
 
 app = FastAPI(
     title="Library Management API",
     version="0.1.0",
 )
+app.add_middleware(MetricsMiddleware)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 STATIC_DIR = BASE_DIR / "frontend" / "static"
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+# Відправник листів з outbox у процесі API (0 — якщо запущено окремий воркер)
+MAIL_WORKER_IN_PROCESS = os.getenv("MAIL_WORKER_IN_PROCESS", "1") == "1"
+# Прибирання прострочених резервацій у процесі API (0 — якщо запущено окремо)
+EXPIRY_SWEEPER_IN_PROCESS = os.getenv("EXPIRY_SWEEPER_IN_PROCESS", "1") == "1"
 
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("📌 DATABASE: all tables created")
+    await run_migrations()
+    print("📌 DATABASE: migrations applied")
+
+    if MAIL_WORKER_IN_PROCESS:
+        mail_worker.start()
+    if EXPIRY_SWEEPER_IN_PROCESS:
+        reservation_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await mail_worker.stop()
+    await reservation_sweeper.stop()
+    shutdown_cover_workers()
 
 
 # ------------------------
@@ -33,8 +62,49 @@ app.include_router(reservations.router, prefix="/api/reservations")
 app.include_router(reviews.router, prefix="/api")
 app.include_router(reminders.router, prefix="/api/reminders")
 app.include_router(favorites_router, prefix="/api/favorites")
+app.include_router(pdf_router, prefix="/api")
+app.include_router(covers_router, prefix="/api")
 
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/api/health/db")
+async def health_db():
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": repr(exc), "pool": pool_stats()},
+        )
+    roundtrip_ms = round((time.perf_counter() - started) * 1000, 2)
+    return {"status": "ok", "roundtrip_ms": roundtrip_ms, "pool": pool_stats()}
+
+
+@app.get("/api/health/mail")
+async def health_mail():
+    async with async_session_maker() as session:
+        outbox = await get_outbox_stats(session)
+    return {"outbox": outbox, "worker": mail_worker.metrics}
+
+
+@app.get("/api/health/reservations")
+async def health_reservations():
+    return {"expiry": reservation_sweeper.metrics}
+
+
+@app.get("/api/health/catalog-cache")
+async def health_catalog_cache():
+    return catalog_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Метрики у текстовому форматі Prometheus."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -2,3 +2,4 @@ from .bookdb import Book
 from .user import User
 from .review import Review
 from .reservation import Reservation
+from .mail_outbox import MailOutbox
@@ -1,11 +1,32 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index, Float, Computed, cast, event, func, literal_column
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR, JSONB
 from src.core.database import Base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, object_session
+from sqlalchemy.ext.hybrid import hybrid_property
+
+# Конфігурація без стемінгу: каталог змішаний (українською та англійською)
+SEARCH_CONFIG = "simple"
+
+# Пошуковий документ: назва й автор важать найбільше, далі ISBN і опис
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(author, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(isbn, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # стабільний порядок каталогу для курсорної пагінації
+        Index("ix_books_title_id", "title", "id"),
+        # фільтр пошуку за жанрами (genres && :genres)
+        Index("ix_books_genres", "genres", postgresql_using="gin"),
+        # повнотекстовий пошук (триграмні індекси створює міграція, якщо є pg_trgm)
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -17,7 +38,64 @@ class Book(Base):
     reserved_count = Column(Integer, default=0)
 
     cover_image = Column(String, nullable=True)
+    # {"webp": {"160w": url, ...}, "jpeg": {...}} — зменшені копії обкладинки
+    cover_variants = Column(JSONB, nullable=True)
     description = Column(Text, nullable=True)
     published_year = Column(Integer, nullable=True)
 
+    # ключ PDF у сховищі електронних книг (sha256 вмісту)
+    pdf_path = Column(String, nullable=True)
+
+    # агрегати відгуків, підтримуються інкрементально при додаванні/видаленні
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # версія представлення книги (ETag) — збільшується кожним записом, див. touch_book()
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow,
+        server_default=func.timezone("utc", func.now()),
+    )
+
+    # генерується PostgreSQL; не завантажується разом з книгою
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
     reviews = relationship("Review", back_populates="book")
+
+    @property
+    def available_copies(self) -> int:
+        return max((self.total_copies or 0) - (self.reserved_count or 0), 0)
+
+    @hybrid_property
+    def average_rating(self) -> float:
+        if not self.review_count:
+            return 0.0
+        return round(self.rating_sum / self.review_count, 2)
+
+    @average_rating.inplace.expression
+    @classmethod
+    def _average_rating_expression(cls):
+        # літерали замість bind-параметрів, щоб вираз збігався з індексом
+        zero = literal_column("0")
+        return func.coalesce(
+            cast(cls.rating_sum, Float) / func.nullif(cast(cls.review_count, Float), zero, type_=Float),
+            zero,
+        )
+
+
+def touch_book() -> dict:
+    """Значення для UPDATE books: нова версія і час зміни (ETag/Last-Modified)."""
+    return {"version": Book.version + 1, "updated_at": func.timezone("utc", func.now())}
+
+
+# ORM-зміни (update_book тощо) теж змінюють версію; Core UPDATE додають touch_book() явно
+@event.listens_for(Book, "before_update")
+def _touch_on_orm_update(mapper, connection, target: Book):
+    session = object_session(target)
+    if session is not None and session.is_modified(target, include_collections=False):
+        for key, value in touch_book().items():
+            setattr(target, key, value)
+
+
+# сортування каталогу за рейтингом (keyset по (average_rating, id) у спадному порядку)
+Index("ix_books_average_rating_id", Book.average_rating.desc(), Book.id.desc())
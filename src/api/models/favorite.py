@@ -1,14 +1,14 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from src.core.database import Base
-import uuid
+
 
 class Favorite(Base):
     __tablename__ = "favorites"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_email = Column(String, ForeignKey("users.email"), nullable=False)
-    book_id = Column(UUID(as_uuid=True), ForeignKey("books.id"), nullable=False)
+    # (user_id, book_id) — і ключ, і індекс для всіх запитів "обране користувача"
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    book_id = Column(UUID(as_uuid=True), ForeignKey("books.id"), primary_key=True)
 
     book = relationship("Book")
@@ -0,0 +1,33 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Text, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID
+from src.core.database import Base
+
+
+class MailStatus(str, enum.Enum):
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"
+
+
+class MailOutbox(Base):
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        # воркер вибирає лише листи, що чекають відправки
+        Index("ix_mail_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+
+    status = Column(Enum(MailStatus), nullable=False, default=MailStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
@@ -10,10 +10,12 @@ class Reservation(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     book_id = Column(UUID(as_uuid=True), ForeignKey("books.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
 
     from_date = Column(Date, nullable=False, default=date.today)
-    until = Column(Date, nullable=True)
+    until = Column(Date, nullable=True, index=True)
+    # until, для якого вже надіслано нагадування (продовження резервації — нове нагадування)
+    reminder_sent_for = Column(Date, nullable=True)
 
     book = relationship("Book")
 
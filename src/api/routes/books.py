@@ -1,13 +1,30 @@
 import uuid
+from typing import Literal
 from uuid import UUID
 
-from src.core.database import SessionLocal, async_session_maker
+from src.core.database import SessionLocal
 from src.api.models.bookdb import Book
 from src.api.models.user import User
-from src.api.schemas.books import BookCreate, BookUpdate, BookResponse
+from src.api.schemas.books import (
+    BookCreate, BookUpdate, BookResponse, BookPage, BookSearchPage, BookImportReport,
+    BookAvailability, BookBatch, BookBatchRequest,
+)
+from src.core.catalog_cache import CachedBody, catalog_cache, invalidate_books
+from src.core.http_cache import (
+    CATALOG_CACHE_CONTROL, digest_etag, is_not_modified, json_response, not_modified, quote_etag,
+    utc_timestamp, validator_headers,
+)
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from src.services.book_search_service import search_catalog
+from src.services.catalog_export_service import EXPORT_MEDIA_TYPES, stream_catalog
+from src.services.catalog_import_service import import_catalog
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import any_, literal, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.future import select
 
 # Якщо у тебе async_session_maker і SessionLocal у src.core.database:
@@ -16,44 +33,225 @@ from src.api.routes.users import require_librarian
 
 router = APIRouter(tags=["Books"])
 
-@router.get("/search", response_model=list[BookResponse])
-async def search_books(
-        genres: list[str] = Query(default=[]),
-        available_only: bool = Query(default=False, alias="available_only"),
-        session: AsyncSession = Depends(get_async_session)
-):
-    query = select(Book)
-
-    if genres:
-        query = query.where(Book.genres.overlap(genres))
-    if available_only:
-        query = query.where(Book.total_copies > Book.reserved_count)
 
-    result = await session.execute(query)
-    books = result.scalars().all()
+# Ключі сортування каталогу: вираз, тип значення в курсорі, напрямок
+CATALOG_SORTS = {
+    "title": (Book.title, str, "asc"),
+    "rating": (Book.average_rating, float, "desc"),
+}
+CatalogSort = Literal["title", "rating"]
 
-    return [BookResponse.from_orm(b) for b in books]
+BOOK_LIST = TypeAdapter(list[BookResponse])
 
 
+async def load_books(
+        session: AsyncSession,
+        query,
+        limit: int | None,
+        cursor: str | None,
+        sort: CatalogSort = "title",
+) -> CachedBody:
+    """
+    Виконує запит каталогу у стабільному порядку (ключ сортування, id).
+    Без limit/cursor повертає весь список (сумісність зі старими клієнтами),
+    інакше — сторінку BookPage з next_cursor (keyset-пагінація).
+    ETag — хеш (id, version) книг сторінки.
+    """
+    key, key_type, direction = CATALOG_SORTS[sort]
+    if direction == "asc":
+        query = query.order_by(key, Book.id)
+    else:
+        query = query.order_by(key.desc(), Book.id.desc())
 
-@router.get("/", response_model=list[BookResponse])
-async def get_books():
-    async with async_session_maker() as session:
-        result = await session.execute(select(Book))
+    if limit is None and cursor is None:
+        result = await session.execute(query)
         books = result.scalars().all()
-        return [BookResponse.from_orm(b) for b in books]
+        return CachedBody(
+            body=BOOK_LIST.dump_json([BookResponse.from_orm(b) for b in books]),
+            etag=digest_etag((book.id, book.version) for book in books),
+        )
 
+    limit = limit or DEFAULT_PAGE_SIZE
 
-@router.get("/{book_id}", response_model=BookResponse)
-async def get_book(book_id: UUID):
+    if cursor:
+        try:
+            cursor_sort, value, last_id = decode_cursor(cursor, 3)
+            if cursor_sort != sort or not isinstance(value, key_type):
+                raise ValueError("Invalid cursor")
+            last_id = UUID(last_id)
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        position = tuple_(key, Book.id)
+        boundary = tuple_(value, last_id)
+        query = query.where(position > boundary if direction == "asc" else position < boundary)
+
+    # значення ключа беремо з БД, а не з моделі — курсор має точно збігатися з виразом
+    result = await session.execute(query.add_columns(key).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_book, last_value = rows[-1]
+        next_cursor = encode_cursor([sort, last_value, str(last_book.id)])
+
+    page = BookPage(
+        items=[BookResponse.from_orm(book) for book, _ in rows],
+        next_cursor=next_cursor,
+    )
+    return CachedBody(
+        body=page.model_dump_json().encode(),
+        etag=digest_etag([*((book.id, book.version) for book, _ in rows), next_cursor]),
+    )
+
+
+async def list_books(
+        request: Request,
+        query,
+        limit: int | None,
+        cursor: str | None,
+        sort: CatalogSort = "title",
+) -> Response:
+    """
+    Сторінка каталогу через кеш читань; ключ — шлях і параметри запиту.
+    Спільне завантаження відкриває власну сесію (як load_book): сесія запиту
+    закривається, щойно відключиться клієнт, що почав завантаження.
+    """
+    cache_key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+    async def load() -> CachedBody:
+        async with SessionLocal() as db:
+            return await load_books(db, query, limit, cursor, sort)
+
+    entry = await catalog_cache.fetch(catalog_cache.pages, cache_key, load)
+    return json_response(request.headers, entry.body, entry.etag)
+
+
+@router.get("/search", response_model=list[BookResponse] | BookPage)
+async def search_books(
+        request: Request,
+        genres: list[str] = Query(default=[]),
+        available_only: bool = Query(default=False, alias="available_only"),
+        limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(default=None),
+        sort: CatalogSort = Query(default="title"),
+):
+    query = select(Book)
+
+    if genres:
+        query = query.where(Book.genres.overlap(genres))
+    if available_only:
+        query = query.where(Book.total_copies > Book.reserved_count)
+
+    return await list_books(request, query, limit, cursor, sort)
+
+
+@router.get("/search/text", response_model=BookSearchPage)
+async def search_books_text(
+        q: str = Query(min_length=1, max_length=200),
+        genres: list[str] = Query(default=[]),
+        available_only: bool = Query(default=False),
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(default=None),
+        session: AsyncSession = Depends(get_async_session)
+):
+    """Повнотекстовий і нечіткий пошук з ранжуванням за релевантністю."""
+    return await search_catalog(session, q, genres, available_only, limit, cursor)
+
+
+@router.get("/", response_model=list[BookResponse] | BookPage)
+async def get_books(
+        request: Request,
+        limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(default=None),
+        sort: CatalogSort = Query(default="title"),
+):
+    return await list_books(request, select(Book), limit, cursor, sort)
+
+
+@router.get("/export")
+async def export_books(format: Literal["ndjson", "csv"] = Query(default="ndjson")):
+    """Потоковий експорт усього каталогу (NDJSON або CSV) для синхронізації."""
+    return StreamingResponse(
+        stream_catalog(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+    )
+
+
+async def load_batch(session: AsyncSession, ids: list[UUID]) -> BookBatch:
+    """
+    Книги за списком id одним запитом WHERE id = ANY(:ids).
+    Масив — один параметр, тож план запиту не залежить від кількості id.
+    Наявність — поточна, з БД (повз кеш каталогу).
+    """
+    ids = list(dict.fromkeys(ids))
+    result = await session.execute(
+        select(Book).where(Book.id == any_(literal(ids, postgresql.ARRAY(postgresql.UUID(as_uuid=True)))))
+    )
+    found = {book.id: book for book in result.scalars()}
+    return BookBatch(
+        items=[BookAvailability.model_validate(found[book_id]) for book_id in ids if book_id in found],
+        missing=[book_id for book_id in ids if book_id not in found],
+    )
+
+
+@router.get("/batch", response_model=BookBatch)
+async def get_books_batch(
+        ids: list[UUID] = Query(min_length=1, max_length=MAX_PAGE_SIZE),
+        session: AsyncSession = Depends(get_async_session)
+):
+    """Кілька книг з наявністю за один запит (?ids=...&ids=...)."""
+    return await load_batch(session, ids)
+
+
+@router.post("/batch", response_model=BookBatch)
+async def post_books_batch(
+        data: BookBatchRequest,
+        session: AsyncSession = Depends(get_async_session)
+):
+    """Те саме для довгих списків id у тілі запиту."""
+    return await load_batch(session, data.ids)
+
+
+def book_etag(book_id: UUID, version: int) -> str:
+    return quote_etag(f"{book_id}.{version}")
+
+
+async def load_book(book_id: UUID) -> CachedBody | None:
     async with SessionLocal() as db:
         result = await db.execute(select(Book).where(Book.id == book_id))
         book = result.scalar_one_or_none()
-
         if not book:
-            raise HTTPException(status_code=404, detail="Book not found")
+            return None
+        return CachedBody(
+            body=BookResponse.from_orm(book).model_dump_json().encode(),
+            etag=book_etag(book.id, book.version),
+            last_modified=utc_timestamp(book.updated_at),
+        )
 
-        return BookResponse.from_orm(book)
+
+@router.get("/{book_id}", response_model=BookResponse)
+async def get_book(book_id: UUID, request: Request):
+    if not catalog_cache.enabled and (
+            "if-none-match" in request.headers or "if-modified-since" in request.headers
+    ):
+        # без кешу: повторний запит клієнта спершу перевіряємо лише за версією
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Book.version, Book.updated_at).where(Book.id == book_id)
+            )
+            current = result.one_or_none()
+        if current is not None:
+            etag, last_modified = book_etag(book_id, current.version), utc_timestamp(current.updated_at)
+            if is_not_modified(request.headers, etag, last_modified):
+                return not_modified(validator_headers(etag, last_modified, CATALOG_CACHE_CONTROL))
+
+    entry = await catalog_cache.fetch(catalog_cache.books, book_id, lambda: load_book(book_id))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 @router.post("/", response_model=BookResponse)
@@ -63,10 +261,29 @@ async def create_book(data: BookCreate, _: User = Depends(require_librarian)):
         db.add(new_book)
         await db.commit()
         await db.refresh(new_book)
+        invalidate_books(new_book.id)
         return BookResponse.from_orm(new_book)
 
 
 
+@router.post("/import", response_model=BookImportReport)
+async def import_books(
+        request: Request,
+        format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+        session: AsyncSession = Depends(get_async_session),
+        _: User = Depends(require_librarian)
+):
+    """
+    Масовий імпорт: тіло запиту — CSV (з заголовком) або NDJSON, читається потоково.
+    Книги з наявним ISBN оновлюються; у звіті — помилки по рядках.
+    """
+    try:
+        return await import_catalog(session, request.stream(), format)
+    finally:
+        # частина пачок могла зафіксуватись і до помилки
+        invalidate_books()
+
+
 @router.put("/{book_id}", response_model=BookResponse)
 async def update_book(book_id: UUID, data: BookUpdate, _: User = Depends(require_librarian)):
     async with SessionLocal() as db:
@@ -81,6 +298,7 @@ async def update_book(book_id: UUID, data: BookUpdate, _: User = Depends(require
 
         await db.commit()
         await db.refresh(book)
+        invalidate_books(book.id)
         return BookResponse.from_orm(book)
 
 
@@ -0,0 +1,29 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_async_session
+from src.core.auth_cache import AuthUser
+from src.api.routes.users import require_librarian
+from src.services.cover_service import COVER_MAX_BYTES, attach_cover
+
+router = APIRouter(prefix="/books", tags=["Books"])
+
+
+@router.put("/{book_id}/cover")
+async def upload_cover(
+        book_id: uuid.UUID,
+        request: Request,
+        session: AsyncSession = Depends(get_async_session),
+        _: AuthUser = Depends(require_librarian)
+):
+    """
+    Завантаження обкладинки: тіло запиту — зображення (JPEG/PNG/WebP).
+    Зменшені копії генеруються один раз тут, а не при кожному перегляді каталогу.
+    """
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > COVER_MAX_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Файл завеликий")
+
+    return {"cover_variants": await attach_cover(session, book_id, request.stream())}
@@ -1,72 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 from pydantic import BaseModel
 
 from src.core.database import get_async_session
+from src.core.auth_cache import AuthUser, invalidate_user
+from src.core.pagination import MAX_PAGE_SIZE
 from src.api.models.favorite import Favorite
 from src.api.models.bookdb import Book
 from src.api.schemas.books import BookResponse
-from src.api.routes.users import get_current_user_email
+from src.api.routes.users import get_current_user
 
 router = APIRouter(tags=["Favorites"], redirect_slashes=False)
 
+USER_FK = "favorites_user_id_fkey"
+
 
 class FavoriteAddRequest(BaseModel):
     book_id: UUID
 
 
+class FavoriteLookup(BaseModel):
+    book_ids: list[UUID]
+
+
 @router.post("/me", status_code=201)
 async def add_to_favorites(
         data: FavoriteAddRequest,
-        user_email: str = Depends(get_current_user_email),
+        user: AuthUser = Depends(get_current_user),
         db: AsyncSession = Depends(get_async_session)
 ):
-    book_id = data.book_id
-
-    q = await db.execute(select(Book).where(Book.id == book_id))
-    book = q.scalar_one_or_none()
-    if not book:
+    """Один INSERT ... ON CONFLICT DO NOTHING: повторне натискання не створює дубля."""
+    try:
+        result = await db.execute(
+            pg_insert(Favorite)
+            .values(user_id=user.id, book_id=data.book_id)
+            .on_conflict_do_nothing()
+            .returning(Favorite.book_id)
+        )
+        added = result.scalar_one_or_none() is not None
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # asyncpg-помилка з іменем обмеження — причина DBAPI-обгортки
+        if getattr(exc.orig.__cause__, "constraint_name", None) == USER_FK:
+            # користувача видалено, а кеш авторизації ще пам'ятає його (AUTH_CACHE_TTL)
+            invalidate_user(user.id)
+            raise HTTPException(401, "User not found")
+        # FK на books — книги не існує
         raise HTTPException(404, "Book not found")
 
-    q = await db.execute(
-        select(Favorite).where(
-            Favorite.user_email == user_email,
-            Favorite.book_id == book_id
-        )
-    )
-    if q.scalar_one_or_none():
-        return {"status": "already_exists"}
-
-    fav = Favorite(user_email=user_email, book_id=book_id)
-    db.add(fav)
-    await db.commit()
-    return {"status": "added"}
+    return {"status": "added" if added else "already_exists"}
 
 
 @router.get("/me", response_model=list[BookResponse])
 async def get_my_favorites(
-        user_email: str = Depends(get_current_user_email),
+        user: AuthUser = Depends(get_current_user),
         db: AsyncSession = Depends(get_async_session)
 ):
     q = await db.execute(
         select(Book)
         .join(Favorite, Favorite.book_id == Book.id)
-        .where(Favorite.user_email == user_email)
+        .where(Favorite.user_id == user.id)
     )
     return q.scalars().all()
 
 
+@router.get("/me/lookup", response_model=FavoriteLookup)
+async def lookup_favorites(
+        book_ids: list[UUID] = Query(max_length=MAX_PAGE_SIZE),
+        user: AuthUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_async_session)
+):
+    """Які з переданих книг (наприклад, сторінки каталогу) є в обраному — одним запитом."""
+    result = await db.execute(
+        select(Favorite.book_id).where(
+            Favorite.user_id == user.id,
+            Favorite.book_id.in_(book_ids)
+        )
+    )
+    return {"book_ids": result.scalars().all()}
+
+
 @router.delete("/me/{book_id}", status_code=204)
 async def remove_favorite(
         book_id: UUID,
-        user_email: str = Depends(get_current_user_email),
+        user: AuthUser = Depends(get_current_user),
         db: AsyncSession = Depends(get_async_session)
 ):
     await db.execute(
         delete(Favorite).where(
-            Favorite.user_email == user_email,
+            Favorite.user_id == user.id,
             Favorite.book_id == book_id
         )
     )
@@ -75,22 +102,21 @@ async def remove_favorite(
 
 @router.delete("/me", status_code=204)
 async def clear_favorites(
-        user_email: str = Depends(get_current_user_email),
+        user: AuthUser = Depends(get_current_user),
         db: AsyncSession = Depends(get_async_session)
 ):
     await db.execute(
-        delete(Favorite).where(Favorite.user_email == user_email)
+        delete(Favorite).where(Favorite.user_id == user.id)
     )
     await db.commit()
 
 
 @router.get("/me/count")
 async def count_favorites(
-        user_email: str = Depends(get_current_user_email),
+        user: AuthUser = Depends(get_current_user),
         db: AsyncSession = Depends(get_async_session)
 ):
-    result = await db.execute(
-        select(Favorite).where(Favorite.user_email == user_email)
+    count = await db.scalar(
+        select(func.count()).select_from(Favorite).where(Favorite.user_id == user.id)
     )
-    items = result.scalars().all()
-    return {"count": len(items)}
+    return {"count": count}
@@ -1,39 +1,86 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+import asyncio
+import os
+import re
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Request, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.core.database import get_async_session
+from src.core.auth_cache import AuthUser
+from src.core.http_cache import is_not_modified, quote_etag, http_date
 from src.api.models.bookdb import Book
-import shutil
-import uuid
-import os
+from src.api.routes.users import require_librarian
+from src.services import ebook_service
+from src.services.ebook_service import EBOOK_MAX_BYTES, attach_pdf
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
-UPLOAD_DIR = "uploaded_pdfs"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Файл за ключем незмінний, але книга може отримати новий PDF — кешуємо ненадовго
+EBOOK_CACHE_CONTROL = os.getenv("EBOOK_CACHE_CONTROL", "public, max-age=300")
 
+_SHA256 = re.compile(r"[0-9a-f]{64}")
 
-@router.post("/{book_id}/upload-pdf")
+
+@router.put("/{book_id}/pdf")
 async def upload_pdf(
         book_id: uuid.UUID,
-        pdf: UploadFile = File(...),
-        session: AsyncSession = Depends(get_async_session)
+        request: Request,
+        session: AsyncSession = Depends(get_async_session),
+        _: AuthUser = Depends(require_librarian)
 ):
-    if not pdf.filename.endswith(".pdf"):
-        raise HTTPException(400, "Файл має бути PDF")
+    """
+    Завантаження PDF книги: тіло запиту — сам файл (application/pdf).
+    Пишеться потоково у сховище; однаковий вміст зберігається один раз.
+    """
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > EBOOK_MAX_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Файл завеликий")
 
-    file_name = f"{uuid.uuid4()}.pdf"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
+    return await attach_pdf(session, book_id, request.stream())
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(pdf.file, buffer)
 
-    book = await session.get(Book, book_id)
-    if not book:
-        raise HTTPException(404, "Книга не знайдена")
+@router.api_route("/{book_id}/pdf", methods=["GET", "HEAD"])
+async def download_pdf(
+        book_id: uuid.UUID,
+        request: Request,
+        session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Віддає PDF книги з підтримкою Range (читання частинами), ETag і 304.
+    Файл надсилається FileResponse без читання в пам'ять (pathsend, якщо сервер підтримує).
+    """
+    key = await session.scalar(select(Book.pdf_path).where(Book.id == book_id))
+    if not key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="PDF не знайдено")
 
-    book.pdf_path = file_path
-    await session.commit()
+    path = ebook_service.ebook_storage.path(key)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="PDF не знайдено")
 
-    return {"status": "ok", "pdf_path": file_path}
+    headers = {
+        "cache-control": EBOOK_CACHE_CONTROL,
+        "last-modified": http_date(stat_result.st_mtime),
+    }
+    # ключ за вмістом — sha256 і є ETag; для файлів, доданих вручну, — розмір і mtime
+    stem = Path(key).stem
+    headers["etag"] = quote_etag(
+        stem if _SHA256.fullmatch(stem) else f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+    )
 
+    if is_not_modified(request.headers, headers["etag"], stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        headers=headers,
+        stat_result=stat_result,
+        filename=f"{book_id}.pdf",
+        content_disposition_type="inline",
+    )
@@ -1,37 +1,33 @@
-from datetime import date, timedelta
+from datetime import date
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_async_session
-from src.api.models.reservation import Reservation
-from src.api.models.bookdb import Book
+from src.core.auth_cache import AuthUser
+from src.api.routes.users import require_librarian
+from src.services.reminder_service import due_soon_query, send_reminders
 
 router = APIRouter()
 
 
 @router.get("/")
 async def get_reminders(session: AsyncSession = Depends(get_async_session)):
-    today = date.today()
-
-    stmt = (
-        select(Reservation, Book)
-        .join(Book, Book.id == Reservation.book_id)
-        .where(Reservation.until.is_not(None))
-    )
-
-    result = await session.execute(stmt)
-    rows = result.all()
-
-    reminders = []
-
-    for res, book in rows:
-        days_left = (res.until - today).days
-        if days_left <= 2:
-            reminders.append({
-                "reservation_id": res.id,
-                "book_title": book.title,
-                "days_left": days_left
-            })
-
-    return reminders
+    result = await session.execute(due_soon_query(date.today()))
+
+    return [
+        {
+            "reservation_id": row.id,
+            "book_title": row.book_title,
+            "days_left": row.days_left
+        }
+        for row in result.all()
+    ]
+
+
+@router.post("/send")
+async def send_due_reminders(
+        session: AsyncSession = Depends(get_async_session),
+        _: AuthUser = Depends(require_librarian)
+):
+    """Ставить у чергу дайджести нагадувань (лише ще не надіслані)."""
+    return await send_reminders(session)
@@ -9,14 +9,21 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_async_session
-from src.core.mailer import send_email
-from src.core.security import hash_password
+from src.core.security import unusable_password_hash
 from src.api.models.user import User, UserRole
-from src.api.models.bookdb import Book
 from src.api.models.reservation import Reservation
+from src.services.reservations_service import (
+    create_reservation_for_user, cancel_reservation_by_id, cancel_reservations,
+)
+from src.services.mail_outbox_service import mail_worker
+from src.core.auth_cache import AuthUser
+from src.api.routes.users import require_librarian
 
 router = APIRouter()
 
+# Термін дії резервації
+RESERVATION_DAYS = 1
+
 # -----------------------------
 # Schemas
 # -----------------------------
@@ -60,7 +67,7 @@ async def create_reservation(
     if not user_email:
         raise HTTPException(status_code=400, detail="X-User-Email header required")
 
-    # Find or create user
+    # Find or create user (в тій самій транзакції, що й резервація)
     result = await session.execute(select(User).where(User.email == user_email))
     user = result.scalar_one_or_none()
 
@@ -68,67 +75,23 @@ async def create_reservation(
         user = User(
             id=uuid4(),
             email=user_email,
-            password_hash=hash_password("autogenerated"),
+            password_hash=await unusable_password_hash(),
             role=UserRole.user
         )
         session.add(user)
-        await session.commit()
-        await session.refresh(user)
-
-    # Resolve book
-    result = await session.execute(select(Book).where(Book.id == data.book_id))
-    book = result.scalar_one_or_none()
-
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
-    # Check availability
-    if (book.total_copies or 0) - (book.reserved_count or 0) <= 0:
-        raise HTTPException(status_code=409, detail="No copies available")
+        await session.flush()
 
-    until_date = date.today() + timedelta(days=7)
-
-    # Create reservation (24 hours)
-    reservation = Reservation(
-        id=uuid4(),
+    # Atomic claim of a copy + reservation (24 hours) + outbox email, one commit
+    reservation, book = await create_reservation_for_user(
+        session,
         user_id=user.id,
-        book_id=book.id,
-        from_date=date.today(),
-        until=date.today() + timedelta(days=1)
+        book_id=data.book_id,
+        until_date=date.today() + timedelta(days=RESERVATION_DAYS),
+        notify_email=user.email
     )
 
-    session.add(reservation)
-
-    if book.reserved_count is None:
-        book.reserved_count = 0
-    book.reserved_count += 1
-
-    await session.commit()
-    await session.refresh(reservation)
-
-    # ⬇⬇⬇ ДОДАЄМО EMAIL-ПОВІДОМЛЕННЯ ⬇⬇⬇
-
-    formatted_date = reservation.until.strftime("%d.%m.%Y")
-    subject = "Резервація книги"
-    message = (
-        f"Вітаємо!\n\n"
-        f"Книга «{book.title}» успішно зарезервована.\n"
-        f"Резервація діє до: {formatted_date}.\n\n"
-        f"Дякуємо, що користуєтесь Library Brainstorm!"
-    )
-
-    await send_email(user.email, subject, message)
-
-    session.add(reservation)
-
-    if book.reserved_count is None:
-        book.reserved_count = 0
-    book.reserved_count += 1
-
-    await session.commit()
-
-    # Load book through relationship
-    await session.refresh(reservation)
+    # лист відправить фоновий воркер — SMTP не впливає на час відповіді
+    mail_worker.notify()
 
     return ReservationOut(
         id=reservation.id,
@@ -194,21 +157,7 @@ async def cancel_reservation(
         reservation_id: UUID,
         session: AsyncSession = Depends(get_async_session)
 ):
-    result = await session.execute(select(Reservation).where(Reservation.id == reservation_id))
-    reservation = result.scalar_one_or_none()
-
-    if not reservation:
-        raise HTTPException(status_code=404, detail="Reservation not found")
-
-    # Update reserved count
-    result = await session.execute(select(Book).where(Book.id == reservation.book_id))
-    book = result.scalar_one_or_none()
-
-    if book and (book.reserved_count or 0) > 0:
-        book.reserved_count -= 1
-
-    await session.delete(reservation)
-    await session.commit()
+    await cancel_reservation_by_id(session, reservation_id)
 
     return Response(status_code=204)
 
@@ -220,27 +169,42 @@ async def clear_all_reservations(
     if not user_email:
         raise HTTPException(status_code=400, detail="X-User-Email header required")
 
-    result = await session.execute(select(User).where(User.email == user_email))
-    user = result.scalar_one_or_none()
+    # Усі резервації користувача і повернення копій — один запит, скільки б їх не було
+    user_ids = select(User.id).where(User.email == user_email).scalar_subquery()
+    await cancel_reservations(session, Reservation.user_id == user_ids)
+    return Response(status_code=204)
 
-    if not user:
-        return Response(status_code=204)
 
-    # Отримати всі резервації користувача
-    result = await session.execute(
-        select(Reservation).where(Reservation.user_id == user.id)
-    )
-    reservations = result.scalars().all()
+# -----------------------------
+# Bulk cancel (librarian)
+# -----------------------------
+class BulkCancelRequest(BaseModel):
+    book_id: UUID | None = None
+    # межі until включно
+    until_from: date | None = None
+    until_to: date | None = None
 
-    # Повернути копії
-    for r in reservations:
-        result_book = await session.execute(select(Book).where(Book.id == r.book_id))
-        book = result_book.scalar_one_or_none()
-        if book and book.reserved_count > 0:
-            book.reserved_count -= 1
 
-        await session.delete(r)
+class BulkCancelReport(BaseModel):
+    reservations: int
+    books: int
 
-    await session.commit()
-    return Response(status_code=204)
 
+@router.post("/cancel/bulk", response_model=BulkCancelReport)
+async def bulk_cancel_reservations(
+        data: BulkCancelRequest,
+        session: AsyncSession = Depends(get_async_session),
+        _: AuthUser = Depends(require_librarian)
+):
+    """Скасовує резервації книги та/або з until у діапазоні дат однією транзакцією."""
+    criteria = []
+    if data.book_id is not None:
+        criteria.append(Reservation.book_id == data.book_id)
+    if data.until_from is not None:
+        criteria.append(Reservation.until >= data.until_from)
+    if data.until_to is not None:
+        criteria.append(Reservation.until <= data.until_to)
+    if not criteria:
+        raise HTTPException(status_code=400, detail="book_id or until range required")
+
+    return await cancel_reservations(session, *criteria)
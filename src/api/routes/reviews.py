@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
 from pydantic import BaseModel, conint
 from typing import List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 
+from src.core.catalog_cache import invalidate_books
 from src.core.database import get_async_session
+from src.core.http_cache import conditional_response, quote_etag, utc_timestamp
 from src.api.models.bookdb import Book
 from src.api.models.review import Review
 from src.api.models.user import User
 from src.api.routes.users import get_current_user_email
+from src.services.reviews_service import bump_rating_stats
 
 
 router = APIRouter(tags=["Reviews"])
@@ -47,13 +50,6 @@ class ReviewsListOut(BaseModel):
 # ---------- HELPERS ----------
 
 
-async def ensure_book_exists(session: AsyncSession, book_id: UUID):
-    result = await session.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    if not book:
-        raise HTTPException(404, "Book not found")
-
-
 async def get_user_by_email(session: AsyncSession, email: str) -> User:
     result = await session.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
@@ -85,7 +81,8 @@ async def add_review(
 ):
     """Додає новий відгук для книги."""
 
-    await ensure_book_exists(session, book_id)
+    if not await bump_rating_stats(session, book_id, 1, payload.rating):
+        raise HTTPException(404, "Book not found")
     user = await get_user_by_email(session, user_email)
 
     review = Review(
@@ -99,6 +96,7 @@ async def add_review(
 
     session.add(review)
     await session.commit()
+    invalidate_books(book_id)
     await session.refresh(review)
 
     return serialize_review(review, user.email)
@@ -107,13 +105,29 @@ async def add_review(
 @router.get("/books/{book_id}/reviews", response_model=ReviewsListOut)
 async def list_reviews(
         book_id: UUID,
+        request: Request,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(50, ge=1, le=200),
         session: AsyncSession = Depends(get_async_session),
 ):
     """Список відгуків та статистика."""
 
-    await ensure_book_exists(session, book_id)
+    stats_q = await session.execute(
+        select(Book.review_count, Book.average_rating, Book.version, Book.updated_at)
+        .where(Book.id == book_id)
+    )
+    stats = stats_q.one_or_none()
+    if stats is None:
+        raise HTTPException(404, "Book not found")
+    count, avg, version, updated_at = stats
+
+    # кожен доданий/видалений відгук змінює версію книги — відгуки ще не читаємо
+    cached = conditional_response(
+        request.headers, response, quote_etag(f"r{book_id}.{version}"), utc_timestamp(updated_at)
+    )
+    if cached is not None:
+        return cached
 
     result = await session.execute(
         select(Review)
@@ -125,14 +139,6 @@ async def list_reviews(
     )
     reviews = result.scalars().all()
 
-    stats_q = await session.execute(
-        select(
-            func.count(Review.id),
-            func.coalesce(func.avg(Review.rating), 0.0)
-        ).where(Review.book_id == book_id)
-    )
-    count, avg = stats_q.one()
-
     items = [
         serialize_review(review, review.user.email if review.user else "")
         for review in reviews
@@ -152,13 +158,18 @@ async def remove_review(
 ):
     """Видаляє відгук."""
 
-    result = await session.execute(select(Review).where(Review.id == review_id))
-    review = result.scalar_one_or_none()
+    result = await session.execute(
+        delete(Review)
+        .where(Review.id == review_id)
+        .returning(Review.book_id, Review.rating)
+    )
+    review = result.one_or_none()
 
     if not review:
         raise HTTPException(404, "Review not found")
 
-    await session.delete(review)
+    await bump_rating_stats(session, review.book_id, -1, -review.rating)
     await session.commit()
+    invalidate_books(review.book_id)
 
     return None
@@ -3,7 +3,7 @@ from pydantic import BaseModel, EmailStr
 
 from uuid import uuid4
 
-from src.core.security import hash_password, verify_password, create_token
+from src.core.security import hash_password_async, verify_password_async, create_token
 
 
 from fastapi import Depends, HTTPException
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from src.core.database import get_async_session
 from src.core.security import decode_token
+from src.core.auth_cache import AuthUser, get_cached_user
 from src.api.models.user import User, UserRole
 
 router = APIRouter()
@@ -44,7 +45,7 @@ async def register(user: UserCreate, session: AsyncSession = Depends(get_async_s
     new_user = User(
         id=uuid4(),
         email=user.email,
-        password_hash=hash_password(user.password),
+        password_hash=await hash_password_async(user.password),
         role=user.role
     )
 
@@ -61,7 +62,7 @@ async def login(data: UserLogin, session: AsyncSession = Depends(get_async_sessi
     result = await session.execute(query)
     user: User | None = result.scalar_one_or_none()
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await verify_password_async(data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_token({"sub": str(user.id), "role": user.role})
@@ -78,21 +79,26 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 async def get_current_user(
         token: str = Depends(oauth2_scheme),
         session: AsyncSession = Depends(get_async_session)
-) -> User:
-    """Декодує токен і повертає користувача."""
+) -> AuthUser:
+    """
+    Декодує токен і повертає користувача.
+    Запис береться з TTL-кешу, тож при попаданні запиту до БД немає.
+    """
     try:
         payload = decode_token(token)
         user_id: str = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        query = select(User).where(User.id == user_id)
-        result = await session.execute(query)
-        user = result.scalar_one_or_none()
+        user = await get_cached_user(session, user_id)
 
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
 
+        # роль підписана в токені, але після зміни ролі старий токен не діє
+        if payload.get("role") != user.role:
+            raise HTTPException(status_code=401, detail="Role changed")
+
         return user
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
@@ -104,7 +110,7 @@ async def get_current_user_email(
     return user.email
 
 
-async def require_librarian(user: User = Depends(get_current_user)) -> User:
+async def require_librarian(user: AuthUser = Depends(get_current_user)) -> AuthUser:
     """Доступ з роллю бібліотекаря тільки."""
     if user.role != UserRole.librarian:
         raise HTTPException(status_code=403, detail="Access denied")
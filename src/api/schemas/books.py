@@ -1,7 +1,9 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from src.core.pagination import MAX_PAGE_SIZE
+
 
 class BookBase(BaseModel):
     title: str
@@ -38,9 +40,55 @@ class BookResponse(BaseModel):
     total_copies: int
     reserved_count: int
     cover_image: str | None = None
+    cover_variants: Dict[str, Dict[str, str]] | None = None
     description: str | None = None
     published_year: int | None = None
+    review_count: int = 0
+    average_rating: float = 0.0
 
     model_config = {
         "from_attributes": True
     }
+
+
+class BookPage(BaseModel):
+    items: List[BookResponse]
+    next_cursor: str | None = None
+
+
+class BookSearchHit(BookResponse):
+    score: float
+
+
+class BookSearchPage(BaseModel):
+    items: List[BookSearchHit]
+    next_cursor: str | None = None
+
+
+class BookImportError(BaseModel):
+    row: int
+    isbn: str | None = None
+    error: str
+
+
+class BookImportReport(BaseModel):
+    rows: int
+    inserted: int
+    updated: int
+    duplicates: int
+    failed: int
+    errors: List[BookImportError]
+
+
+class BookAvailability(BookResponse):
+    available_copies: int
+
+
+class BookBatchRequest(BaseModel):
+    ids: List[UUID] = Field(min_length=1, max_length=MAX_PAGE_SIZE)
+
+
+class BookBatch(BaseModel):
+    # у порядку запиту; ідентифікатори, яких немає в каталозі, — у missing
+    items: List[BookAvailability]
+    missing: List[UUID] = []
@@ -0,0 +1,56 @@
+import os
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.api.models.user import User, UserRole
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10_000))
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """Знімок користувача для авторизації (без прив'язки до сесії БД)."""
+    id: UUID
+    email: str
+    role: UserRole
+
+
+user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+async def get_cached_user(session: AsyncSession, user_id: str) -> AuthUser | None:
+    """
+    Повертає користувача з кешу, а при промаху — одним SELECT з БД.
+    None, якщо користувача не існує.
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    result = await session.execute(
+        select(User.id, User.email, User.role).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    user = AuthUser(id=row.id, email=row.email, role=row.role)
+    user_cache.set(user_id, user)
+    return user
+
+
+def invalidate_user(user_id) -> None:
+    user_cache.pop(str(user_id))
+
+
+# Будь-яка зміна (роль, email, пароль) чи видалення користувача через ORM
+# скидає запис у кеші цього процесу; інші процеси наздоженуть за AUTH_CACHE_TTL.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User):
+    invalidate_user(target.id)
@@ -0,0 +1,109 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from src.core.cache import TTLCache
+
+CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", "1") == "1"
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", 10))
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", 2_000))
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Готова JSON-відповідь разом з валідаторами для умовного GET."""
+    body: bytes
+    etag: str
+    last_modified: float | None = None
+
+
+class CatalogCache:
+    """
+    Кеш читань каталогу в пам'яті процесу: окремі книги та сторінки списків.
+    Зберігає вже серіалізовані відповіді. Одночасні промахи за одним ключем
+    чекають один запит до БД (single-flight). Записи в цьому процесі скидають
+    кеш після commit; інші процеси наздоженуть за CATALOG_CACHE_TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self.books = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        # завантаження, що почалося до інвалідації, не потрапляє в кеш
+        self._generation = 0
+        self.counters = {"coalesced": 0, "invalidations": 0}
+
+    async def fetch(
+            self,
+            cache: TTLCache,
+            key: Hashable,
+            load: Callable[[], Awaitable[CachedBody | None]],
+    ) -> CachedBody | None:
+        """Відповідь з кешу або з load(); None (немає даних) не кешується."""
+        if not self.enabled:
+            return await load()
+
+        entry = cache.get(key, _MISSING)
+        if entry is not _MISSING:
+            return entry
+
+        flight_key = (id(cache), key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(cache, key, flight_key, load))
+            self._inflight[flight_key] = task
+            # помилку забирають очікувачі; якщо їх не лишилось — не засмічуємо лог
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            self.counters["coalesced"] += 1
+        # shield: якщо клієнт, що почав запит, відключиться — решта отримає результат
+        return await asyncio.shield(task)
+
+    async def _load(self, cache: TTLCache, key, flight_key, load) -> CachedBody | None:
+        generation = self._generation
+        try:
+            entry = await load()
+        finally:
+            if self._inflight.get(flight_key) is asyncio.current_task():
+                del self._inflight[flight_key]
+        if entry is not None and generation == self._generation:
+            cache.set(key, entry)
+        return entry
+
+    def invalidate(self, *book_ids) -> None:
+        """
+        Скидає вказані книги і всі сторінки списків (книга може бути на будь-якій).
+        Без аргументів — увесь кеш (масові зміни).
+        """
+        self._generation += 1
+        self.counters["invalidations"] += 1
+        self._inflight.clear()
+        self.pages.clear()
+        if not book_ids:
+            self.books.clear()
+        for book_id in book_ids:
+            self.books.pop(book_id)
+
+    def stats(self) -> dict:
+        totals = {
+            name: self.books.stats[name] + self.pages.stats[name]
+            for name in ("hits", "misses", "evictions")
+        }
+        return {
+            "enabled": self.enabled,
+            **totals,
+            **self.counters,
+            "books": len(self.books),
+            "pages": len(self.pages),
+        }
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL, enabled=CATALOG_CACHE_ENABLED)
+
+
+def invalidate_books(*book_ids) -> None:
+    catalog_cache.invalidate(*book_ids)
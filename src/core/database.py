@@ -2,17 +2,44 @@ import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from src.core.db_pool import InstrumentedPool, instrument_connect, pool_metrics
+from src.core.metrics import instrument_queries, register_pool_collector
+
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "postgresql+asyncpg://postgres:postgres@db:5432/library"
 )
 
+# Налаштування пулу з'єднань
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+
+# Кеш prepared statements asyncpg (0 — для pgbouncer у transaction mode)
+DB_STATEMENT_CACHE_SIZE = os.getenv("DB_STATEMENT_CACHE_SIZE")
+
+connect_args = {}
+if DB_STATEMENT_CACHE_SIZE is not None:
+    connect_args["statement_cache_size"] = int(DB_STATEMENT_CACHE_SIZE)
+    connect_args["prepared_statement_cache_size"] = int(DB_STATEMENT_CACHE_SIZE)
+
 
 engine = create_async_engine(
     DATABASE_URL,
     future=True,
-    echo=False
+    echo=False,
+    poolclass=InstrumentedPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=connect_args,
 )
+instrument_connect(engine)
+instrument_queries(engine)
 
 
 async_session_maker = sessionmaker(
@@ -28,6 +55,14 @@ SessionLocal = async_session_maker
 Base = declarative_base()
 
 
+def pool_stats() -> dict:
+    """Поточний стан пулу з'єднань і накопичені метрики очікування/підключення."""
+    return pool_metrics.snapshot(engine.pool)
+
+
+register_pool_collector(pool_stats)
+
+
 async def get_async_session():
     async with async_session_maker() as session:
         yield session
@@ -0,0 +1,75 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Лічильники пулу з'єднань: очікування на checkout і час підключення до БД."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connects = 0
+        self.connect_seconds_total = 0.0
+        self.connect_seconds_max = 0.0
+
+    def record_checkout(self, seconds: float):
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_connect(self, seconds: float):
+        self.connects += 1
+        self.connect_seconds_total += seconds
+        self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+
+    def snapshot(self, pool) -> dict:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "wait_ms_avg": _avg_ms(self.wait_seconds_total, self.checkouts),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 2),
+            "connects": self.connects,
+            "connect_ms_avg": _avg_ms(self.connect_seconds_total, self.connects),
+            "connect_ms_max": round(self.connect_seconds_max * 1000, 2),
+        }
+
+
+def _avg_ms(total: float, count: int) -> float:
+    return round(total / count * 1000, 2) if count else 0.0
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, що вимірює, скільки запит чекав на вільне з'єднання."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_checkout(time.perf_counter() - started)
+
+
+def instrument_connect(engine) -> None:
+    """Вимірює латентність встановлення нових з'єднань до PostgreSQL."""
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def _timed_connect(dialect, conn_rec, cargs, cparams):
+        started = time.perf_counter()
+        connection = dialect.connect(*cargs, **cparams)
+        pool_metrics.record_connect(time.perf_counter() - started)
+        return connection
@@ -0,0 +1,107 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# Каталог і відгуки: клієнт кешує, але щоразу перепитує (дешево завдяки 304)
+CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "no-cache")
+
+
+def quote_etag(value: str) -> str:
+    return f'"{value}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match: список тегів або '*'; слабкі теги (W/) порівнюються як сильні."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(headers: Headers, etag: str | None = None, last_modified: float | None = None) -> bool:
+    """
+    Чи може клієнт використати свою копію (відповідь 304).
+    If-None-Match має пріоритет над If-Modified-Since (RFC 9110, 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP-дата має точність до секунди
+        return int(last_modified) <= since
+
+    return False
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def utc_timestamp(value: datetime) -> float:
+    """Час з БД (naive UTC) як Unix timestamp."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def digest_etag(parts) -> str:
+    """ETag для колекції: хеш послідовності (id, версія) — не потребує серіалізації відповіді."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return quote_etag(digest.hexdigest())
+
+
+def validator_headers(etag: str, last_modified: float | None = None, cache_control: str | None = None) -> dict:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified(headers: dict) -> Response:
+    # 304 без тіла, але з тими самими валідаторами (RFC 9110, 15.4.5)
+    return Response(status_code=304, headers=headers)
+
+
+def conditional_response(
+        headers: Headers,
+        response: Response,
+        etag: str,
+        last_modified: float | None = None,
+        cache_control: str | None = CATALOG_CACHE_CONTROL,
+) -> Response | None:
+    """
+    304, якщо копія клієнта актуальна; інакше додає валідатори до response
+    і повертає None — маршрут віддає тіло як звичайно.
+    """
+    validators = validator_headers(etag, last_modified, cache_control)
+    if is_not_modified(headers, etag, last_modified):
+        return not_modified(validators)
+    response.headers.update(validators)
+    return None
+
+
+def json_response(
+        headers: Headers,
+        body: bytes,
+        etag: str,
+        last_modified: float | None = None,
+        cache_control: str | None = CATALOG_CACHE_CONTROL,
+) -> Response:
+    """Вже серіалізоване JSON-тіло з валідаторами або 304."""
+    validators = validator_headers(etag, last_modified, cache_control)
+    if is_not_modified(headers, etag, last_modified):
+        return not_modified(validators)
+    return Response(content=body, media_type="application/json", headers=validators)
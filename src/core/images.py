@@ -0,0 +1,45 @@
+import io
+
+from PIL import Image, ImageOps
+
+# Відкриваємо не більше ~40 Мпікс (захист від "декомпресійних бомб")
+Image.MAX_IMAGE_PIXELS = 40_000_000
+
+VARIANT_FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def render_variants(data: bytes, widths: tuple[int, ...]) -> dict[str, dict[int, bytes]]:
+    """
+    Зменшені копії зображення для кожної ширини у WebP і JPEG.
+    Виконується в окремому процесі (CPU-важка робота). Зображення не збільшуються:
+    ширини, більші за оригінал, замінюються шириною оригіналу.
+    Кидає ValueError, якщо дані не є зображенням.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        # JPEG можна декодувати одразу в меншому масштабі — значно швидше
+        image.draft("RGB", (max(widths), max(widths) * 4))
+        image = ImageOps.exif_transpose(image)
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f"Unsupported image: {exc}")
+
+    if image.mode != "RGB":
+        background = Image.new("RGB", image.size, "white")
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+
+    variants: dict[str, dict[int, bytes]] = {name: {} for name in VARIANT_FORMATS}
+    # від більшого до меншого: кожне зменшення працює з уже зменшеною копією
+    for width in sorted({min(w, image.width) for w in widths}, reverse=True):
+        height = max(round(image.height * width / image.width), 1)
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+        for name, options in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, **options)
+            variants[name][width] = buffer.getvalue()
+
+    return variants
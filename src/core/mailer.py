@@ -1,28 +1,109 @@
 # src/services/send_email.py
 
-from aiosmtplib import send
+import asyncio
+from contextlib import asynccontextmanager
+
+from aiosmtplib import send, SMTP, SMTPServerDisconnected
 from email.mime.text import MIMEText
 import os
 
+from src.core.metrics import timed_smtp
+
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("SMTP_USER")       # email
 SMTP_PASS = os.getenv("SMTP_PASSWORD")   # <-- FIX: правильне ім'я змінної
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 30))
 
 EMAIL_FROM = os.getenv("EMAIL_FROM", SMTP_USER)
 
 
-async def send_email(to_email: str, subject: str, message: str):
+def build_message(to_email: str, subject: str, message: str) -> MIMEText:
     msg = MIMEText(message, "plain", "utf-8")
     msg["From"] = EMAIL_FROM
     msg["To"] = to_email
     msg["Subject"] = subject
+    return msg
+
+
+async def send_email(to_email: str, subject: str, message: str):
+    msg = build_message(to_email, subject, message)
+
+    with timed_smtp():
+        await send(
+            msg,
+            hostname=SMTP_HOST,
+            port=SMTP_PORT,
+            username=SMTP_USER,
+            password=SMTP_PASS,
+            start_tls=SMTP_STARTTLS,
+        )
+
+
+class SMTPConnectionPool:
+    """
+    Пул постійних SMTP-з'єднань.
+    З'єднання відкриваються ліниво (STARTTLS + login один раз) і
+    перевикористовуються між листами та пачками.
+    """
+
+    def __init__(
+            self,
+            size: int = 2,
+            hostname: str = SMTP_HOST,
+            port: int = SMTP_PORT,
+            username: str | None = SMTP_USER,
+            password: str | None = SMTP_PASS,
+            start_tls: bool = SMTP_STARTTLS,
+    ):
+        self.size = size
+        self._options = dict(
+            hostname=hostname,
+            port=port,
+            username=username,
+            password=password,
+            start_tls=start_tls,
+            timeout=SMTP_TIMEOUT,
+        )
+        self._idle: asyncio.Queue[SMTP] = asyncio.Queue()
+        self._created = 0
+        self.connects = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            client = SMTP(**self._options)
+        else:
+            client = await self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put_nowait(client)
+
+    async def send(self, msg: MIMEText):
+        """Відправляє лист через вільне з'єднання, перепідключаючись за потреби."""
+        async with self.acquire() as client:
+            with timed_smtp():
+                if not client.is_connected:
+                    await client.connect()
+                    self.connects += 1
+                try:
+                    await client.send_message(msg)
+                except SMTPServerDisconnected:
+                    # сервер закрив неактивне з'єднання — одна повторна спроба
+                    client.close()
+                    await client.connect()
+                    self.connects += 1
+                    await client.send_message(msg)
 
-    await send(
-        msg,
-        hostname=SMTP_HOST,
-        port=SMTP_PORT,
-        username=SMTP_USER,
-        password=SMTP_PASS,
-        start_tls=True,
-    )
+    async def close(self):
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+        self._created = 0
@@ -0,0 +1,175 @@
+import os
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Режим розробки: заголовок X-DB-Queries у кожній відповіді і попередження в лог,
+# якщо запит виконав забагато SQL або повторив той самий запит (ознака N+1)
+DB_QUERY_DEBUG = os.getenv("DB_QUERY_DEBUG", "0") == "1"
+DB_QUERY_WARN = int(os.getenv("DB_QUERY_WARN", 10))
+DB_QUERY_REPEAT_WARN = int(os.getenv("DB_QUERY_REPEAT_WARN", 3))
+
+# Межі у секундах: від швидких читань з кешу до повільних завантажень файлів
+LATENCY_BUCKETS = (0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Час обробки запиту",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Запити, що обробляються зараз")
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Кількість SQL-запитів на HTTP-запит",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Сумарний час SQL-запитів на HTTP-запит",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter("db_queries_total", "Усі SQL-запити процесу (включно з фоновими задачами)")
+SMTP_LATENCY = Histogram(
+    "smtp_send_duration_seconds", "Тривалість відправки листа через SMTP",
+    ["outcome"], buckets=LATENCY_BUCKETS,
+)
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    seconds: float = 0.0
+    # текст SQL -> скільки разів виконано; збирається лише з DB_QUERY_DEBUG
+    statements: StatementCounter | None = None
+
+    def repeated(self) -> list[tuple[str, int]]:
+        if not self.statements:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= DB_QUERY_REPEAT_WARN]
+
+
+# Статистика БД поточного HTTP-запиту; None поза запитом (воркери, CLI)
+_request_db: ContextVar[RequestDbStats | None] = ContextVar("request_db", default=None)
+
+
+def instrument_queries(engine) -> None:
+    """Рахує SQL-запити та їх час: загалом і для поточного HTTP-запиту."""
+    if not METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        DB_QUERIES.inc()
+        stats = _request_db.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+            if stats.statements is not None:
+                stats.statements[statement] += 1
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: латентність за шаблоном маршруту (/api/books/{book_id},
+    а не конкретним id — обмежена кількість серій), запити в обробці і SQL на запит.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestDbStats(statements=StatementCounter() if DB_QUERY_DEBUG else None)
+        token = _request_db.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if DB_QUERY_DEBUG:
+                    # запити, виконані до початку відповіді (тіло StreamingResponse — ні)
+                    header = (b"x-db-queries", str(stats.queries).encode())
+                    message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _request_db.reset(token)
+            route = _route_label(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(time.perf_counter() - started)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_TIME.labels(method, route).observe(stats.seconds)
+            if DB_QUERY_DEBUG:
+                warn_query_budget(method, route, stats)
+
+
+def warn_query_budget(method: str, route: str, stats: RequestDbStats) -> None:
+    if stats.queries > DB_QUERY_WARN:
+        print(f"[DB] {method} {route}: {stats.queries} queries (> {DB_QUERY_WARN})")
+    for sql, count in stats.repeated():
+        print(f"[DB] {method} {route}: possible N+1, {count}x {' '.join(sql.split())[:120]}")
+
+
+def _route_label(scope) -> str:
+    # FastAPI кладе знайдений маршрут у scope; статика та 404 — спільна серія
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+@contextmanager
+def timed_smtp():
+    """Вимірює одну відправку листа; outcome=error, якщо виник виняток."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        SMTP_LATENCY.labels(outcome).observe(time.perf_counter() - started)
+
+
+class PoolCollector:
+    """Стан пулу з'єднань (src.core.db_pool) у момент зчитування /metrics."""
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def collect(self):
+        stats = self._snapshot()
+        for name in ("size", "checked_out", "checked_in", "overflow"):
+            yield GaugeMetricFamily(f"db_pool_{name}", f"Пул з'єднань: {name}", value=stats[name])
+        for name in ("checkouts", "checkout_timeouts", "connects"):
+            yield CounterMetricFamily(f"db_pool_{name}", f"Пул з'єднань: {name}", value=stats[name])
+        yield GaugeMetricFamily(
+            "db_pool_wait_seconds_max", "Найдовше очікування на з'єднання",
+            value=stats["wait_ms_max"] / 1000,
+        )
+
+
+def register_pool_collector(snapshot) -> None:
+    if METRICS_ENABLED:
+        REGISTRY.register(PoolCollector(snapshot))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
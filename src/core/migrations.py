@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from src.core.database import DATABASE_URL, engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "migrations"
+
+# довільний сталий ключ, щоб кілька воркерів не мігрували базу одночасно
+MIGRATION_LOCK_ID = 7_204_519
+# ревізія, що відповідає схемі, яку раніше створював Base.metadata.create_all
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    # без alembic.ini: env.py не чіпає налаштування логування застосунку
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def _upgrade(connection) -> None:
+    connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    config = alembic_config()
+    config.attributes["connection"] = connection
+
+    # база, створена ще через create_all: таблиці є, історії міграцій немає
+    tables = inspect(connection).get_table_names()
+    if "alembic_version" not in tables and "books" in tables:
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+
+
+async def run_migrations() -> None:
+    """Доводить схему БД до останньої ревізії Alembic."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
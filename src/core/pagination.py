@@ -0,0 +1,30 @@
+import base64
+import json
+from typing import Any
+
+# Розмір сторінки за замовчуванням і верхня межа для курсорної пагінації
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Пакує значення ключа сортування останнього рядка у непрозорий курсор."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Розпаковує курсор, створений encode_cursor.
+    Кидає ValueError, якщо курсор пошкоджений або має іншу кількість полів.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+
+    return values
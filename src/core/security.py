@@ -1,4 +1,6 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from secrets import token_urlsafe
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
@@ -14,7 +16,15 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 # 🔑 Контекст для хешування паролів
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt відпускає GIL, тому пул потоків дає справжній паралелізм;
+# розмір пулу — це і є ліміт одночасних хешувань (решта чекає в черзі)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+_unusable_hash: str | None = None
 
 
 def hash_password(password: str) -> str:
@@ -29,6 +39,29 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password у пулі потоків — не блокує event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password у пулі потоків — не блокує event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain, hashed)
+
+
+async def unusable_password_hash() -> str:
+    """
+    Хеш випадкового секрету для автоматично створених користувачів:
+    такий пароль неможливо ввести, а рахується він один раз на процес.
+    """
+    global _unusable_hash
+    if _unusable_hash is None:
+        _unusable_hash = await hash_password_async(token_urlsafe(32))
+    return _unusable_hash
+
+
 def create_token(data: dict) -> str:
     """Створює JWT-токен із часом життя ACCESS_TOKEN_EXPIRE_MINUTES."""
     to_encode = data.copy()
@@ -1,8 +1,27 @@
+"""
+Початкові дані.
+
+    python -m src.core.seed                                  # демо: три книги й адміністратор
+    python -m src.core.seed --size 1m --seed 7 --workers 8   # синтетичний набір для бенчмарків
+"""
+import argparse
 import asyncio
-from sqlalchemy import select
-from src.core.database import async_session_maker
-from src.core.security import hash_password
-from src.api.models.bookdb import Book
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.engine import make_url
+
+from src.core import synthetic_data
+from src.core.database import DATABASE_URL, Base, async_session_maker, engine
+from src.core.migrations import run_migrations
+from src.core.security import hash_password_async
+from src.core.synthetic_data import Dataset, ISBN_PREFIX, PRESETS, SYNTHETIC_PASSWORD
+from src.api.models.bookdb import Book, touch_book
+from src.api.models.reservation import Reservation
+from src.api.models.review import Review
 from src.api.models.user import User, UserRole
 
 
@@ -30,6 +49,7 @@ async def seed():
                 "genres": ["programming"],
                 "total_copies": 3,
                 "cover_image": "/static/covers/clean.png",
+                "pdf_path": "clean_code.pdf",
             },
             {
                 "title": "Дота 2 для чайників",
@@ -41,10 +61,13 @@ async def seed():
             },
         ]
 
+        result = await session.execute(
+            select(Book).where(Book.isbn.in_([data["isbn"] for data in books_to_seed]))
+        )
+        existing_by_isbn = {book.isbn: book for book in result.scalars()}
+
         for data in books_to_seed:
-            stmt = select(Book).where(Book.isbn == data["isbn"])
-            result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
+            existing = existing_by_isbn.get(data["isbn"])
 
             if not existing:
                 book = Book(
@@ -55,6 +78,7 @@ async def seed():
                     total_copies=data["total_copies"],
                     reserved_count=0,        # важливо!
                     cover_image=data.get("cover_image"),
+                    pdf_path=data.get("pdf_path"),
                 )
                 session.add(book)
                 print(f"[ADDED] Book: {book.title}")
@@ -74,7 +98,7 @@ async def seed():
         if not admin:
             admin = User(
                 email="admin@lib.com",
-                password_hash=hash_password("admin123"),
+                password_hash=await hash_password_async("admin123"),
                 role=UserRole.librarian,
             )
             session.add(admin)
@@ -86,5 +110,126 @@ async def seed():
         print("✨ SEED COMPLETE")
 
 
+async def _load_phase(pool, dsn: str, data: Dataset, table: str, total: int, chunk_size: int) -> dict[str, int]:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, synthetic_data.load_chunk, dsn, data, table, chunk, start, stop)
+        for chunk, start, stop in synthetic_data.chunk_ranges(total, chunk_size)
+    ))
+    counts = {}
+    for result in results:
+        for name, rows in result.items():
+            counts[name] = counts.get(name, 0) + rows
+    for name, rows in counts.items():
+        print(f"[COPY] {name}: {rows} rows ({time.perf_counter() - started:.1f}s)")
+    return counts
+
+
+async def _finalize(seed_value: int) -> int:
+    """Узгоджує лічильники книг з завантаженими рядками; повертає кількість зайвих резервацій."""
+    synthetic = Book.isbn.like(f"{ISBN_PREFIX}{seed_value}-%")
+    async with async_session_maker() as session:
+        # попит на популярні книги більший за фонд: лишаються перші total_copies резервацій
+        ranked = (
+            select(
+                Reservation.id,
+                Book.total_copies,
+                func.row_number().over(
+                    partition_by=Reservation.book_id, order_by=(Reservation.from_date, Reservation.id)
+                ).label("position"),
+            )
+            .join(Book, Book.id == Reservation.book_id)
+            .where(synthetic)
+            .subquery()
+        )
+        trimmed = await session.execute(
+            delete(Reservation)
+            .where(Reservation.id == ranked.c.id, ranked.c.position > ranked.c.total_copies)
+            .execution_options(synchronize_session=False)
+        )
+
+        reserved = (
+            select(Reservation.book_id, func.count().label("n"))
+            .group_by(Reservation.book_id)
+            .subquery()
+        )
+        await session.execute(
+            update(Book)
+            .where(Book.id == reserved.c.book_id, synthetic)
+            .values(reserved_count=reserved.c.n, **touch_book())
+            .execution_options(synchronize_session=False)
+        )
+        ratings = (
+            select(Review.book_id, func.count().label("n"), func.sum(Review.rating).label("total"))
+            .group_by(Review.book_id)
+            .subquery()
+        )
+        await session.execute(
+            update(Book)
+            .where(Book.id == ratings.c.book_id, synthetic)
+            .values(review_count=ratings.c.n, rating_sum=ratings.c.total, **touch_book())
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    # свіжа статистика планувальника — інакше перші запити бенчмарку йдуть не тими планами
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    return trimmed.rowcount
+
+
+async def seed_synthetic(size: str, seed_value: int, workers: int, truncate: bool = False) -> dict:
+    """
+    Синтетичний набір розміру PRESETS[size]: книги, читачі (пароль SYNTHETIC_PASSWORD),
+    резервації, відгуки й обране. Той самий seed дає ті самі рядки.
+    """
+    await run_migrations()
+    async with async_session_maker() as session:
+        if truncate:
+            tables = ", ".join(t.name for t in Base.metadata.sorted_tables)
+            await session.execute(text(f"TRUNCATE {tables} CASCADE"))
+            await session.commit()
+        elif await session.scalar(select(Book.id).where(Book.isbn.like(f"{ISBN_PREFIX}{seed_value}-%")).limit(1)):
+            raise SystemExit(f"Synthetic data for seed {seed_value} already exists; use --truncate or another --seed")
+
+    data = Dataset.for_size(PRESETS[size], seed_value, await hash_password_async(SYNTHETIC_PASSWORD))
+    dsn = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    started = time.perf_counter()
+
+    # spawn: воркер імпортує лише src.core.synthetic_data
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        counts = {}
+        # книги й читачі незалежні; активність посилається на обидві таблиці
+        for phase in await asyncio.gather(
+            _load_phase(pool, dsn, data, "books", data.books, synthetic_data.CHUNK_ROWS),
+            _load_phase(pool, dsn, data, "users", data.users, synthetic_data.CHUNK_ROWS),
+        ):
+            counts.update(phase)
+        counts.update(await _load_phase(
+            pool, dsn, data, "activity", data.users, synthetic_data.ACTIVITY_CHUNK_USERS
+        ))
+
+    counts["reservations"] -= await _finalize(seed_value)
+    await engine.dispose()
+    print(f"✨ SYNTHETIC SEED COMPLETE in {time.perf_counter() - started:.1f}s: {counts}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=list(PRESETS), help="синтетичний набір замість демо-даних")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--truncate", action="store_true", help="спершу очистити всі таблиці")
+    args = parser.parse_args()
+
+    if args.size:
+        asyncio.run(seed_synthetic(args.size, args.seed, args.workers, args.truncate))
+    else:
+        asyncio.run(seed())
+
+
 if __name__ == "__main__":
-    asyncio.run(seed())
+    main()
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+# Скільки байтів накопичуємо перед одним записом у потоці (менше переходів у thread pool)
+STORAGE_WRITE_BUFFER = int(os.getenv("STORAGE_WRITE_BUFFER", 1024 * 1024))
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    sha256: str
+    size: int
+    created: bool  # False — такий самий вміст уже був у сховищі
+
+
+class ContentStorage(ABC):
+    """
+    Сховище файлів з адресацією за вмістом: ключ = sha256 вмісту,
+    тож однакові завантаження зберігаються один раз.
+    """
+
+    @abstractmethod
+    async def store(self, chunks: AsyncIterator[bytes], suffix: str = "") -> StoredObject:
+        """Зберігає потік байтів. Якщо ітератор кидає виняток — нічого не зберігається."""
+
+    @abstractmethod
+    def path(self, key: str) -> Path:
+        """Локальний шлях до об'єкта (для віддачі файлу без копіювання в пам'ять)."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+
+def content_key(sha256: str, suffix: str = "") -> str:
+    # два символи префікса — щоб не складати всі файли в один каталог
+    return f"{sha256[:2]}/{sha256}{suffix}"
+
+
+class LocalStorage(ContentStorage):
+    """Локальна файлова система. Запис і хешування виконуються поза event loop."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self._tmp = self.root / ".tmp"
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError("Invalid storage key")
+        return path
+
+    async def store(self, chunks: AsyncIterator[bytes], suffix: str = "") -> StoredObject:
+        await asyncio.to_thread(self._tmp.mkdir, parents=True, exist_ok=True)
+        tmp_path = self._tmp / f"{uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+
+        def write(file, data: bytes):
+            # hashlib відпускає GIL на великих блоках — хешування паралельне з event loop
+            digest.update(data)
+            file.write(data)
+
+        file = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) >= STORAGE_WRITE_BUFFER:
+                    await asyncio.to_thread(write, file, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(write, file, bytes(buffer))
+            await asyncio.to_thread(file.close)
+
+            key = content_key(digest.hexdigest(), suffix)
+            created = await asyncio.to_thread(self._publish, tmp_path, self.path(key))
+        except BaseException:
+            file.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return StoredObject(key=key, sha256=digest.hexdigest(), size=size, created=created)
+
+    @staticmethod
+    def _publish(tmp_path: Path, target: Path) -> bool:
+        if target.exists():
+            tmp_path.unlink()
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # атомарно: читачі бачать або старий стан, або повний файл
+        os.replace(tmp_path, target)
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self.path(key).exists)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.path(key).unlink, missing_ok=True)
+
+
+# Нові бекенди (S3 тощо) реєструються тут і обираються змінною оточення
+STORAGE_BACKENDS: dict[str, type[ContentStorage]] = {
+    "local": LocalStorage,
+}
+
+
+def build_storage(backend: str, root: str | Path) -> ContentStorage:
+    try:
+        return STORAGE_BACKENDS[backend](root)
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,205 @@
+"""
+Генератор синтетичного набору даних для навантажувальних тестів.
+
+Рядки будуються детерміновано з (seed, таблиця, номер пачки) — результат не
+залежить від кількості воркерів. Кожна пачка вантажиться окремим COPY у
+процесі-воркері (spawn: модуль не імпортує застосунок, лише asyncpg).
+Популярність книг — за законом Ципфа: перші номери отримують більшість
+резервацій, відгуків і обраного; активність читачів — з важким хвостом.
+"""
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import asyncpg
+
+# розміри каталогу; решта таблиць — пропорційно
+PRESETS = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+USERS_PER_BOOK = 0.2
+# середня кількість на читача
+RESERVATIONS_PER_USER = 1.5
+REVIEWS_PER_USER = 4
+FAVORITES_PER_USER = 6
+# найактивніший читач не робить більше дій одного виду
+MAX_ACTIONS_PER_USER = 500
+
+ZIPF_EXPONENT = 1.1
+# рядків книг/користувачів в одному COPY; активність — пачками користувачів
+CHUNK_ROWS = 50_000
+ACTIVITY_CHUNK_USERS = 10_000
+
+ISBN_PREFIX = "syn-"
+EMAIL_DOMAIN = "synthetic.example"
+SYNTHETIC_PASSWORD = "synthetic123"
+
+GENRES = {
+    "fiction": 24, "fantasy": 12, "history": 10, "programming": 8, "science": 8, "romance": 8,
+    "detective": 7, "biography": 5, "poetry": 4, "travel": 4, "art": 3, "sci-fi": 5, "children": 2,
+}
+TITLE_FIRST = [
+    "Silent", "Northern", "Broken", "Golden", "Hidden", "Last", "Winter", "Distant", "Paper", "Iron",
+    "Тихий", "Далекий", "Останній", "Зимовий", "Золотий", "Забутий",
+]
+TITLE_SECOND = [
+    "river", "garden", "engine", "kingdom", "harbor", "letters", "orbit", "city", "forest", "algorithm",
+    "сад", "вітер", "острів", "місто", "ліс", "берег",
+]
+FIRST_NAMES = ["Anna", "Oleh", "Maria", "John", "Iryna", "Taras", "Emma", "Lesia", "David", "Sofia", "Mark", "Olena"]
+LAST_NAMES = ["Shevchenko", "Smith", "Kovalenko", "Brown", "Bondar", "Taylor", "Melnyk", "Wilson", "Tkachenko", "Clark"]
+COMMENTS = ["", "Great read.", "Could not put it down.", "Too long in the middle.", "Рекомендую!", "Не моє.", "Classic."]
+# рейтинги зміщені до високих, як у справжніх каталогах
+RATING_WEIGHTS = [5, 7, 15, 33, 40]
+
+BOOK_COLUMNS = ["id", "title", "author", "isbn", "genres", "total_copies", "reserved_count", "description", "published_year"]
+USER_COLUMNS = ["id", "email", "password_hash", "role"]
+RESERVATION_COLUMNS = ["id", "book_id", "user_id", "from_date", "until"]
+REVIEW_COLUMNS = ["id", "user_id", "book_id", "rating", "comment", "created_at"]
+FAVORITE_COLUMNS = ["user_id", "book_id"]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    seed: int
+    books: int
+    users: int
+    password_hash: str
+    # дати резервацій і відгуків відлічуються від цього дня
+    today: date
+
+    @classmethod
+    def for_size(cls, books: int, seed: int, password_hash: str, today: date | None = None) -> "Dataset":
+        return cls(seed, books, max(int(books * USERS_PER_BOOK), 50), password_hash, today or date.today())
+
+
+def row_uuid(seed: int, kind: int, index: int, sub: int = 0) -> str:
+    """Детермінований UUID: той самий seed і номер рядка дають той самий id."""
+    return f"{seed & 0xFFFFFFFF:08x}-5eed-{kind:04x}-{sub & 0xFFFF:04x}-{index:012x}"
+
+
+def book_id(seed: int, index: int) -> str:
+    return row_uuid(seed, 1, index)
+
+
+def user_id(seed: int, index: int) -> str:
+    return row_uuid(seed, 2, index)
+
+
+def zipf_index(rng: random.Random, n: int, s: float = ZIPF_EXPONENT) -> int:
+    """Номер у [0, n) з імовірністю ~ (номер+1)^-s (неперервне наближення, O(1))."""
+    a = 1 - s
+    x = (((n + 1) ** a - 1) * rng.random() + 1) ** (1 / a)
+    return min(int(x) - 1, n - 1)
+
+
+def heavy_tail(rng: random.Random, mean: float) -> int:
+    # Парето(1.5) має середнє 3: більшість читачів робить мало дій, одиниці — дуже багато
+    return min(round(rng.paretovariate(1.5) * mean / 3), MAX_ACTIONS_PER_USER)
+
+
+def _rng(data: Dataset, table: str, chunk: int) -> random.Random:
+    return random.Random(f"{data.seed}:{table}:{chunk}")
+
+
+def _line(values) -> str:
+    # текстовий формат COPY; згенеровані рядки не містять табуляцій і переносів
+    return "\t".join(r"\N" if v is None else str(v) for v in values)
+
+
+def chunk_ranges(total: int, size: int) -> list[tuple[int, int, int]]:
+    """(номер пачки, початок, кінець) для total рядків."""
+    return [(n, start, min(start + size, total)) for n, start in enumerate(range(0, total, size))]
+
+
+def book_rows(data: Dataset, chunk: int, start: int, stop: int):
+    rng = _rng(data, "books", chunk)
+    genres, weights = list(GENRES), list(GENRES.values())
+    for i in range(start, stop):
+        picked = sorted(set(rng.choices(genres, weights, k=rng.randint(1, 3))))
+        # популярним книгам бібліотека купує більше примірників
+        copies = 1 + int(rng.expovariate(0.5)) + int(20 / (i + 1) ** 0.5)
+        description = None if rng.random() < 0.3 else f"A {picked[0]} book about {rng.choice(TITLE_SECOND)}."
+        yield (
+            book_id(data.seed, i),
+            f"{rng.choice(TITLE_FIRST)} {rng.choice(TITLE_SECOND)} {i}",
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"{ISBN_PREFIX}{data.seed}-{i:08d}",
+            "{" + ",".join(picked) + "}",
+            copies,
+            0,
+            description,
+            max(data.today.year - int(rng.expovariate(1 / 15)), 1800),
+        )
+
+
+def user_rows(data: Dataset, chunk: int, start: int, stop: int):
+    rng = _rng(data, "users", chunk)
+    for i in range(start, stop):
+        role = "librarian" if rng.random() < 0.001 else "user"
+        yield user_id(data.seed, i), f"reader{i}.s{data.seed}@{EMAIL_DOMAIN}", data.password_hash, role
+
+
+def _pick_books(rng: random.Random, n_books: int, count: int) -> list[int]:
+    # без повторів у межах читача: (user_id, book_id) — унікальна пара
+    picked = {zipf_index(rng, n_books) for _ in range(count)}
+    return sorted(picked)
+
+
+def activity_rows(data: Dataset, chunk: int, start: int, stop: int) -> tuple[list, list, list]:
+    """Резервації, відгуки й обране читачів [start, stop)."""
+    rng = _rng(data, "activity", chunk)
+    reservations, reviews, favorites = [], [], []
+    for u in range(start, stop):
+        uid = user_id(data.seed, u)
+        for j, b in enumerate(_pick_books(rng, data.books, heavy_tail(rng, RESERVATIONS_PER_USER))):
+            from_date = data.today - timedelta(days=rng.randint(0, 13))
+            reservations.append((row_uuid(data.seed, 3, u, j), book_id(data.seed, b), uid, from_date, from_date + timedelta(days=14)))
+        for j, b in enumerate(_pick_books(rng, data.books, heavy_tail(rng, REVIEWS_PER_USER))):
+            created = datetime.combine(data.today, datetime.min.time()) - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+            rating = rng.choices(range(1, 6), RATING_WEIGHTS)[0]
+            reviews.append((row_uuid(data.seed, 4, u, j), uid, book_id(data.seed, b), rating, rng.choice(COMMENTS), created))
+        for b in _pick_books(rng, data.books, heavy_tail(rng, FAVORITES_PER_USER)):
+            favorites.append((uid, book_id(data.seed, b)))
+    return reservations, reviews, favorites
+
+
+async def _copy(dsn: str, batches: list[tuple[str, list[str], list]]) -> None:
+    # синхронний commit не потрібен: набір перебудовується з seed
+    conn = await asyncpg.connect(dsn, server_settings={"synchronous_commit": "off"})
+    try:
+        async with conn.transaction():
+            for table, columns, rows in batches:
+                if rows:
+                    payload = ("\n".join(_line(r) for r in rows) + "\n").encode()
+                    await conn.copy_to_table(table, source=_chunks(payload), columns=columns, format="text")
+    finally:
+        await conn.close()
+
+
+async def _chunks(payload: bytes, size: int = 1 << 20):
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+def load_chunk(dsn: str, data: Dataset, table: str, chunk: int, start: int, stop: int) -> dict[str, int]:
+    """Точка входу воркера: генерує пачку і вантажить її COPY в одній транзакції."""
+    if table == "books":
+        batches = [("books", BOOK_COLUMNS, list(book_rows(data, chunk, start, stop)))]
+    elif table == "users":
+        batches = [("users", USER_COLUMNS, list(user_rows(data, chunk, start, stop)))]
+    else:
+        reservations, reviews, favorites = activity_rows(data, chunk, start, stop)
+        batches = [
+            ("reservations", RESERVATION_COLUMNS, reservations),
+            ("reviews", REVIEW_COLUMNS, reviews),
+            ("favorites", FAVORITE_COLUMNS, favorites),
+        ]
+    asyncio.run(_copy(dsn, batches))
+    return {name: len(rows) for name, _, rows in batches}
@@ -0,0 +1,69 @@
+"""catalog keyset index, mail outbox, denormalized rating stats
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-12-01 00:00:01
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+AVERAGE_RATING = (
+    "coalesce(CAST(rating_sum AS FLOAT) / "
+    "CAST(nullif(CAST(review_count AS FLOAT), 0) AS FLOAT), 0)"
+)
+
+
+def upgrade() -> None:
+    op.create_index("ix_books_title_id", "books", ["title", "id"])
+
+    op.create_table(
+        "mail_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("to_email", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("status", sa.Enum("pending", "sent", "failed", name="mailstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_mail_outbox_status_next_attempt", "mail_outbox", ["status", "next_attempt_at"])
+
+    op.add_column("books", sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("books", sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0"))
+
+    # заповнюємо агрегати для вже наявних відгуків
+    op.execute("""
+        UPDATE books b
+        SET review_count = s.cnt, rating_sum = s.total
+        FROM (
+            SELECT book_id, count(*) AS cnt, sum(rating) AS total
+            FROM reviews
+            GROUP BY book_id
+        ) s
+        WHERE b.id = s.book_id
+    """)
+
+    op.create_index(
+        "ix_books_average_rating_id",
+        "books",
+        [sa.text(f"{AVERAGE_RATING} DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_average_rating_id", table_name="books")
+    op.drop_column("books", "rating_sum")
+    op.drop_column("books", "review_count")
+    op.drop_index("ix_mail_outbox_status_next_attempt", table_name="mail_outbox")
+    op.drop_table("mail_outbox")
+    sa.Enum(name="mailstatus").drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_books_title_id", table_name="books")
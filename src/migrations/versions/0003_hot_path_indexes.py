@@ -0,0 +1,41 @@
+"""indexes for hot query predicates, unique favorites
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-12-01 00:00:02
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_reservations_user_id", "reservations", ["user_id"])
+    op.create_index("ix_reservations_until", "reservations", ["until"])
+    op.create_index("ix_reviews_book_id_created_at", "reviews", ["book_id", "created_at"])
+
+    # search_books фільтрує за genres && :genres
+    op.create_index("ix_books_genres", "books", ["genres"], postgresql_using="gin")
+
+    # прибираємо дублікати, що могли з'явитися через гонку check-then-insert
+    op.execute("""
+        DELETE FROM favorites f
+        USING favorites d
+        WHERE f.user_email = d.user_email
+          AND f.book_id = d.book_id
+          AND f.id > d.id
+    """)
+    op.create_unique_constraint(
+        "uq_favorites_user_email_book_id", "favorites", ["user_email", "book_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_favorites_user_email_book_id", "favorites", type_="unique")
+    op.drop_index("ix_books_genres", table_name="books")
+    op.drop_index("ix_reviews_book_id_created_at", table_name="reviews")
+    op.drop_index("ix_reservations_until", table_name="reservations")
+    op.drop_index("ix_reservations_user_id", table_name="reservations")
@@ -0,0 +1,56 @@
+"""full-text search vector and trigram indexes for the catalog
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-12-08 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(author, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(isbn, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
+TRIGRAM_INDEXES = {
+    "ix_books_title_trgm": "title",
+    "ix_books_author_trgm": "author",
+}
+
+
+def _trigram_available(bind) -> bool:
+    return bool(bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    )).scalar())
+
+
+def upgrade() -> None:
+    op.add_column(
+        "books",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True)),
+    )
+    op.create_index("ix_books_search_vector", "books", ["search_vector"], postgresql_using="gin")
+
+    # pg_trgm входить у contrib; без нього пошук працює лише за tsvector
+    if _trigram_available(op.get_bind()):
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, column in TRIGRAM_INDEXES.items():
+            op.create_index(
+                name, "books", [column],
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    for name in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.drop_index("ix_books_search_vector", table_name="books")
+    op.drop_column("books", "search_vector")
@@ -0,0 +1,21 @@
+"""track sent reservation reminders
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-12-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("reservations", sa.Column("reminder_sent_for", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("reservations", "reminder_sent_for")
@@ -0,0 +1,21 @@
+"""ebook file reference on books
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-12-22 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("books", sa.Column("pdf_path", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("books", "pdf_path")
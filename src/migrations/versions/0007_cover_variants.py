@@ -0,0 +1,22 @@
+"""precomputed cover image variants
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-12-29 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("books", sa.Column("cover_variants", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("books", "cover_variants")
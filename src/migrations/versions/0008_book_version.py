@@ -0,0 +1,29 @@
+"""book representation version for ETags
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-01-05 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("books", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column(
+        "books",
+        sa.Column(
+            "updated_at", sa.DateTime(), nullable=False,
+            server_default=sa.text("timezone('utc', now())"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("books", "updated_at")
+    op.drop_column("books", "version")
@@ -0,0 +1,54 @@
+"""favorites keyed by (user_id, book_id)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-01-12 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("favorites", sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.execute("""
+        UPDATE favorites f
+        SET user_id = u.id
+        FROM users u
+        WHERE u.email = f.user_email
+    """)
+    op.drop_constraint("favorites_pkey", "favorites", type_="primary")
+    op.drop_constraint("uq_favorites_user_email_book_id", "favorites", type_="unique")
+    op.drop_column("favorites", "id")
+    op.drop_column("favorites", "user_email")
+    op.alter_column("favorites", "user_id", nullable=False)
+    op.create_foreign_key("favorites_user_id_fkey", "favorites", "users", ["user_id"], ["id"])
+    op.create_primary_key("favorites_pkey", "favorites", ["user_id", "book_id"])
+
+
+def downgrade() -> None:
+    op.add_column(
+        "favorites",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    )
+    op.add_column("favorites", sa.Column("user_email", sa.String(), nullable=True))
+    op.execute("""
+        UPDATE favorites f
+        SET user_email = u.email
+        FROM users u
+        WHERE u.id = f.user_id
+    """)
+    op.drop_constraint("favorites_pkey", "favorites", type_="primary")
+    op.drop_column("favorites", "user_id")
+    op.alter_column("favorites", "id", server_default=None)
+    op.alter_column("favorites", "user_email", nullable=False)
+    op.create_foreign_key("favorites_user_email_fkey", "favorites", "users", ["user_email"], ["email"])
+    op.create_primary_key("favorites_pkey", "favorites", ["id"])
+    op.create_unique_constraint(
+        "uq_favorites_user_email_book_id", "favorites", ["user_email", "book_id"]
+    )
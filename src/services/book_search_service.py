@@ -0,0 +1,108 @@
+import re
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, or_, case, cast, text, tuple_, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.bookdb import Book, SEARCH_CONFIG
+from src.api.schemas.books import BookResponse, BookSearchHit, BookSearchPage
+from src.core.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+
+# Слова запиту (літери/цифри) — решта символів не потрапляє у tsquery
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Бонус до релевантності за точний збіг ISBN
+ISBN_MATCH_BOOST = 1.0
+
+# None — ще не перевіряли; результат кешується на процес
+_trigram_available: bool | None = None
+
+
+def build_tsquery(q: str) -> str | None:
+    """'гаррі пот' -> 'гаррі:* & пот:*' (префіксний пошук по всіх словах)."""
+    words = _WORD.findall(q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+async def trigram_available(session: AsyncSession) -> bool:
+    """Чи встановлено розширення pg_trgm (нечіткий пошук з опечатками)."""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = bool(await session.scalar(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ))
+    return _trigram_available
+
+
+async def search_catalog(
+        session: AsyncSession,
+        q: str,
+        genres: list[str] | None = None,
+        available_only: bool = False,
+        limit: int | None = None,
+        cursor: str | None = None,
+) -> BookSearchPage:
+    """
+    Пошук за назвою, автором, ISBN та описом.
+    Збіги шукаються через tsvector (GIN-індекс), опечатки в назві й авторі —
+    через триграмну схожість (якщо є pg_trgm), точний ISBN — через унікальний індекс.
+    Результати впорядковані за релевантністю (score, id) з keyset-пагінацією.
+    """
+    q = q.strip()
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    matches = [Book.isbn == q]
+    score = case((Book.isbn == q, ISBN_MATCH_BOOST), else_=0.0)
+
+    tsquery = build_tsquery(q)
+    if tsquery:
+        ts_query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        matches.append(Book.search_vector.op("@@")(ts_query))
+        score = score + cast(func.ts_rank_cd(Book.search_vector, ts_query), Float)
+
+    if await trigram_available(session):
+        # col %> q — word_similarity(q, col) вище порогу; підтримується GIN gin_trgm_ops
+        matches.append(Book.title.op("%>")(q))
+        matches.append(Book.author.op("%>")(q))
+        score = score + func.greatest(
+            func.word_similarity(q, Book.title),
+            func.word_similarity(q, Book.author),
+        )
+
+    query = select(Book, score.label("score")).where(or_(*matches))
+    if genres:
+        query = query.where(Book.genres.overlap(genres))
+    if available_only:
+        query = query.where(Book.total_copies > Book.reserved_count)
+
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, 2)
+            if not isinstance(value, (int, float)):
+                raise ValueError("Invalid cursor")
+            last_id = UUID(last_id)
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(score, Book.id) < tuple_(float(value), last_id))
+
+    result = await session.execute(
+        query.order_by(score.desc(), Book.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_book, last_score = rows[-1]
+        next_cursor = encode_cursor([last_score, str(last_book.id)])
+
+    return BookSearchPage(
+        items=[
+            BookSearchHit(**BookResponse.from_orm(book).model_dump(), score=round(book_score, 4))
+            for book, book_score in rows
+        ],
+        next_cursor=next_cursor,
+    )
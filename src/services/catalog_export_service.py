@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from src.core.database import async_session_maker
+from src.api.models.bookdb import Book
+
+
+# Колонки, які віддаються назовні (без ORM-об'єктів — лише рядки)
+EXPORT_COLUMNS = (
+    Book.id,
+    Book.title,
+    Book.author,
+    Book.isbn,
+    Book.genres,
+    Book.total_copies,
+    Book.reserved_count,
+    Book.cover_image,
+    Book.description,
+    Book.published_year,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+# Скільки рядків тягнемо з серверного курсора за раз
+EXPORT_BATCH_SIZE = 1000
+
+# Роздільник жанрів у CSV (масив не має стандартного представлення)
+GENRES_SEPARATOR = "|"
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(row._mapping), ensure_ascii=False, default=str) + "\n"
+        for row in rows
+    )
+
+
+def _encode_csv(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        values = dict(row._mapping)
+        values["genres"] = GENRES_SEPARATOR.join(values["genres"] or [])
+        writer.writerow([values[field] for field in EXPORT_FIELDS])
+    return buffer.getvalue()
+
+
+async def stream_catalog(fmt: str) -> AsyncIterator[str]:
+    """
+    Потоково віддає каталог у форматі NDJSON або CSV.
+    Читає серверним курсором пачками по EXPORT_BATCH_SIZE, тому пам'ять
+    не залежить від розміру каталогу.
+    """
+    async with async_session_maker() as session:
+        result = await session.stream(
+            select(*EXPORT_COLUMNS)
+            .order_by(Book.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if fmt == "csv":
+            yield _encode_csv([], header=True)
+
+        async for rows in result.partitions():
+            yield _encode_csv(rows) if fmt == "csv" else _encode_ndjson(rows)
@@ -0,0 +1,271 @@
+import asyncio
+import codecs
+import csv
+import io
+import json
+import os
+from pathlib import Path
+from typing import AsyncIterator
+
+import asyncpg
+from pydantic import ValidationError
+from sqlalchemy import Table, Column, MetaData, String, Integer, Text, and_, all_, any_, case, select, update, func, literal, null
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import async_session_maker
+from src.api.models.bookdb import Book, touch_book
+from src.api.schemas.books import BookCreate
+from src.services.catalog_export_service import GENRES_SEPARATOR
+
+
+# Скільки валідних рядків вантажимо одним COPY + merge (одна транзакція)
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+# Скільки помилок повертаємо у звіті (решта лише рахується)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 1000))
+
+# Межі PostgreSQL integer: BookCreate приймає будь-який int Python
+INT32_RANGE = range(-2**31, 2**31)
+
+# Тимчасова таблиця на транзакцію одного чанку (не входить у Base.metadata)
+books_staging = Table(
+    "books_import_staging",
+    MetaData(),
+    Column("title", String),
+    Column("author", String),
+    Column("isbn", String),
+    Column("total_copies", Integer),
+    Column("genres", ARRAY(String)),
+    Column("cover_image", String),
+    Column("description", Text),
+    Column("published_year", Integer),
+    # поля, які запис задав явно; решта у наявної книги не змінюється
+    Column("supplied", ARRAY(String)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def row_error(book: BookCreate) -> str | None:
+    """Значення, що пройшли BookCreate, але які PostgreSQL не прийме."""
+    for name in ("total_copies", "published_year"):
+        value = getattr(book, name)
+        if value is not None and value not in INT32_RANGE:
+            return f"{name}: out of range"
+    texts = [book.title, book.author, book.isbn, book.cover_image, book.description, *book.genres]
+    if any(text and "\x00" in text for text in texts):
+        return "text fields must not contain NUL characters"
+    return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Байтові шматки -> рядки UTF-8 (з \\n у кінці), без читання всього файлу."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line + "\n"
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _csv_record(header: list[str], values: list[str]) -> dict:
+    record = {key: value for key, value in zip(header, values) if value != ""}
+    if "genres" in record:
+        record["genres"] = [g for g in record["genres"].split(GENRES_SEPARATOR) if g]
+    return record
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Потоково розбирає CSV (з заголовком) або NDJSON.
+    Повертає (номер запису, dict) або (номер запису, текст помилки).
+    """
+    row = 0
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield row, f"invalid JSON: {exc}"
+                continue
+            yield (row, record) if isinstance(record, dict) else (row, "expected a JSON object")
+        return
+
+    header = None
+    pending = ""
+    async for line in iter_lines(chunks):
+        pending += line
+        # запис завершено, якщо лапки збалансовані (поле може містити перенос рядка)
+        if pending.count('"') % 2:
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader(io.StringIO(text)))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        yield row, _csv_record(header, values)
+
+    if pending.strip():
+        yield row + 1, "unterminated quoted field"
+
+
+BOOK_COLUMNS = [column.name for column in books_staging.columns if column.name != "supplied"]
+
+
+def insert_statement():
+    """INSERT ... SELECT зі staging нових ISBN; повертає вставлені ISBN."""
+    return (
+        pg_insert(Book.__table__)
+        .from_select(
+            ["id", *BOOK_COLUMNS, "reserved_count"],
+            select(func.gen_random_uuid(), *(books_staging.c[name] for name in BOOK_COLUMNS), literal(0)),
+        )
+        .on_conflict_do_nothing(index_elements=[Book.isbn])
+        .returning(Book.isbn)
+    )
+
+
+def update_statement(inserted: list[str]):
+    """
+    UPDATE наявних книг зі staging за ISBN (крім щойно вставлених).
+    Змінюються лише поля, задані в записі; нова обкладинка скидає її варіанти.
+    """
+    books, staged = Book.__table__, books_staging.c
+
+    def supplied(name: str):
+        return literal(name) == any_(staged.supplied)
+
+    return (
+        update(books)
+        .where(books.c.isbn == staged.isbn, staged.isbn != all_(literal(inserted, ARRAY(String))))
+        .values(
+            **{
+                name: case((supplied(name), staged[name]), else_=books.c[name])
+                for name in BOOK_COLUMNS if name != "isbn"
+            },
+            cover_variants=case(
+                (and_(supplied("cover_image"), staged.cover_image.is_distinct_from(books.c.cover_image)), null()),
+                else_=books.c.cover_variants,
+            ),
+            **touch_book(),
+        )
+    )
+
+
+async def load_chunk(session: AsyncSession, books: list[dict]) -> tuple[int, int]:
+    """COPY чанку у staging і merge у books. Повертає (вставлено, оновлено)."""
+    conn = await session.connection()
+    await conn.run_sync(books_staging.create)
+
+    raw = await conn.get_raw_connection()
+    columns = [column.name for column in books_staging.columns]
+    await raw.driver_connection.copy_records_to_table(
+        books_staging.name,
+        records=[tuple(book[name] for name in columns) for book in books],
+        columns=columns,
+    )
+
+    # спершу нові ISBN, потім решта: книгу, вставлену паралельним імпортом між
+    # цими запитами, UPDATE побачить (READ COMMITTED)
+    inserted = (await session.execute(insert_statement())).scalars().all()
+    updated = (await session.execute(update_statement(inserted))).rowcount
+    await session.commit()
+    return len(inserted), updated
+
+
+async def import_catalog(session: AsyncSession, chunks: AsyncIterator[bytes], fmt: str) -> dict:
+    """
+    Масовий імпорт каталогу. Кожен запис перевіряється BookCreate;
+    валідні вантажаться чанками по IMPORT_CHUNK_SIZE (COPY у тимчасову
+    таблицю + INSERT нових ISBN і UPDATE наявних), кожен чанк — окремий commit.
+    Повторний ISBN у межах чанку: перемагає останній запис.
+    """
+    report = {"rows": 0, "inserted": 0, "updated": 0, "duplicates": 0, "failed": 0, "errors": []}
+    chunk: dict[str, dict] = {}
+    # ISBN -> номер запису, щоб звітувати про відхилений базою чанк
+    chunk_rows: dict[str, int] = {}
+
+    def fail(row: int, isbn, error: str):
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"row": row, "isbn": isbn, "error": error})
+
+    async def flush():
+        if not chunk:
+            return
+        try:
+            inserted, updated = await load_chunk(session, list(chunk.values()))
+        except (DBAPIError, asyncpg.PostgresError, OverflowError) as exc:
+            # запасний шлях: попередні чанки вже зафіксовані, тож не обриваємо імпорт
+            await session.rollback()
+            error = f"chunk rejected by the database: {str(getattr(exc, 'orig', None) or exc).splitlines()[0]}"
+            for isbn, row in chunk_rows.items():
+                fail(row, isbn, error)
+        else:
+            report["inserted"] += inserted
+            report["updated"] += updated
+        chunk.clear()
+        chunk_rows.clear()
+
+    async for row, record in iter_records(chunks, fmt):
+        report["rows"] += 1
+        if isinstance(record, str):
+            fail(row, None, record)
+            continue
+
+        try:
+            book = BookCreate.model_validate(record)
+        except ValidationError as exc:
+            error = "; ".join(
+                f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()
+            )
+            isbn = record.get("isbn")
+            # у звіті лише рядок: {"isbn": 123} у NDJSON — теж помилка цього запису
+            fail(row, isbn if isinstance(isbn, str) else None, error)
+            continue
+
+        if error := row_error(book):
+            fail(row, book.isbn, error)
+            continue
+
+        if chunk.pop(book.isbn, None) is not None:
+            report["duplicates"] += 1
+        chunk[book.isbn] = {**book.model_dump(), "supplied": sorted(book.model_fields_set)}
+        chunk_rows[book.isbn] = row
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await flush()
+
+    await flush()
+    return report
+
+
+async def _file_chunks(path: Path, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+async def main(path: str, fmt: str | None = None):
+    path = Path(path)
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    async with async_session_maker() as session:
+        report = await import_catalog(session, _file_chunks(path), fmt)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    # python -m src.services.catalog_import_service books.csv [csv|ndjson]
+    import sys
+
+    asyncio.run(main(*sys.argv[1:3]))
@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.bookdb import Book, touch_book
+from src.core.catalog_cache import invalidate_books
+from src.core.images import render_variants
+from src.core.storage import build_storage
+
+COVER_STORAGE_BACKEND = os.getenv("COVER_STORAGE_BACKEND", "local")
+# за замовчуванням — у каталозі, який віддає StaticFiles (/static)
+COVER_STORAGE_DIR = os.getenv(
+    "COVER_STORAGE_DIR",
+    str(Path(__file__).resolve().parents[1] / "frontend" / "static" / "covers"),
+)
+COVER_URL_PREFIX = os.getenv("COVER_URL_PREFIX", "/static/covers")
+COVER_MAX_BYTES = int(os.getenv("COVER_MAX_BYTES", 10 * 1024 * 1024))
+COVER_WIDTHS = tuple(int(w) for w in os.getenv("COVER_WIDTHS", "160,320,640").split(","))
+COVER_WORKERS = int(os.getenv("COVER_WORKERS", min(2, os.cpu_count() or 1)))
+
+cover_storage = build_storage(COVER_STORAGE_BACKEND, COVER_STORAGE_DIR)
+
+# пул процесів створюється при першому завантаженні обкладинки
+_cover_executor: ProcessPoolExecutor | None = None
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _cover_executor
+    if _cover_executor is None:
+        # spawn: воркер імпортує лише src.core.images, без стану event loop батьківського процесу
+        _cover_executor = ProcessPoolExecutor(
+            max_workers=COVER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _cover_executor
+
+
+def shutdown_cover_workers():
+    global _cover_executor
+    if _cover_executor is not None:
+        _cover_executor.shutdown(cancel_futures=True)
+        _cover_executor = None
+
+
+async def _single(data: bytes):
+    yield data
+
+
+async def read_limited(chunks, max_bytes: int) -> bytes:
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Файл завеликий"
+            )
+    return bytes(body)
+
+
+async def attach_cover(session: AsyncSession, book_id: UUID, chunks) -> dict[str, dict[str, str]]:
+    """
+    Генерує варіанти обкладинки (COVER_WIDTHS × WebP/JPEG) у пулі процесів,
+    зберігає їх під іменами за хешем вмісту і записує карту URL у books.cover_variants.
+    cover_image вказує на найбільший JPEG — для клієнтів, що не знають про варіанти.
+    """
+    exists = await session.scalar(select(Book.id).where(Book.id == book_id))
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Книга не знайдена")
+
+    data = await read_limited(chunks, COVER_MAX_BYTES)
+
+    loop = asyncio.get_running_loop()
+    try:
+        rendered = await loop.run_in_executor(_executor(), render_variants, data, COVER_WIDTHS)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Файл має бути зображенням"
+        )
+
+    variants: dict[str, dict[str, str]] = {}
+    for fmt, by_width in rendered.items():
+        variants[fmt] = {}
+        for width, image in sorted(by_width.items()):
+            stored = await cover_storage.store(_single(image), suffix=f".{fmt}")
+            variants[fmt][f"{width}w"] = f"{COVER_URL_PREFIX}/{stored.key}"
+
+    largest_jpeg = variants["jpeg"][max(variants["jpeg"], key=lambda w: int(w[:-1]))]
+    result = await session.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(cover_variants=variants, cover_image=largest_jpeg, **touch_book())
+        .returning(Book.id)
+    )
+    if result.scalar_one_or_none() is None:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Книга не знайдена")
+    await session.commit()
+    invalidate_books(book_id)
+
+    return variants
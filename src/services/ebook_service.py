@@ -0,0 +1,77 @@
+import os
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.bookdb import Book
+from src.core.storage import build_storage
+
+EBOOK_STORAGE_BACKEND = os.getenv("EBOOK_STORAGE_BACKEND", "local")
+EBOOK_STORAGE_DIR = os.getenv("EBOOK_STORAGE_DIR", "data/ebooks")
+EBOOK_MAX_BYTES = int(os.getenv("EBOOK_MAX_BYTES", 100 * 1024 * 1024))
+
+PDF_MAGIC = b"%PDF-"
+
+ebook_storage = build_storage(EBOOK_STORAGE_BACKEND, EBOOK_STORAGE_DIR)
+
+
+async def validated_pdf(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes]:
+    """Пропускає потік далі, перевіряючи сигнатуру %PDF- та ліміт розміру на льоту."""
+    head = b""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Файл завеликий"
+            )
+        if len(head) < len(PDF_MAGIC):
+            head += chunk[:len(PDF_MAGIC)]
+            if len(head) >= len(PDF_MAGIC) and not head.startswith(PDF_MAGIC):
+                break
+        yield chunk
+
+    if not head.startswith(PDF_MAGIC):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Файл має бути PDF"
+        )
+
+
+async def attach_pdf(
+        session: AsyncSession,
+        book_id: UUID,
+        chunks: AsyncIterator[bytes],
+        max_bytes: int | None = None
+) -> dict:
+    """
+    Зберігає PDF книги у сховище (ключ — sha256 вмісту) і записує його в books.pdf_path.
+    Книга перевіряється до читання тіла, тож для неіснуючої книги нічого не пишеться.
+    """
+    exists = await session.scalar(select(Book.id).where(Book.id == book_id))
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Книга не знайдена")
+
+    stored = await ebook_storage.store(
+        validated_pdf(chunks, max_bytes or EBOOK_MAX_BYTES), suffix=".pdf"
+    )
+
+    result = await session.execute(
+        update(Book).where(Book.id == book_id).values(pdf_path=stored.key).returning(Book.id)
+    )
+    if result.scalar_one_or_none() is None:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Книга не знайдена")
+    await session.commit()
+
+    return {
+        "status": "ok",
+        "pdf_path": stored.key,
+        "sha256": stored.sha256,
+        "size": stored.size,
+        "deduplicated": not stored.created,
+    }
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import async_session_maker
+from src.core.mailer import SMTPConnectionPool, build_message
+from src.api.models.mail_outbox import MailOutbox, MailStatus
+
+
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 50))
+MAIL_POLL_INTERVAL = float(os.getenv("MAIL_POLL_INTERVAL", 5))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
+MAIL_RETRY_BASE_SECONDS = float(os.getenv("MAIL_RETRY_BASE_SECONDS", 30))
+MAIL_RETRY_MAX_SECONDS = float(os.getenv("MAIL_RETRY_MAX_SECONDS", 3600))
+MAIL_SMTP_CONNECTIONS = int(os.getenv("MAIL_SMTP_CONNECTIONS", 2))
+# скільки пачка належить воркеру, що її забрав; після цього (падіння воркера) її забере інший
+MAIL_LEASE_SECONDS = float(os.getenv("MAIL_LEASE_SECONDS", 300))
+
+
+def enqueue_email(session: AsyncSession, to_email: str, subject: str, message: str) -> MailOutbox:
+    """
+    Додає лист у outbox у поточній транзакції (commit робить викликач).
+    Лист буде відправлено воркером, тож запит не чекає на SMTP.
+    """
+    mail = MailOutbox(to_email=to_email, subject=subject, body=message)
+    session.add(mail)
+    return mail
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Експоненційна затримка між спробами: base * 2^(n-1), але не більше max."""
+    seconds = MAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, MAIL_RETRY_MAX_SECONDS))
+
+
+class MailOutboxWorker:
+    """
+    Фоновий відправник листів з таблиці mail_outbox.
+    Забирає пачку в оренду (FOR UPDATE SKIP LOCKED — кілька воркерів не заважають
+    один одному), відправляє її через пул SMTP-з'єднань поза транзакцією
+    і фіксує результат окремою транзакцією.
+    """
+
+    def __init__(
+            self,
+            pool: SMTPConnectionPool | None = None,
+            batch_size: int = MAIL_BATCH_SIZE,
+            poll_interval: float = MAIL_POLL_INTERVAL,
+    ):
+        self.pool = pool or SMTPConnectionPool(size=MAIL_SMTP_CONNECTIONS)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.metrics = {
+            "sent": 0,
+            "retried": 0,
+            "failed": 0,
+            "batches": 0,
+            "last_batch_seconds": 0.0,
+        }
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def _deliver(self, mail: MailOutbox) -> Exception | None:
+        try:
+            await self.pool.send(build_message(mail.to_email, mail.subject, mail.body))
+        except Exception as exc:
+            return exc
+        return None
+
+    async def _claim(self) -> list[MailOutbox]:
+        """
+        Коротка транзакція: забирає пачку і відсуває next_attempt_at на час оренди,
+        тож інші воркери її не візьмуть, а блокування знімається ще до SMTP.
+        Спроба зараховується одразу — лист, на якому воркер упав, не повторюється вічно.
+        """
+        async with async_session_maker() as session:
+            now = datetime.utcnow()
+            result = await session.execute(
+                select(MailOutbox)
+                .where(
+                    MailOutbox.status == MailStatus.pending,
+                    MailOutbox.next_attempt_at <= now,
+                )
+                .order_by(MailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            batch = result.scalars().all()
+            for mail in batch:
+                mail.attempts += 1
+                mail.next_attempt_at = now + timedelta(seconds=MAIL_LEASE_SECONDS)
+            await session.commit()
+        return batch
+
+    async def _record(self, batch: list[MailOutbox], errors: list[Exception | None]):
+        """Друга коротка транзакція: фіксує результат відправки."""
+        now = datetime.utcnow()
+        async with async_session_maker() as session:
+            for mail, error in zip(batch, errors):
+                if error is None:
+                    values = {"status": MailStatus.sent, "sent_at": now, "last_error": None}
+                    self.metrics["sent"] += 1
+                elif mail.attempts >= MAIL_MAX_ATTEMPTS:
+                    values = {"status": MailStatus.failed, "last_error": repr(error)}
+                    self.metrics["failed"] += 1
+                else:
+                    values = {"next_attempt_at": now + retry_delay(mail.attempts), "last_error": repr(error)}
+                    self.metrics["retried"] += 1
+                # attempts — маркер оренди: якщо вона сплила і лист забрав інший воркер, не перезаписуємо
+                await session.execute(
+                    update(MailOutbox)
+                    .where(MailOutbox.id == mail.id, MailOutbox.attempts == mail.attempts)
+                    .values(**values)
+                )
+            await session.commit()
+
+    async def process_batch(self) -> int:
+        """Відправляє одну пачку листів. Повертає кількість опрацьованих листів."""
+        started = time.perf_counter()
+
+        batch = await self._claim()
+        if not batch:
+            return 0
+
+        # SMTP — поза транзакцією: повільний сервер не тримає з'єднання з БД і блокування
+        errors = await asyncio.gather(*(self._deliver(mail) for mail in batch))
+        await self._record(batch, errors)
+
+        self.metrics["batches"] += 1
+        self.metrics["last_batch_seconds"] = round(time.perf_counter() - started, 4)
+        return len(batch)
+
+    def notify(self):
+        """Будить воркер одразу після появи нового листа (без очікування poll_interval)."""
+        self._wakeup.set()
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    processed = await self.process_batch()
+                except Exception as exc:
+                    print(f"[MAIL] batch failed: {exc!r}")
+                    processed = 0
+
+                if processed < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+        finally:
+            await self.pool.close()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def get_outbox_stats(session: AsyncSession) -> dict:
+    """Кількість листів у outbox за статусами."""
+    result = await session.execute(
+        select(MailOutbox.status, func.count()).group_by(MailOutbox.status)
+    )
+    counts = {status.value: 0 for status in MailStatus}
+    for status, count in result.all():
+        counts[status.value] = count
+    return counts
+
+
+mail_worker = MailOutboxWorker()
+
+
+if __name__ == "__main__":
+    # окремий процес-відправник: MAIL_WORKER_IN_PROCESS=0 у API
+    asyncio.run(mail_worker.run())
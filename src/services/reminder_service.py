@@ -1,56 +1,162 @@
+import asyncio
+import os
 from datetime import date, timedelta
-from sqlalchemy import select
+from itertools import groupby
+from operator import attrgetter
+
+from sqlalchemy import select, update, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.database import async_session_maker
 from src.api.models.reservation import Reservation
 from src.api.models.bookdb import Book
 from src.api.models.user import User
+from src.services.mail_outbox_service import enqueue_email, mail_worker
+
+# За скільки днів до кінця резервації нагадувати
+REMINDER_DAYS_BEFORE = int(os.getenv("REMINDER_DAYS_BEFORE", 2))
+# Скільки рядків тягнемо з серверного курсора за раз
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", 500))
+
+# довільний сталий ключ: одночасно розсилку виконує лише один процес
+REMINDER_LOCK_ID = 7_204_520
+
+
+def due_soon_query(today: date, days_before: int = REMINDER_DAYS_BEFORE):
+    """
+    Резервації, що закінчуються не пізніше ніж через days_before днів
+    (включно з простроченими). Фільтр і days_left рахуються в SQL,
+    діапазон по until обслуговує індекс ix_reservations_until.
+    """
+    return (
+        select(
+            Reservation.id,
+            Reservation.until,
+            (Reservation.until - today).label("days_left"),
+            Book.title.label("book_title"),
+            User.email.label("user_email"),
+        )
+        .join(Book, Reservation.book_id == Book.id)
+        .join(User, Reservation.user_id == User.id)
+        .where(Reservation.until <= today + timedelta(days=days_before))
+    )
 
 
 async def get_due_soon_reservations(
         session: AsyncSession,
-        days_before: int = 2
+        days_before: int = REMINDER_DAYS_BEFORE
 ):
     """
     Повертає список броней, у яких скоро завершується термін.
     JOIN: reservations → books → users
     """
+    result = await session.execute(due_soon_query(date.today(), days_before))
 
-    today = date.today()
-
-    stmt = (
-        select(Reservation, Book, User)
-        .join(Book, Reservation.book_id == Book.id)
-        .join(User, Reservation.user_id == User.id)
-        .where(
-            Reservation.until.is_not(None),
-            Reservation.until - today <= timedelta(days=days_before)
-        )
-    )
+    return [
+        {
+            "reservation_id": str(row.id),
+            "book_title": row.book_title,
+            "user_email": row.user_email,
+            "days_left": row.days_left,
+        }
+        for row in result.all()
+    ]
 
-    result = await session.execute(stmt)
 
-    reminders = []
-    for res, book, user in result.all():
-        reminders.append({
-            "reservation_id": str(res.id),
-            "book_title": book.title,
-            "user_email": user.email,
-            "days_left": (res.until - today).days
-        })
+def reminder_digest(items) -> tuple[str, str]:
+    """Тема і текст одного листа з усіма книгами користувача, які скоро треба повернути."""
+    lines = []
+    for item in items:
+        until = item.until.strftime("%d.%m.%Y")
+        if item.days_left < 0:
+            state = "термін минув"
+        elif item.days_left == 0:
+            state = "останній день"
+        else:
+            state = f"залишилось днів: {item.days_left}"
+        lines.append(f"- «{item.book_title}» — до {until} ({state})")
 
-    return reminders
+    message = (
+        "Вітаємо!\n\n"
+        "Нагадуємо про терміни ваших резервацій:\n"
+        + "\n".join(lines)
+        + "\n\nДякуємо, що користуєтесь Library Brainstorm!"
+    )
+    return "Нагадування про повернення книг", message
 
 
-async def send_reminders(session: AsyncSession):
+async def send_reminders(
+        session: AsyncSession,
+        days_before: int = REMINDER_DAYS_BEFORE
+) -> dict:
     """
-    Імітація відправлення email-нагадувань.
-    Можна замінити на реальний EmailService.
+    Ставить у outbox по одному листу-дайджесту на користувача.
+    Резервації читаються потоково, згруповані за email; надіслані
+    позначаються reminder_sent_for = until, тож повторний запуск бере
+    лише нові (або продовжені) резервації. Листи й позначки фіксуються
+    одним commit — збій посередині не залишає половини розсилки.
     """
-    reminders = await get_due_soon_reservations(session)
+    locked = await session.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": REMINDER_LOCK_ID}
+    )
+    if not locked:
+        await session.rollback()
+        return {"users": 0, "reservations": 0, "skipped": True}
+
+    query = (
+        due_soon_query(date.today(), days_before)
+        .where(Reservation.reminder_sent_for.is_distinct_from(Reservation.until))
+        .order_by(User.email, Reservation.until)
+        .execution_options(yield_per=REMINDER_BATCH_SIZE)
+    )
+
+    users = reservations = 0
+    pending: list = []
+    sent: list[dict] = []
+
+    async def mark_sent():
+        # bulk UPDATE за первинним ключем (executemany); until — саме те, про яке нагадали
+        if sent:
+            await session.execute(update(Reservation), sent)
+            sent.clear()
+
+    async def flush_user(items):
+        nonlocal users, reservations
+        subject, message = reminder_digest(items)
+        enqueue_email(session, items[0].user_email, subject, message)
+        sent.extend({"id": item.id, "reminder_sent_for": item.until} for item in items)
+        users += 1
+        reservations += len(items)
+        if len(sent) >= REMINDER_BATCH_SIZE:
+            await mark_sent()
+
+    result = await session.stream(query)
+    async for batch in result.partitions():
+        pending.extend(batch)
+        # останній користувач у пачці може продовжитись у наступній
+        last_email = pending[-1].user_email
+        complete = [row for row in pending if row.user_email != last_email]
+        pending = [row for row in pending if row.user_email == last_email]
+        for _, items in groupby(complete, key=attrgetter("user_email")):
+            await flush_user(list(items))
+
+    if pending:
+        await flush_user(pending)
+
+    await mark_sent()
+    await session.commit()
+
+    if users:
+        mail_worker.notify()
+
+    return {"users": users, "reservations": reservations, "skipped": False}
+
+
+async def main():
+    async with async_session_maker() as session:
+        print(await send_reminders(session))
 
-    for r in reminders:
-        print(f"[Reminder] {r['user_email']}, поверніть книгу "
-              f"'{r['book_title']}' через {r['days_left']} днів.")
 
-    return reminders
+if __name__ == "__main__":
+    # запуск з cron: python -m src.services.reminder_service
+    asyncio.run(main())
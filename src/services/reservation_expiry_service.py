@@ -0,0 +1,135 @@
+import asyncio
+import os
+import time
+from datetime import date
+
+from sqlalchemy import select, text
+
+from src.core.database import engine
+from src.api.models.reservation import Reservation
+from src.core.catalog_cache import invalidate_books
+from src.services.reservations_service import cancel_reservations_statement
+
+
+EXPIRY_BATCH_SIZE = int(os.getenv("EXPIRY_BATCH_SIZE", 1000))
+EXPIRY_INTERVAL = float(os.getenv("EXPIRY_INTERVAL", 300))
+
+# довільний сталий ключ: прострочені резервації прибирає лише один процес
+EXPIRY_LOCK_ID = 7_204_521
+
+
+def expire_batch_statement(today: date, batch_size: int):
+    """
+    Один набір прострочених резервацій за один запит (див. cancel_reservations_statement).
+    SKIP LOCKED — рядки, які зараз скасовує користувач, не чекаємо.
+    """
+    lapsed = (
+        select(Reservation.id)
+        .where(Reservation.until < today)
+        .order_by(Reservation.until)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return cancel_reservations_statement(Reservation.id.in_(lapsed.scalar_subquery()))
+
+
+class ReservationSweeper:
+    """
+    Періодично видаляє резервації з минулим until і повертає копії книгам.
+    Кожна пачка — окрема коротка транзакція; весь прохід тримає
+    advisory lock, тож з кількох процесів API працює лише один.
+    """
+
+    def __init__(self, batch_size: int = EXPIRY_BATCH_SIZE, interval: float = EXPIRY_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.metrics = {
+            "passes": 0,
+            "skipped": 0,
+            "expired": 0,
+            "last_pass": None,
+        }
+        self._task: asyncio.Task | None = None
+
+    async def sweep(self) -> dict:
+        """Один прохід. Повертає кількість видалених резервацій і зачеплених книг."""
+        started = time.perf_counter()
+        reservations = 0
+        books: set = set()
+
+        # session-level lock живе на з'єднанні, тому беремо окреме з'єднання на весь прохід
+        async with engine.connect() as conn:
+            locked = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:id)"), {"id": EXPIRY_LOCK_ID}
+            )
+            await conn.commit()
+            if not locked:
+                self.metrics["skipped"] += 1
+                return {"locked": False, "reservations": 0, "books": 0}
+
+            try:
+                while True:
+                    result = await conn.execute(expire_batch_statement(date.today(), self.batch_size))
+                    rows = result.all()
+                    await conn.commit()
+                    if rows:
+                        invalidate_books(*(row.id for row in rows))
+
+                    released = sum(row.released for row in rows)
+                    reservations += released
+                    books.update(row.id for row in rows)
+                    if released < self.batch_size:
+                        break
+            finally:
+                # після помилки пачки транзакція перервана: без rollback unlock не виконається,
+                # а lock залишиться на з'єднанні в пулі
+                await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": EXPIRY_LOCK_ID})
+                await conn.commit()
+
+        report = {
+            "locked": True,
+            "reservations": reservations,
+            "books": len(books),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        self.metrics["passes"] += 1
+        self.metrics["expired"] += reservations
+        self.metrics["last_pass"] = report
+        if reservations:
+            print(f"[EXPIRY] released {reservations} reservations of {len(books)} books")
+        return report
+
+    async def run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as exc:
+                print(f"[EXPIRY] pass failed: {exc!r}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+reservation_sweeper = ReservationSweeper()
+
+
+if __name__ == "__main__":
+    # окремий процес: EXPIRY_SWEEPER_IN_PROCESS=0 у API; --once — один прохід (cron)
+    import sys
+
+    if "--once" in sys.argv:
+        print(asyncio.run(reservation_sweeper.sweep()))
+    else:
+        asyncio.run(reservation_sweeper.run())
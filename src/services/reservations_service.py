@@ -1,51 +1,72 @@
 from datetime import date
 from uuid import UUID, uuid4
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.models.user import User
-from src.api.models.bookdb import Book
+from src.api.models.bookdb import Book, touch_book
 from src.api.models.reservation import Reservation
+from src.core.catalog_cache import invalidate_books
+from src.services.mail_outbox_service import enqueue_email
+
+
+def reservation_confirmation(book_title: str, until_date: date | None) -> tuple[str, str]:
+    """Тема і текст листа про успішну резервацію."""
+    until_line = (
+        f"Резервація діє до: {until_date.strftime('%d.%m.%Y')}.\n\n"
+        if until_date else "\n"
+    )
+    message = (
+        f"Вітаємо!\n\n"
+        f"Книга «{book_title}» успішно зарезервована.\n"
+        f"{until_line}"
+        f"Дякуємо, що користуєтесь Library Brainstorm!"
+    )
+    return "Резервація книги", message
 
 
 async def create_reservation_for_user(
         session: AsyncSession,
         user_id: UUID,        # ✅ UUID
         book_id: UUID,        # ✅ UUID
-        until_date=None
+        until_date=None,
+        notify_email: str | None = None
 ):
-    # 1. Перевіряємо користувача
-    user_stmt = select(User).where(User.id == user_id)
-    user_res = await session.execute(user_stmt)
-    user = user_res.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # 2. Перевіряємо книгу
-    book_stmt = select(Book).where(Book.id == book_id)
-    book_res = await session.execute(book_stmt)
-    book = book_res.scalar_one_or_none()
+    """
+    Атомарно резервує копію книги.
+    Перевірка доступності та інкремент reserved_count виконуються одним
+    умовним UPDATE ... RETURNING, тому паралельні запити не можуть
+    зарезервувати більше копій, ніж є. Один commit на резервацію.
+    Якщо передано notify_email, лист-підтвердження потрапляє в outbox
+    у тій самій транзакції.
+    Повертає (reservation, book), де book — рядок з id, title, author.
+    """
 
-    if not book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book not found"
-        )
+    # 1. Забираємо копію, якщо вона є (рядок блокується до кінця транзакції)
+    reserved = func.coalesce(Book.reserved_count, 0)
+    claim = await session.execute(
+        update(Book)
+        .where(Book.id == book_id, Book.total_copies > reserved)
+        .values(reserved_count=reserved + 1, **touch_book())
+        .returning(Book.id, Book.title, Book.author)
+    )
+    book = claim.one_or_none()
 
-    # 3. Перевіряємо доступність
-    available = book.total_copies - book.reserved_count
-    if available <= 0:
+    if book is None:
+        await session.rollback()
+        exists = await session.scalar(select(Book.id).where(Book.id == book_id))
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="No copies available"
         )
 
-    # 4. Створюємо резервацію
+    # 2. Створюємо резервацію в тій самій транзакції
     reservation = Reservation(
         id=uuid4(),
         user_id=user_id,
@@ -53,13 +74,94 @@ async def create_reservation_for_user(
         from_date=date.today(),
         until=until_date
     )
-
     session.add(reservation)
 
-    # 5. Оновлюємо лічильник
-    book.reserved_count += 1
+    if notify_email:
+        subject, message = reservation_confirmation(book.title, until_date)
+        enqueue_email(session, notify_email, subject, message)
+
+    try:
+        await session.commit()
+    except IntegrityError:
+        # FK на users — користувача не існує, копія повертається відкатом
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
 
+    invalidate_books(book_id)
+    return reservation, book
+
+
+async def cancel_reservation_by_id(session: AsyncSession, reservation_id: UUID):
+    """
+    Скасовує резервацію і повертає копію книги.
+    DELETE ... RETURNING + атомарний декремент, без читання рядка книги.
+    """
+    result = await session.execute(
+        delete(Reservation)
+        .where(Reservation.id == reservation_id)
+        .returning(Reservation.book_id)
+    )
+    book_id = result.scalar_one_or_none()
+
+    if book_id is None:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+
+    await session.execute(
+        update(Book)
+        .where(Book.id == book_id, Book.reserved_count > 0)
+        .values(reserved_count=Book.reserved_count - 1, **touch_book())
+    )
+    await session.commit()
+    invalidate_books(book_id)
+
+
+def cancel_reservations_statement(*criteria):
+    """
+    Скасування набору резервацій одним запитом, незалежно від їх кількості:
+    DELETE ... RETURNING book_id -> кількість по книгах ->
+    UPDATE books SET reserved_count = reserved_count - n ... RETURNING.
+    """
+    cancelled = (
+        delete(Reservation)
+        .where(*criteria)
+        .returning(Reservation.book_id)
+        .cte("cancelled")
+    )
+    released = (
+        select(cancelled.c.book_id, func.count().label("released"))
+        .group_by(cancelled.c.book_id)
+        .cte("released")
+    )
+    return (
+        update(Book)
+        .where(Book.id == released.c.book_id)
+        .values(
+            reserved_count=func.greatest(
+                func.coalesce(Book.reserved_count, 0) - released.c.released, 0
+            ),
+            **touch_book(),
+        )
+        .returning(Book.id, released.c.released)
+    )
+
+
+async def cancel_reservations(session: AsyncSession, *criteria) -> dict:
+    """Скасовує всі резервації за умовами однією транзакцією. Повертає кількості."""
+    # synchronize_session=False: оновлення з CTE, об'єкти сесії звіряти нема з чим
+    result = await session.execute(
+        cancel_reservations_statement(*criteria),
+        execution_options={"synchronize_session": False},
+    )
+    rows = result.all()
     await session.commit()
-    await session.refresh(reservation)
 
-    return reservation
+    if rows:
+        invalidate_books(*(row.id for row in rows))
+    return {"reservations": sum(row.released for row in rows), "books": len(rows)}
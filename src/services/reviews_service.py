@@ -1,15 +1,30 @@
 from uuid import uuid4
 from datetime import datetime
-from statistics import mean
 from typing import Tuple, List, Dict, Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.models.user import User
-from src.api.models.bookdb import Book
+from src.api.models.bookdb import Book, touch_book
 from src.api.models.review import Review
+from src.core.catalog_cache import invalidate_books
+
+
+async def bump_rating_stats(session: AsyncSession, book_id, count: int, rating: int) -> bool:
+    """Інкрементально змінює review_count/rating_sum книги. False, якщо книги немає."""
+    result = await session.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(
+            review_count=Book.review_count + count,
+            rating_sum=Book.rating_sum + rating,
+            **touch_book(),
+        )
+        .returning(Book.id)
+    )
+    return result.scalar_one_or_none() is not None
 
 
 def _validate_rating(rating: int):
@@ -30,11 +45,8 @@ async def create_review_for_book(
     """Створює відгук для книги через ORM."""
     _validate_rating(rating)
 
-    # Перевіряємо чи існує книга
-    book_res = await session.execute(select(Book).where(Book.id == book_id))
-    book = book_res.scalar_one_or_none()
-
-    if not book:
+    # Оновлюємо агрегати (заодно перевіряємо, що книга існує)
+    if not await bump_rating_stats(session, book_id, 1, rating):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
 
     # Перевіряємо чи існує користувач
@@ -55,6 +67,7 @@ async def create_review_for_book(
 
     session.add(review)
     await session.commit()
+    invalidate_books(book_id)
     await session.refresh(review)
 
     return review
@@ -67,9 +80,11 @@ async def get_reviews_for_book(
         limit: int = 50
 ) -> Tuple[List[Review], Dict[str, Any]]:
     """Отримує список відгуків + статистику."""
-    # Перевіряємо наявність книги
-    book_res = await session.execute(select(Book).where(Book.id == book_id))
-    book = book_res.scalar_one_or_none()
+    # Перевіряємо наявність книги і беремо готові агрегати
+    book_res = await session.execute(
+        select(Book.review_count, Book.rating_sum).where(Book.id == book_id)
+    )
+    book = book_res.one_or_none()
 
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
@@ -84,18 +99,11 @@ async def get_reviews_for_book(
     )
     reviews = reviews_res.scalars().all()
 
-    # Підраховуємо count і average
-    stats_res = await session.execute(
-        select(
-            func.count(Review.id),
-            func.avg(Review.rating)
-        ).where(Review.book_id == book_id)
-    )
-    count, avg = stats_res.one()
-
+    # count і average — O(1) з денормалізованих полів книги
+    count, rating_sum = book
     stats = {
         "count": count,
-        "average_rating": round(float(avg), 2) if avg else 0.0
+        "average_rating": round(rating_sum / count, 2) if count else 0.0
     }
 
     return reviews, stats
@@ -103,9 +111,13 @@ async def get_reviews_for_book(
 
 async def delete_review(session: AsyncSession, review_id):
     """Видаляє відгук із PostgreSQL."""
-    # Перевіряємо чи існує review
-    review_res = await session.execute(select(Review).where(Review.id == review_id))
-    review = review_res.scalar_one_or_none()
+    # Видаляємо review і одразу отримуємо дані для агрегатів
+    review_res = await session.execute(
+        delete(Review)
+        .where(Review.id == review_id)
+        .returning(Review.book_id, Review.rating)
+    )
+    review = review_res.one_or_none()
 
     if not review:
         raise HTTPException(
@@ -113,5 +125,6 @@ async def delete_review(session: AsyncSession, review_id):
             detail="Review not found"
         )
 
-    await session.delete(review)
+    await bump_rating_stats(session, review.book_id, -1, -review.rating)
     await session.commit()
+    invalidate_books(review.book_id)
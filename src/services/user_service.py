@@ -1,27 +1,16 @@
 from uuid import UUID, uuid4
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.models.user import User, UserRole
 from src.api.schemas.user import UserCreate
-
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.core.security import hash_password_async, verify_password_async
 
 
 # -----------------------------
 #    HELPERS
 # -----------------------------
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
-
-
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
     """Повертає користувача за email або None."""
     result = await session.execute(select(User).where(User.email == email))
@@ -50,7 +39,7 @@ async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
         id=uuid4(),
         email=user_data.email,
         full_name=user_data.full_name,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         role=UserRole(user_data.role.value)
     )
 
@@ -74,7 +63,7 @@ async def authenticate_user(
 
     user = await get_user_by_email(session, email)
 
-    if not user or not verify_password(password, user.password_hash):
+    if not user or not await verify_password_async(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
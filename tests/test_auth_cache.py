@@ -0,0 +1,59 @@
+from sqlalchemy import text
+
+from src.core.cache import TTLCache
+from src.core.auth_cache import user_cache
+from src.api.models.user import UserRole
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # "a" стає найсвіжішим
+    cache.set("c", 3)                   # витісняє "b"
+    assert cache.get("b") is None
+    assert cache.stats["evictions"] == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats == {"hits": 1, "misses": 2, "evictions": 1}
+
+
+async def test_authenticated_requests_hit_cache_not_db(api, session, make_user):
+    user, headers = await make_user()
+
+    assert (await api.get("/api/favorites/me/count", headers=headers)).status_code == 200
+
+    # видаляємо в обхід ORM — кеш про це не знає, отже запит до users не робиться
+    await session.execute(text("DELETE FROM users WHERE id = :id"), {"id": user.id})
+    await session.commit()
+    assert (await api.get("/api/favorites/me/count", headers=headers)).status_code == 200
+
+    user_cache.pop(str(user.id))
+    assert (await api.get("/api/favorites/me/count", headers=headers)).status_code == 401
+
+
+async def test_role_change_and_delete_invalidate_cache(api, session, make_user):
+    librarian, headers = await make_user("boss@lib.com", UserRole.librarian)
+    payload = {"title": "T", "author": "A", "isbn": "1", "total_copies": 1}
+
+    assert (await api.post("/api/books/", json=payload, headers=headers)).status_code == 200
+
+    librarian.role = UserRole.user
+    await session.commit()
+    resp = await api.post("/api/books/", json={**payload, "isbn": "2"}, headers=headers)
+    assert resp.status_code == 401
+
+    await session.delete(librarian)
+    await session.commit()
+    assert str(librarian.id) not in user_cache._data
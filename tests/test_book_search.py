@@ -0,0 +1,72 @@
+import pytest
+
+from src.services import book_search_service
+from src.services.book_search_service import build_tsquery, trigram_available
+
+
+def test_build_tsquery_keeps_only_words():
+    assert build_tsquery("Гаррі  Пот!") == "гаррі:* & пот:*"
+    assert build_tsquery("c++ & |") == "c:*"
+    assert build_tsquery("--- !!") is None
+
+
+@pytest.fixture
+async def catalog(make_books):
+    books = await make_books(5)
+    books[0].title, books[0].author = "The Hobbit", "J. R. R. Tolkien"
+    books[1].title, books[1].description = "Travel notes", "A journey with a hobbit"
+    books[2].title, books[2].author = "Кобзар", "Тарас Шевченко"
+    books[3].isbn = "978-0-00-000000-1"
+    return books
+
+
+async def test_search_ranks_title_above_description(api, session, catalog):
+    await session.commit()
+
+    resp = await api.get("/api/books/search/text", params={"q": "hobbit"})
+
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [b["title"] for b in items] == ["The Hobbit", "Travel notes"]
+    assert items[0]["score"] > items[1]["score"] > 0
+
+
+async def test_search_by_prefix_author_and_isbn(api, session, catalog):
+    await session.commit()
+
+    by_prefix = await api.get("/api/books/search/text", params={"q": "шевч"})
+    by_isbn = await api.get("/api/books/search/text", params={"q": "978-0-00-000000-1"})
+
+    assert [b["title"] for b in by_prefix.json()["items"]] == ["Кобзар"]
+    assert by_isbn.json()["items"][0]["isbn"] == "978-0-00-000000-1"
+
+
+async def test_search_pages_with_cursor(api, make_books):
+    await make_books(25, description="shared words")
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "book", "limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await api.get("/api/books/search/text", params=params)).json()
+        seen += [b["id"] for b in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 25
+
+    bad = await api.get("/api/books/search/text", params={"q": "book", "cursor": "nope"})
+    assert bad.status_code == 400
+
+
+async def test_search_tolerates_typos(api, session, catalog):
+    await session.commit()
+    book_search_service._trigram_available = None
+    if not await trigram_available(session):
+        pytest.skip("pg_trgm не встановлено")
+
+    resp = await api.get("/api/books/search/text", params={"q": "Tolkein"})
+
+    assert resp.json()["items"][0]["title"] == "The Hobbit"
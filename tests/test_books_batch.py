@@ -0,0 +1,37 @@
+from uuid import uuid4
+
+from src.core.pagination import MAX_PAGE_SIZE
+
+
+async def test_batch_preserves_order_and_reports_missing(api, make_books):
+    books = await make_books(4, total_copies=3)
+    unknown = uuid4()
+    ids = [str(books[2].id), str(unknown), str(books[0].id), str(books[2].id)]
+
+    by_query = await api.get("/api/books/batch", params={"ids": ids})
+    by_body = await api.post("/api/books/batch", json={"ids": ids})
+
+    assert by_query.status_code == by_body.status_code == 200
+    assert by_query.json() == by_body.json()
+    data = by_query.json()
+    assert [b["id"] for b in data["items"]] == [str(books[2].id), str(books[0].id)]
+    assert data["missing"] == [str(unknown)]
+    # make_books резервує кожну третю книгу
+    assert [b["available_copies"] for b in data["items"]] == [3, 2]
+
+
+async def test_batch_reports_live_availability(api, make_books):
+    [book] = await make_books(1, reserved_count=0)
+
+    await api.post("/api/reservations/", json={"book_id": str(book.id)}, headers={"X-User-Email": "r@test.com"})
+    resp = await api.post("/api/books/batch", json={"ids": [str(book.id)]})
+
+    assert resp.json()["items"][0]["available_copies"] == 0
+
+
+async def test_batch_limits(api, db):
+    too_many = [str(uuid4()) for _ in range(MAX_PAGE_SIZE + 1)]
+
+    assert (await api.post("/api/books/batch", json={"ids": too_many})).status_code == 422
+    assert (await api.post("/api/books/batch", json={"ids": []})).status_code == 422
+    assert (await api.get("/api/books/batch")).status_code == 422
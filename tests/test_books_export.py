@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+
+from src.services import catalog_export_service
+
+
+async def test_export_ndjson_streams_every_book(api, make_books):
+    await make_books(5)
+
+    resp = await api.get("/api/books/export")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["isbn"] for r in rows) == [f"isbn-{i}" for i in range(5)]
+    assert set(rows[0]) == set(catalog_export_service.EXPORT_FIELDS)
+
+
+async def test_export_csv_has_header_and_joined_genres(api, make_books):
+    await make_books(3, genres=["programming", "software"])
+
+    resp = await api.get("/api/books/export", params={"format": "csv"})
+
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 3
+    assert rows[0]["genres"] == "programming|software"
+
+
+async def test_export_reads_catalog_in_batches(db, make_books, monkeypatch):
+    await make_books(7)
+    monkeypatch.setattr(catalog_export_service, "EXPORT_BATCH_SIZE", 3)
+
+    chunks = [c async for c in catalog_export_service.stream_catalog("ndjson")]
+
+    assert [c.count("\n") for c in chunks] == [3, 3, 1]
@@ -0,0 +1,147 @@
+import json
+
+from sqlalchemy import select
+
+from src.api.models.bookdb import Book
+from src.api.models.user import UserRole
+from src.services import catalog_import_service
+
+
+CSV_FEED = (
+    "title,author,isbn,total_copies,genres,description\r\n"
+    "Dune,Frank Herbert,isbn-dune,3,sci-fi|classic,\"Desert planet,\nspice\"\r\n"
+    "No copies,Nobody,isbn-bad,many,,\r\n"
+    ",Anonymous,isbn-untitled,1,,\r\n"
+    "Dune (2nd ed.),Frank Herbert,isbn-dune,4,sci-fi,\r\n"
+    "Book 000,Author,isbn-0,7,history,\r\n"
+)
+
+
+async def test_csv_import_merges_by_isbn_and_reports_errors(api, session, make_books, make_user):
+    await make_books(1)
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+
+    resp = await api.post(
+        "/api/books/import", params={"format": "csv"}, content=CSV_FEED.encode(), headers=headers
+    )
+
+    assert resp.status_code == 200
+    report = resp.json()
+    assert {k: report[k] for k in ("rows", "inserted", "updated", "duplicates", "failed")} == {
+        "rows": 5, "inserted": 1, "updated": 1, "duplicates": 1, "failed": 2,
+    }
+    assert [(e["row"], e["isbn"]) for e in report["errors"]] == [(2, "isbn-bad"), (3, "isbn-untitled")]
+    assert "total_copies" in report["errors"][0]["error"]
+
+    books = {b.isbn: b for b in (await session.scalars(select(Book))).all()}
+    assert books["isbn-dune"].title == "Dune (2nd ed.)"
+    assert books["isbn-dune"].reserved_count == 0
+    assert books["isbn-0"].total_copies == 7 and books["isbn-0"].genres == ["history"]
+
+
+async def test_export_reimports_in_chunks(api, session, make_books, make_user, monkeypatch):
+    monkeypatch.setattr(catalog_import_service, "IMPORT_CHUNK_SIZE", 4)
+    await make_books(10)
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    exported = (await api.get("/api/books/export", params={"format": "ndjson"})).content
+    feed = exported + json.dumps({"title": "New", "author": "A", "isbn": "isbn-new", "total_copies": 1}).encode()
+
+    report = (await api.post("/api/books/import", content=feed, headers=headers)).json()
+
+    assert (report["inserted"], report["updated"], report["failed"]) == (1, 10, 0)
+    hits = await api.get("/api/books/search/text", params={"q": "New"})
+    assert [b["isbn"] for b in hits.json()["items"]] == ["isbn-new"]
+
+
+async def test_import_requires_librarian(api, make_user):
+    _, headers = await make_user()
+
+    resp = await api.post("/api/books/import", content=b"{}", headers=headers)
+
+    assert resp.status_code == 403
+
+
+async def test_partial_record_keeps_fields_it_does_not_supply(api, session, make_books, make_user):
+    [book] = await make_books(
+        1, description="keep me", published_year=1999, genres=["history"],
+        cover_image="/static/covers/a.jpg", cover_variants={"jpeg": {"160w": "/static/covers/a-160.jpg"}},
+    )
+    [other] = await make_books(1, isbn="isbn-other", cover_image="/static/covers/b.jpg",
+                               cover_variants={"jpeg": {"160w": "/static/covers/b-160.jpg"}})
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    feed = "\n".join(json.dumps(r) for r in [
+        {"title": "Renamed", "author": "Author", "isbn": book.isbn, "total_copies": 2},
+        {"title": "Other", "author": "Author", "isbn": "isbn-other", "total_copies": 1,
+         "cover_image": "/static/covers/new.jpg", "description": None},
+    ])
+
+    report = (await api.post("/api/books/import", content=feed.encode(), headers=headers)).json()
+
+    assert report["updated"] == 2
+    await session.refresh(book)
+    await session.refresh(other)
+    assert (book.title, book.total_copies) == ("Renamed", 2)
+    assert (book.description, book.published_year, book.genres) == ("keep me", 1999, ["history"])
+    assert book.cover_image == "/static/covers/a.jpg" and book.cover_variants is not None
+    # явно задані поля (у тому числі null) перезаписуються; нова обкладинка скидає варіанти
+    assert other.cover_image == "/static/covers/new.jpg" and other.cover_variants is None
+    assert other.description is None
+
+
+async def test_non_string_isbn_is_reported_as_row_error(api, session, make_user):
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    feed = "\n".join(json.dumps(r) for r in [
+        {"title": "Fine", "author": "A", "isbn": "isbn-fine", "total_copies": 1},
+        {"title": "Numeric", "author": "A", "isbn": 123, "total_copies": 1},
+    ])
+
+    resp = await api.post("/api/books/import", content=feed.encode(), headers=headers)
+
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["inserted"], report["failed"]) == (1, 1)
+    assert report["errors"][0]["row"] == 2 and report["errors"][0]["isbn"] is None
+    assert "isbn" in report["errors"][0]["error"]
+
+
+FEED_WITH_DB_REJECTS = [
+    {"title": "One", "author": "A", "isbn": "isbn-1", "total_copies": 1},
+    {"title": "Two", "author": "A", "isbn": "isbn-2", "total_copies": 1},
+    {"title": "Huge", "author": "A", "isbn": "isbn-huge", "total_copies": 1, "published_year": 99999999999},
+    {"title": "Nul\u0000", "author": "A", "isbn": "isbn-nul", "total_copies": 1},
+    {"title": "Three", "author": "A", "isbn": "isbn-3", "total_copies": 1},
+]
+
+
+async def _import_with_rejects(api, make_user, monkeypatch):
+    monkeypatch.setattr(catalog_import_service, "IMPORT_CHUNK_SIZE", 2)
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    feed = "\n".join(json.dumps(r) for r in FEED_WITH_DB_REJECTS).encode()
+    return await api.post("/api/books/import", content=feed, headers=headers)
+
+
+async def test_values_postgres_rejects_are_row_errors(api, session, make_user, monkeypatch):
+    resp = await _import_with_rejects(api, make_user, monkeypatch)
+
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["inserted"], report["failed"]) == (3, 2)
+    assert [(e["row"], e["error"]) for e in report["errors"]] == [
+        (3, "published_year: out of range"),
+        (4, "text fields must not contain NUL characters"),
+    ]
+
+
+async def test_chunk_rejected_by_database_is_reported_and_import_continues(api, session, make_user, monkeypatch):
+    # без попередньої перевірки значення доходять до COPY — спрацьовує запасний шлях
+    monkeypatch.setattr(catalog_import_service, "row_error", lambda book: None)
+
+    resp = await _import_with_rejects(api, make_user, monkeypatch)
+
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["inserted"], report["failed"]) == (3, 2)
+    assert [e["isbn"] for e in report["errors"]] == ["isbn-huge", "isbn-nul"]
+    assert all(e["error"].startswith("chunk rejected by the database") for e in report["errors"])
+    isbns = set((await session.scalars(select(Book.isbn))).all())
+    assert isbns == {"isbn-1", "isbn-2", "isbn-3"}
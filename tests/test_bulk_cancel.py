@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from datetime import date, timedelta
+from uuid import uuid4
+
+from sqlalchemy import event, select
+
+from src.core.database import engine
+from src.api.models.bookdb import Book
+from src.api.models.reservation import Reservation
+from src.api.models.user import UserRole
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def reserve(session, books, user, per_book: int, until: date):
+    for book in books:
+        book.reserved_count = per_book
+        session.add_all(
+            Reservation(id=uuid4(), user_id=user.id, book_id=book.id, until=until)
+            for _ in range(per_book)
+        )
+    await session.commit()
+
+
+async def test_clear_all_uses_constant_statements(api, session, make_books, make_user):
+    books = await make_books(10, total_copies=20)
+    small, _ = await make_user("small@test.com")
+    large, _ = await make_user("large@test.com")
+    await reserve(session, books[:1], small, 1, date.today())
+    await reserve(session, books[1:], large, 20, date.today())
+
+    counts = []
+    for email in ("small@test.com", "large@test.com"):
+        with count_statements() as statements:
+            resp = await api.delete("/api/reservations/clear/all", headers={"X-User-Email": email})
+        assert resp.status_code == 204
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+    session.expire_all()
+    assert await session.scalar(select(Reservation.id).limit(1)) is None
+    assert set(await session.scalars(select(Book.reserved_count))) == {0}
+
+
+async def test_librarian_bulk_cancel_by_book_and_dates(api, session, make_books, make_user):
+    books = await make_books(2, total_copies=10)
+    user, headers = await make_user()
+    _, librarian = await make_user("lib@test.com", role=UserRole.librarian)
+    today = date.today()
+    await reserve(session, books[:1], user, 3, today)
+    await reserve(session, books[1:], user, 2, today + timedelta(days=5))
+
+    forbidden = await api.post("/api/reservations/cancel/bulk", json={"book_id": str(books[0].id)}, headers=headers)
+    empty = await api.post("/api/reservations/cancel/bulk", json={}, headers=librarian)
+    by_dates = await api.post(
+        "/api/reservations/cancel/bulk",
+        json={"until_from": str(today + timedelta(days=1)), "until_to": str(today + timedelta(days=7))},
+        headers=librarian,
+    )
+    by_book = await api.post("/api/reservations/cancel/bulk", json={"book_id": str(books[0].id)}, headers=librarian)
+
+    assert forbidden.status_code == 403
+    assert empty.status_code == 400
+    assert by_dates.json() == {"reservations": 2, "books": 1}
+    assert by_book.json() == {"reservations": 3, "books": 1}
+    session.expire_all()
+    assert set(await session.scalars(select(Book.reserved_count))) == {0}
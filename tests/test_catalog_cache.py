@@ -0,0 +1,102 @@
+import asyncio
+
+from src.api.routes import books as books_route
+from src.core.catalog_cache import CachedBody, CatalogCache, catalog_cache
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = CatalogCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return CachedBody(body=b"{}", etag='"1"')
+
+    results = await asyncio.gather(*(cache.fetch(cache.books, "k", load) for _ in range(10)))
+    again = await cache.fetch(cache.books, "k", load)
+
+    assert calls == 1
+    assert all(r is results[0] for r in results) and again is results[0]
+    stats = cache.stats()
+    assert stats["coalesced"] == 9 and stats["hits"] == 1
+
+
+async def test_load_started_before_invalidation_is_not_cached():
+    cache = CatalogCache(maxsize=10, ttl=60)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return CachedBody(body=b"old", etag='"1"')
+
+    pending = asyncio.create_task(cache.fetch(cache.pages, "page", slow_load))
+    await started.wait()
+    cache.invalidate("some-book")
+    release.set()
+
+    assert (await pending).body == b"old"
+    assert len(cache.pages) == 0
+
+
+async def test_book_reads_are_cached_and_invalidated_by_writes(api, make_books):
+    [book] = await make_books(1, reserved_count=0)
+    url = f"/api/books/{book.id}"
+    before = catalog_cache.stats()
+
+    first = await api.get(url)
+    second = await api.get(url)
+
+    assert second.content == first.content
+    assert catalog_cache.stats()["hits"] == before["hits"] + 1
+
+    await api.post("/api/reservations/", json={"book_id": str(book.id)}, headers={"X-User-Email": "r@test.com"})
+    catalog = await api.get("/api/books/")
+    third = await api.get(url)
+
+    assert third.json()["reserved_count"] == 1
+    assert catalog.json()[0]["reserved_count"] == 1
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+async def test_cache_can_be_switched_off(api, make_books, session, monkeypatch):
+    [book] = await make_books(1)
+    monkeypatch.setattr(catalog_cache, "enabled", False)
+    url = f"/api/books/{book.id}"
+
+    await api.get(url)
+    book.title = "Changed elsewhere"
+    await session.commit()
+    resp = await api.get(url)
+
+    assert resp.json()["title"] == "Changed elsewhere"
+    assert len(catalog_cache.books) == 0
+
+
+async def test_shared_page_load_survives_first_client_disconnecting(api, make_books, monkeypatch):
+    await make_books(3)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    original = books_route.load_books
+
+    async def slow_load_books(*args, **kwargs):
+        started.set()
+        await release.wait()
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(books_route, "load_books", slow_load_books)
+
+    first = asyncio.create_task(api.get("/api/books/"))
+    await started.wait()
+    second = asyncio.create_task(api.get("/api/books/"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    release.set()
+
+    resp = await asyncio.wait_for(second, timeout=5)
+    assert resp.status_code == 200
+    assert len(resp.json()) == 3
@@ -0,0 +1,76 @@
+from src.api.models.user import UserRole
+
+
+async def test_book_etag_changes_with_reservation(api, make_books):
+    [book] = await make_books(1, reserved_count=0)
+    url = f"/api/books/{book.id}"
+
+    first = await api.get(url)
+    etag = first.headers["etag"]
+    cached = await api.get(url, headers={"If-None-Match": etag})
+    by_date = await api.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert cached.status_code == by_date.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    reserved = await api.post(
+        "/api/reservations/", json={"book_id": str(book.id)}, headers={"X-User-Email": "r@test.com"}
+    )
+    fresh = await api.get(url, headers={"If-None-Match": etag})
+
+    assert reserved.status_code == 201
+    assert fresh.status_code == 200
+    assert fresh.json()["reserved_count"] == 1
+    assert fresh.headers["etag"] != etag
+
+
+async def test_book_etag_changes_on_librarian_update(api, make_books, make_user):
+    [book] = await make_books(1)
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    url = f"/api/books/{book.id}"
+    etag = (await api.get(url)).headers["etag"]
+
+    await api.put(url, json={"title": "Renamed"}, headers=headers)
+    resp = await api.get(url, headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Renamed"
+
+
+async def test_catalog_page_etag(api, make_books, make_user):
+    books = await make_books(5)
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+
+    first = await api.get("/api/books/", params={"limit": 3})
+    cached = await api.get("/api/books/", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]})
+    other_page = await api.get("/api/books/", params={"limit": 2})
+
+    assert cached.status_code == 304
+    assert other_page.headers["etag"] != first.headers["etag"]
+
+    # зміна книги з іншої сторінки не інвалідує цю
+    await api.put(f"/api/books/{books[4].id}", json={"description": "x"}, headers=headers)
+    still = await api.get("/api/books/", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]})
+    await api.put(f"/api/books/{books[0].id}", json={"description": "x"}, headers=headers)
+    changed = await api.get("/api/books/", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]})
+
+    assert still.status_code == 304
+    assert changed.status_code == 200
+
+
+async def test_reviews_etag_follows_book_version(api, make_books, make_user):
+    [book] = await make_books(1)
+    _, headers = await make_user()
+    url = f"/api/books/{book.id}/reviews"
+
+    etag = (await api.get(url)).headers["etag"]
+    cached = await api.get(url, headers={"If-None-Match": etag})
+    await api.post(url, json={"rating": 5}, headers=headers)
+    fresh = await api.get(url, headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert fresh.status_code == 200
+    assert fresh.json()["count"] == 1
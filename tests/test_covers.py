@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.api.models.user import UserRole
+from src.core.images import render_variants
+from src.core.storage import LocalStorage
+from src.services import cover_service
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 128)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_render_variants_downscales_without_upscaling():
+    variants = render_variants(_png(400, 600), (160, 320, 640))
+
+    assert set(variants) == {"webp", "jpeg"}
+    assert sorted(variants["jpeg"]) == [160, 320, 400]
+    assert Image.open(io.BytesIO(variants["webp"][160])).size == (160, 240)
+
+    with pytest.raises(ValueError):
+        render_variants(b"not an image", (160,))
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalStorage(tmp_path)
+    monkeypatch.setattr(cover_service, "cover_storage", storage)
+    return storage
+
+
+async def test_cover_upload_exposes_variant_map(api, make_books, make_user, storage):
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    [book] = await make_books(1)
+
+    resp = await api.put(f"/api/books/{book.id}/cover", content=_png(1000, 1500), headers=headers)
+
+    assert resp.status_code == 200, resp.text
+    variants = resp.json()["cover_variants"]
+    assert set(variants["webp"]) == set(variants["jpeg"]) == {"160w", "320w", "640w"}
+
+    url = variants["webp"]["320w"]
+    assert url.startswith("/static/covers/") and url.endswith(".webp")
+    key = url.removeprefix("/static/covers/")
+    assert Image.open(storage.path(key)).size == (320, 480)
+
+    listed = (await api.get(f"/api/books/{book.id}")).json()
+    assert listed["cover_variants"] == variants
+    assert listed["cover_image"] == variants["jpeg"]["640w"]
+
+
+async def test_cover_upload_rejects_non_images(api, make_books, make_user, storage):
+    _, librarian = await make_user("lib@test.com", role=UserRole.librarian)
+    _, reader = await make_user()
+    [book] = await make_books(1)
+
+    bad = await api.put(f"/api/books/{book.id}/cover", content=b"<svg/>", headers=librarian)
+    forbidden = await api.put(f"/api/books/{book.id}/cover", content=_png(10, 10), headers=reader)
+
+    assert bad.status_code == 415
+    assert forbidden.status_code == 403
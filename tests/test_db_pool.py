@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.database import DATABASE_URL, engine, pool_stats
+from src.core.db_pool import InstrumentedPool, instrument_connect, pool_metrics
+
+
+async def test_health_db_reports_pool_state(api):
+    resp = await api.get("/api/health/db")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ok"
+    assert {"checked_out", "overflow", "wait_ms_max", "connect_ms_avg"} <= set(body["pool"])
+
+
+async def test_checked_out_connections_are_visible(db):
+    async with engine.connect() as first, engine.connect() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+        assert pool_stats()["checked_out"] == 2
+    assert pool_stats()["checked_out"] == 0
+
+
+async def test_pool_timeout_is_counted(db):
+    small = create_async_engine(
+        DATABASE_URL, poolclass=InstrumentedPool, pool_size=1, max_overflow=0, pool_timeout=0.1
+    )
+    instrument_connect(small)
+    timeouts, connects = pool_metrics.checkout_timeouts, pool_metrics.connects
+
+    try:
+        async with small.connect() as held:
+            await held.execute(text("SELECT 1"))
+            with pytest.raises(PoolTimeoutError):
+                async with small.connect():
+                    pass
+    finally:
+        await small.dispose()
+
+    assert pool_metrics.checkout_timeouts == timeouts + 1
+    assert pool_metrics.connects == connects + 1
+    assert pool_metrics.wait_seconds_max >= 0.1
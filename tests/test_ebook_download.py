@@ -0,0 +1,65 @@
+import pytest
+
+from src.api.models.user import UserRole
+from src.core.storage import LocalStorage
+from src.services import ebook_service
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 1000 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+async def ebook(api, make_books, make_user, tmp_path, monkeypatch):
+    monkeypatch.setattr(ebook_service, "ebook_storage", LocalStorage(tmp_path))
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    [book] = await make_books(1)
+    uploaded = await api.put(f"/api/books/{book.id}/pdf", content=PDF, headers=headers)
+    return f"/api/books/{book.id}/pdf", uploaded.json()["sha256"]
+
+
+async def test_full_download_has_validators(api, ebook):
+    url, sha = ebook
+
+    resp = await api.get(url)
+
+    assert resp.status_code == 200
+    assert resp.content == PDF
+    assert resp.headers["etag"] == f'"{sha}"'
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["content-type"] == "application/pdf"
+    assert "last-modified" in resp.headers
+
+
+async def test_range_requests_return_partial_content(api, ebook):
+    url, sha = ebook
+
+    first = await api.get(url, headers={"Range": "bytes=0-99"})
+    tail = await api.get(url, headers={"Range": "bytes=-7"})
+    stale = await api.get(url, headers={"Range": "bytes=0-99", "If-Range": '"other"'})
+    fresh = await api.get(url, headers={"Range": "bytes=0-99", "If-Range": f'"{sha}"'})
+    beyond = await api.get(url, headers={"Range": f"bytes={len(PDF) + 10}-"})
+
+    assert first.status_code == 206 and first.content == PDF[:100]
+    assert first.headers["content-range"] == f"bytes 0-99/{len(PDF)}"
+    assert tail.content == PDF[-7:]
+    assert stale.status_code == 200 and len(stale.content) == len(PDF)
+    assert fresh.status_code == 206
+    assert beyond.status_code == 416
+
+
+async def test_conditional_get_and_head(api, ebook):
+    url, sha = ebook
+    first = await api.get(url)
+
+    by_etag = await api.get(url, headers={"If-None-Match": f'W/"x", "{sha}"'})
+    by_date = await api.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    head = await api.head(url)
+
+    assert by_etag.status_code == by_date.status_code == 304
+    assert by_etag.content == b""
+    assert head.status_code == 200 and head.headers["content-length"] == str(len(PDF))
+
+
+async def test_missing_pdf_is_404(api, make_books):
+    [book] = await make_books(1)
+
+    assert (await api.get(f"/api/books/{book.id}/pdf")).status_code == 404
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import select
+
+from src.api.models.bookdb import Book
+from src.api.models.user import UserRole
+from src.core.storage import LocalStorage
+from src.services import ebook_service
+
+PDF = b"%PDF-1.4\n" + b"0" * 300_000 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalStorage(tmp_path)
+    monkeypatch.setattr(ebook_service, "ebook_storage", storage)
+    return storage
+
+
+@pytest.fixture
+async def librarian(make_user):
+    _, headers = await make_user("lib@test.com", role=UserRole.librarian)
+    return headers
+
+
+async def _chunks(data: bytes, size: int = 64 * 1024):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def test_upload_is_content_addressed_and_deduplicated(api, session, make_books, storage, librarian):
+    first, second = await make_books(2)
+
+    one = await api.put(f"/api/books/{first.id}/pdf", content=_chunks(PDF), headers=librarian)
+    two = await api.put(f"/api/books/{second.id}/pdf", content=PDF, headers=librarian)
+
+    assert one.status_code == 200, one.text
+    assert one.json()["deduplicated"] is False and two.json()["deduplicated"] is True
+    key = one.json()["pdf_path"]
+    assert key == two.json()["pdf_path"] == f"{one.json()['sha256'][:2]}/{one.json()['sha256']}.pdf"
+    assert storage.path(key).read_bytes() == PDF
+    assert not any((storage.root / ".tmp").iterdir())
+
+    paths = (await session.scalars(select(Book.pdf_path).where(Book.id.in_([first.id, second.id])))).all()
+    assert paths == [key, key]
+
+
+@pytest.mark.parametrize("body, max_bytes, code", [
+    (b"<html>not a pdf</html>", None, 415),
+    (b"", None, 415),
+    (PDF, 1024, 413),
+])
+async def test_rejected_uploads_leave_nothing_behind(
+        api, make_books, storage, librarian, monkeypatch, body, max_bytes, code):
+    if max_bytes:
+        monkeypatch.setattr(ebook_service, "EBOOK_MAX_BYTES", max_bytes)
+    [book] = await make_books(1)
+
+    resp = await api.put(f"/api/books/{book.id}/pdf", content=_chunks(body, 512), headers=librarian)
+
+    assert resp.status_code == code
+    assert [p for p in storage.root.rglob("*") if p.is_file()] == []
+
+
+async def test_unknown_book_and_permissions(api, make_user, storage, librarian):
+    _, reader = await make_user()
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    assert (await api.put(f"/api/books/{missing}/pdf", content=PDF, headers=librarian)).status_code == 404
+    assert (await api.put(f"/api/books/{missing}/pdf", content=PDF, headers=reader)).status_code == 403
+    assert not (storage.root / ".tmp").exists()
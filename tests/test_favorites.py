@@ -0,0 +1,64 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from src.api.models.user import User
+
+
+async def test_add_is_idempotent_under_double_clicks(api, make_books, make_user):
+    [book] = await make_books(1)
+    _, headers = await make_user()
+
+    responses = await asyncio.gather(*(
+        api.post("/api/favorites/me", json={"book_id": str(book.id)}, headers=headers)
+        for _ in range(5)
+    ))
+    count = await api.get("/api/favorites/me/count", headers=headers)
+
+    assert sorted(r.json()["status"] for r in responses) == ["added"] + ["already_exists"] * 4
+    assert count.json() == {"count": 1}
+
+
+async def test_unknown_book_is_404(api, make_user):
+    _, headers = await make_user()
+
+    resp = await api.post("/api/favorites/me", json={"book_id": str(uuid4())}, headers=headers)
+
+    assert resp.status_code == 404
+
+
+async def test_user_deleted_behind_auth_cache_is_401(api, session, make_books, make_user):
+    [book] = await make_books(1)
+    user, headers = await make_user()
+    await api.get("/api/favorites/me", headers=headers)
+    # Core DELETE оминає інвалідацію кешу — як видалення з іншого процесу
+    await session.execute(delete(User).where(User.id == user.id))
+    await session.commit()
+
+    resp = await api.post("/api/favorites/me", json={"book_id": str(book.id)}, headers=headers)
+    again = await api.get("/api/favorites/me", headers=headers)
+
+    assert (resp.status_code, resp.json()["detail"]) == (401, "User not found")
+    assert again.status_code == 401
+
+
+async def test_lookup_returns_favorited_subset(api, make_books, make_user):
+    books = await make_books(4)
+    _, headers = await make_user()
+    _, other = await make_user("other@test.com")
+    for book in books[:2]:
+        await api.post("/api/favorites/me", json={"book_id": str(book.id)}, headers=headers)
+    await api.post("/api/favorites/me", json={"book_id": str(books[3].id)}, headers=other)
+
+    resp = await api.get(
+        "/api/favorites/me/lookup",
+        params={"book_ids": [str(b.id) for b in books]},
+        headers=headers,
+    )
+    await api.delete(f"/api/favorites/me/{books[0].id}", headers=headers)
+    mine = await api.get("/api/favorites/me", headers=headers)
+
+    assert resp.status_code == 200
+    assert set(resp.json()["book_ids"]) == {str(books[0].id), str(books[1].id)}
+    assert [b["id"] for b in mine.json()] == [str(books[1].id)]
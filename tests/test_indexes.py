@@ -0,0 +1,96 @@
+import json
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import IntegrityError
+
+from src.core.database import Base, engine
+from src.api.models.bookdb import Book
+from src.api.models.favorite import Favorite
+from src.api.models.reservation import Reservation
+from src.api.models.review import Review
+
+
+def _index_names(plan) -> set[str]:
+    names = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return names
+
+
+async def _plan_indexes(stmt) -> set[str]:
+    """Індекси з плану запиту (seq scan вимкнено, щоб не залежати від розміру таблиць)."""
+    compiled = stmt.compile(engine.sync_engine)
+    params = [compiled.params[name] for name in compiled.positiontup]
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        await conn.execute(text("ANALYZE"))
+        raw = await conn.get_raw_connection()
+        plan = await raw.driver_connection.fetchval(f"EXPLAIN (FORMAT JSON) {compiled}", *params)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _index_names(plan[0]["Plan"])
+
+
+@pytest.mark.parametrize("stmt, index", [
+    (select(Reservation.id).where(Reservation.user_id == uuid4()), "ix_reservations_user_id"),
+    (
+        select(Reservation.id).where(Reservation.until <= date.today() + timedelta(days=2)),
+        "ix_reservations_until",
+    ),
+    (
+        select(Review.id).where(Review.book_id == uuid4()).order_by(Review.created_at.desc()),
+        "ix_reviews_book_id_created_at",
+    ),
+    (select(Book.id).where(Book.genres.overlap(["history"])), "ix_books_genres"),
+    (
+        select(Book.id).where(Book.search_vector.op("@@")(func.to_tsquery("simple", "book:*"))),
+        "ix_books_search_vector",
+    ),
+    (
+        select(Favorite.book_id).where(Favorite.user_id == uuid4(), Favorite.book_id == uuid4()),
+        "favorites_pkey",
+    ),
+])
+async def test_hot_predicates_use_indexes(db, make_books, stmt, index):
+    await make_books(30)
+
+    assert index in await _plan_indexes(stmt)
+
+
+async def test_favorites_are_unique_per_user(db, session, make_books, make_user):
+    user, _ = await make_user()
+    [book] = await make_books(1)
+
+    session.add(Favorite(user_id=user.id, book_id=book.id))
+    await session.commit()
+    session.expunge_all()
+    session.add(Favorite(user_id=user.id, book_id=book.id))
+    with pytest.raises(IntegrityError):
+        await session.commit()
+
+
+async def test_migrations_match_models(db):
+    def diff(connection):
+        context = MigrationContext.configure(connection)
+        return compare_metadata(context, Base.metadata)
+
+    async with engine.connect() as conn:
+        changes = await conn.run_sync(diff)
+
+    # функціональний індекс alembic не порівнює, а триграмні існують лише з pg_trgm
+    skipped = {"ix_books_average_rating_id", "ix_books_title_trgm", "ix_books_author_trgm"}
+    changes = [
+        c for c in changes
+        if not (isinstance(c, tuple) and c[0] in ("add_index", "remove_index")
+                and c[1].name in skipped)
+    ]
+    assert changes == []
@@ -0,0 +1,29 @@
+from benchmarks import load
+from benchmarks.stats import compare
+
+
+async def test_every_scenario_runs_and_storm_does_not_oversell(db):
+    result = await load.run(
+        list(load.SCENARIOS), concurrency=4, duration=0.3, warmup=0,
+        books=30, review_count=25, hot_copies=3,
+    )
+
+    scenarios = result["scenarios"]
+    assert set(scenarios) == set(load.SCENARIOS)
+    for name, stats in scenarios.items():
+        assert stats["requests"] > 0, name
+        assert stats["errors"] == 0, (name, stats["statuses"])
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    storm = scenarios["reservation_storm"]
+    assert storm["statuses"]["201"] == 3
+    assert storm["check"] == {"total_copies": 3, "reserved_count": 3, "reservations": 3, "oversold": False}
+
+
+def test_compare_reports_change_against_baseline():
+    current = {"catalog": {"rps": 110.0, "p50_ms": 4.0, "p95_ms": 9.0, "p99_ms": 20.0}, "new": {}}
+    baseline = {"catalog": {"rps": 100.0, "p50_ms": 5.0, "p95_ms": 9.0, "p99_ms": 0.0}}
+
+    assert compare(current, baseline) == {
+        "catalog": {"rps": 10.0, "p50_ms": -20.0, "p95_ms": 0.0, "p99_ms": None},
+    }
@@ -0,0 +1,154 @@
+import socket
+from datetime import datetime
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+
+from src.core import mailer
+from src.core.mailer import SMTPConnectionPool
+from src.api.models.mail_outbox import MailOutbox, MailStatus
+from src.api.routes import reservations as reservations_route
+from src.services import mail_outbox_service
+from src.services.mail_outbox_service import MailOutboxWorker, enqueue_email
+
+
+class RecordingHandler:
+    """Локальний SMTP-сервер-заглушка: запам'ятовує листи та кількість сесій."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_pool(host, port, size=1):
+    return SMTPConnectionPool(size=size, hostname=host, port=port,
+                              username=None, password=None, start_tls=False)
+
+
+async def test_worker_batches_over_one_reused_connection(session, smtp_server, monkeypatch):
+    monkeypatch.setattr(mailer, "EMAIL_FROM", "library@test.com")
+    controller, handler = smtp_server
+    for i in range(6):
+        enqueue_email(session, f"reader{i}@test.com", "Тема", "Текст")
+    await session.commit()
+
+    worker = MailOutboxWorker(pool=make_pool(controller.hostname, controller.port), batch_size=4)
+    assert await worker.process_batch() == 4
+    assert await worker.process_batch() == 2
+    assert await worker.process_batch() == 0
+    await worker.pool.close()
+
+    assert len(handler.messages) == 6
+    assert handler.sessions == 1
+    assert worker.metrics["sent"] == 6
+    statuses = (await session.execute(select(MailOutbox.status))).scalars().all()
+    assert statuses == [MailStatus.sent] * 6
+
+
+async def test_failed_delivery_backs_off_then_gives_up(session, monkeypatch):
+    monkeypatch.setattr(mail_outbox_service, "MAIL_MAX_ATTEMPTS", 2)
+    mail = enqueue_email(session, "reader@test.com", "Тема", "Текст")
+    await session.commit()
+    mail_id = mail.id
+
+    # порт, на якому ніхто не слухає
+    worker = MailOutboxWorker(pool=make_pool("127.0.0.1", 1))
+    assert await worker.process_batch() == 1
+
+    row = (await session.execute(
+        select(MailOutbox.status, MailOutbox.attempts, MailOutbox.next_attempt_at)
+        .where(MailOutbox.id == mail_id)
+    )).one()
+    assert row.status == MailStatus.pending and row.attempts == 1
+    assert row.next_attempt_at > datetime.utcnow()
+    # ще не час для повтору
+    assert await worker.process_batch() == 0
+
+    await session.execute(
+        MailOutbox.__table__.update().values(next_attempt_at=datetime.utcnow())
+    )
+    await session.commit()
+    assert await worker.process_batch() == 1
+    status = await session.scalar(select(MailOutbox.status).where(MailOutbox.id == mail_id))
+    assert status == MailStatus.failed
+    assert worker.metrics == {**worker.metrics, "retried": 1, "failed": 1, "sent": 0}
+
+
+class ProbePool:
+    """Пул-заглушка: під час «відправки» дивиться на рядок з іншої сесії."""
+
+    def __init__(self, probe):
+        self.probe = probe
+        self.seen = []
+
+    async def send(self, message):
+        self.seen.append(await self.probe())
+
+    async def close(self):
+        pass
+
+
+async def test_batch_is_leased_and_sent_outside_a_transaction(session):
+    mail = enqueue_email(session, "reader@test.com", "Тема", "Текст")
+    await session.commit()
+    mail_id = mail.id
+
+    async def probe():
+        # NOWAIT упав би, якби воркер тримав FOR UPDATE під час SMTP
+        row = (await session.execute(
+            select(MailOutbox.attempts, MailOutbox.next_attempt_at)
+            .where(MailOutbox.id == mail_id)
+            .with_for_update(nowait=True)
+        )).one()
+        await session.rollback()
+        return row
+
+    worker = MailOutboxWorker(pool=ProbePool(probe))
+    assert await worker.process_batch() == 1
+
+    [(attempts, leased_until)] = worker.pool.seen
+    assert attempts == 1 and leased_until > datetime.utcnow()
+    row = (await session.execute(
+        select(MailOutbox.status, MailOutbox.attempts).where(MailOutbox.id == mail_id)
+    )).one()
+    assert (row.status, row.attempts) == (MailStatus.sent, 1)
+
+
+async def test_reservation_queues_mail_instead_of_sending(api, session, make_books, monkeypatch):
+    notified = []
+    monkeypatch.setattr(reservations_route.mail_worker, "notify", lambda: notified.append(True))
+    [book] = await make_books(1, total_copies=1, reserved_count=0)
+
+    resp = await api.post(
+        "/api/reservations/",
+        json={"book_id": str(book.id)},
+        headers={"X-User-Email": "queued@test.com"},
+    )
+
+    assert resp.status_code == 201
+    queued = (await session.execute(select(MailOutbox))).scalars().all()
+    assert [m.to_email for m in queued] == ["queued@test.com"]
+    assert "Book 000" in queued[0].body
+    assert notified == [True]
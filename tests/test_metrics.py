@@ -0,0 +1,55 @@
+from collections import Counter
+
+from prometheus_client import REGISTRY
+
+from src.core.metrics import RequestDbStats, warn_query_budget
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_route_latency_and_queries_per_request(api, make_books):
+    books = await make_books(3)
+    labels = {"method": "POST", "route": "/api/books/batch"}
+    requests_before = sample("http_request_duration_seconds_count", status="200", **labels)
+    queries_before = sample("http_request_db_queries_sum", **labels)
+
+    resp = await api.post("/api/books/batch", json={"ids": [str(b.id) for b in books]})
+
+    assert resp.status_code == 200
+    assert sample("http_request_duration_seconds_count", status="200", **labels) == requests_before + 1
+    # одна книга чи три — один SQL-запит
+    assert sample("http_request_db_queries_sum", **labels) == queries_before + 1
+    assert sample("http_requests_in_flight") == 0
+
+
+async def test_metrics_endpoint_exposes_prometheus_text(api, make_books):
+    [book] = await make_books(1)
+    await api.get(f"/api/books/{book.id}")
+    await api.get("/api/no-such-route")
+
+    resp = await api.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'route="/api/books/{book_id}"' in body
+    assert str(book.id) not in body
+    assert 'route="unmatched",status="404"' in body
+    assert "db_pool_checked_out" in body
+    assert "db_queries_total" in body
+
+
+def test_repeated_statements_are_reported_as_n_plus_one(capsys):
+    stats = RequestDbStats(queries=12, statements=Counter({
+        "SELECT books.id FROM books WHERE books.id = $1": 11,
+        "SELECT users.id FROM users": 1,
+    }))
+
+    warn_query_budget("DELETE", "/api/reservations/clear/all", stats)
+
+    out = capsys.readouterr().out
+    assert "12 queries" in out
+    assert "possible N+1, 11x SELECT books.id" in out
+    assert "FROM users" not in out
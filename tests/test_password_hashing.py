@@ -0,0 +1,32 @@
+import asyncio
+
+from src.core import security
+
+
+async def test_async_hash_roundtrip():
+    hashed = await security.hash_password_async("secret123")
+    assert await security.verify_password_async("secret123", hashed)
+    assert not await security.verify_password_async("wrong123", hashed)
+
+
+async def test_hashing_does_not_block_event_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(security.hash_password_async("secret123") for _ in range(2)))
+    task.cancel()
+
+    # поки bcrypt рахувався в пулі, event loop продовжував обробляти інші задачі
+    assert ticks > 5
+
+
+async def test_unusable_hash_is_computed_once():
+    first = await security.unusable_password_hash()
+    assert await security.unusable_password_hash() is first
+    assert not security.verify_password("autogenerated", first)
@@ -0,0 +1,203 @@
+"""
+Бюджет SQL-запитів для кожного маршруту src/api/routes.
+
+Дані засіваються у кількох розмірах; кількість запитів має вкладатися в бюджет
+і не залежати від розміру (інакше — N+1). Рахує MetricsMiddleware
+(заголовок X-DB-Queries у режимі DB_QUERY_DEBUG).
+"""
+import io
+from functools import cache
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+
+from src.api.models.favorite import Favorite
+from src.api.models.reservation import Reservation
+from src.api.models.review import Review
+from src.api.models.user import User, UserRole
+from src.core import metrics
+from src.core.auth_cache import user_cache
+from src.core.catalog_cache import catalog_cache
+from src.core.security import hash_password
+from src.core.storage import LocalStorage
+from src.services import cover_service, ebook_service
+
+SIZES = [1, 8, 32]
+
+PASSWORD = "secret123"
+
+# Потоковий експорт робить по запиту на пачку — кількість росте з каталогом за задумом
+UNBUDGETED = {("GET", "/api/books/export")}
+
+PDF = b"%PDF-1.4\n" + b"0" * 1024 + b"\n%%EOF\n"
+
+
+@cache
+def _password_hash() -> str:
+    # bcrypt повільний — один хеш на всю сесію
+    return hash_password(PASSWORD)
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 96), (10, 120, 200)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class Case:
+    method: str
+    path: str
+    budget: int
+    request: Callable[[SimpleNamespace], dict] = lambda d: {}
+    # бюджет рахується лише для успішної відповіді — 4xx не виконує маршрут повністю
+    status: int = 200
+
+    def __str__(self):
+        return f"{self.method} {self.path}"
+
+
+CASES = [
+    # books
+    Case("GET", "/api/books/", 1),
+    Case("GET", "/api/books/?limit=20", 1, lambda d: {"params": {"limit": 20}}),
+    Case("GET", "/api/books/search", 1, lambda d: {"params": {"genres": ["history"], "limit": 20}}),
+    Case("GET", "/api/books/search/text", 2, lambda d: {"params": {"q": "book"}}),
+    Case("GET", "/api/books/batch", 1, lambda d: {"params": {"ids": d.book_ids}}),
+    Case("POST", "/api/books/batch", 1, lambda d: {"json": {"ids": d.book_ids}}),
+    Case("GET", "/api/books/{book_id}", 1, lambda d: {"url": f"/api/books/{d.book.id}"}),
+    Case("POST", "/api/books/", 3, lambda d: {
+        "json": {"title": "New", "author": "A", "isbn": "new-isbn", "total_copies": 1},
+        "headers": d.librarian,
+    }),
+    Case("PUT", "/api/books/{book_id}", 4, lambda d: {
+        "url": f"/api/books/{d.book.id}", "json": {"title": "Renamed"}, "headers": d.librarian,
+    }),
+    Case("POST", "/api/books/import", 4, lambda d: {
+        "params": {"format": "ndjson"},
+        "content": b'{"title": "T", "author": "A", "isbn": "imp-1", "total_copies": 1}\n',
+        "headers": d.librarian,
+    }),
+    # reservations
+    Case("POST", "/api/reservations/", 4, lambda d: {
+        "json": {"book_id": str(d.book.id)}, "headers": {"X-User-Email": d.reader.email},
+    }, status=201),
+    Case("GET", "/api/reservations/me", 2, lambda d: {"headers": {"X-User-Email": d.reader.email}}),
+    Case("DELETE", "/api/reservations/{reservation_id}", 2, lambda d: {
+        "url": f"/api/reservations/{d.reservation_id}",
+    }, status=204),
+    Case("DELETE", "/api/reservations/clear/all", 1, lambda d: {"headers": {"X-User-Email": d.reader.email}}, status=204),
+    Case("POST", "/api/reservations/cancel/bulk", 2, lambda d: {
+        "json": {"book_id": str(d.book.id)}, "headers": d.librarian,
+    }),
+    # reviews
+    Case("POST", "/api/books/{book_id}/reviews", 5, lambda d: {
+        "url": f"/api/books/{d.book.id}/reviews", "json": {"rating": 4}, "headers": d.reader_auth,
+    }, status=201),
+    Case("GET", "/api/books/{book_id}/reviews", 3, lambda d: {"url": f"/api/books/{d.book.id}/reviews"}),
+    Case("DELETE", "/api/books/reviews/{review_id}", 2, lambda d: {"url": f"/api/books/reviews/{d.review_id}"}, status=204),
+    # reminders
+    Case("GET", "/api/reminders/", 1),
+    Case("POST", "/api/reminders/send", 5, lambda d: {"headers": d.librarian}),
+    # favorites
+    Case("POST", "/api/favorites/me", 2, lambda d: {"json": {"book_id": str(d.book.id)}, "headers": d.reader_auth}, status=201),
+    Case("GET", "/api/favorites/me", 2, lambda d: {"headers": d.reader_auth}),
+    Case("GET", "/api/favorites/me/lookup", 2, lambda d: {"params": {"book_ids": d.book_ids}, "headers": d.reader_auth}),
+    Case("GET", "/api/favorites/me/count", 2, lambda d: {"headers": d.reader_auth}),
+    Case("DELETE", "/api/favorites/me/{book_id}", 2, lambda d: {
+        "url": f"/api/favorites/me/{d.book.id}", "headers": d.reader_auth,
+    }, status=204),
+    Case("DELETE", "/api/favorites/me", 2, lambda d: {"headers": d.reader_auth}, status=204),
+    # users
+    Case("POST", "/api/users/register", 2, lambda d: {
+        "json": {"email": "new@test.com", "password": "secret123", "role": "user"},
+    }, status=201),
+    Case("POST", "/api/users/login", 1, lambda d: {"json": {"email": d.reader.email, "password": PASSWORD}}),
+    # ebooks and covers
+    Case("PUT", "/api/books/{book_id}/pdf", 3, lambda d: {
+        "url": f"/api/books/{d.book.id}/pdf", "content": PDF, "headers": d.librarian,
+    }),
+    Case("GET", "/api/books/{book_id}/pdf", 1, lambda d: {"url": f"/api/books/{d.book.id}/pdf"}),
+    Case("PUT", "/api/books/{book_id}/cover", 3, lambda d: {
+        "url": f"/api/books/{d.book.id}/cover", "content": _png(), "headers": d.librarian,
+    }),
+]
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"n{n}")
+async def dataset(request, session, make_books, make_user, tmp_path, monkeypatch):
+    """
+    n книг, кожна зарезервована й у обраному читача; n відгуків різних
+    користувачів на першу книгу. Кеш каталогу вимкнено — рахуємо запити до БД.
+    """
+    n = request.param
+    monkeypatch.setattr(metrics, "DB_QUERY_DEBUG", True)
+    monkeypatch.setattr(cover_service, "cover_storage", LocalStorage(tmp_path / "covers"))
+    ebooks = LocalStorage(tmp_path / "ebooks")
+    monkeypatch.setattr(ebook_service, "ebook_storage", ebooks)
+    monkeypatch.setattr(catalog_cache, "enabled", False)
+
+    books = await make_books(n, total_copies=n + 5, reserved_count=1)
+    reader, reader_auth = await make_user()
+    reader.password_hash = _password_hash()
+    _, librarian = await make_user("lib@test.com", role=UserRole.librarian)
+    authors = [User(id=uuid4(), email=f"author{i}@test.com", password_hash="x") for i in range(n)]
+
+    reservations = [
+        Reservation(id=uuid4(), user_id=reader.id, book_id=book.id, until=date.today() + timedelta(days=1))
+        for book in books
+    ]
+    reviews = [
+        Review(id=uuid4(), user_id=author.id, book_id=books[0].id, rating=5, comment="", created_at=datetime.utcnow())
+        for author in authors
+    ]
+    books[0].review_count, books[0].rating_sum = n, 5 * n
+    books[0].pdf_path = (await ebooks.store(_chunks(PDF), suffix=".pdf")).key
+    session.add_all([*authors, *reservations, *reviews, *(Favorite(user_id=reader.id, book_id=b.id) for b in books)])
+    await session.commit()
+    # авторизація кешується — перший запит кожного тесту платить за lookup однаково
+    user_cache.clear()
+
+    return SimpleNamespace(
+        book=books[0],
+        book_ids=[str(b.id) for b in books],
+        reader=reader,
+        reader_auth=reader_auth,
+        librarian=librarian,
+        reservation_id=reservations[0].id,
+        review_id=reviews[0].id,
+    )
+
+
+@pytest.mark.parametrize("case", CASES, ids=str)
+async def test_route_stays_within_query_budget(api, dataset, case):
+    options = case.request(dataset)
+    url = options.pop("url", case.path)
+
+    resp = await api.request(case.method, url, **options)
+
+    assert resp.status_code == case.status, resp.text
+    queries = int(resp.headers["x-db-queries"])
+    assert queries <= case.budget, f"{case}: {queries} queries, budget {case.budget}"
+
+
+def test_every_route_has_a_budget():
+    from src.api.main import app
+
+    covered = {(case.method, case.path.split("?")[0]) for case in CASES}
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if getattr(route, "endpoint", None) and route.endpoint.__module__.startswith("src.api.routes")
+        for method in route.methods - {"HEAD"}
+    }
+    assert routes - covered - UNBUDGETED == set()
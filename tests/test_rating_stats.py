@@ -0,0 +1,56 @@
+from src.api.models.bookdb import Book
+
+
+async def test_review_writes_maintain_book_aggregates(api, make_books, make_user):
+    [book] = await make_books(1)
+    _, headers = await make_user()
+    url = f"/api/books/{book.id}/reviews"
+
+    first = await api.post(url, json={"rating": 5, "comment": "!"}, headers=headers)
+    await api.post(url, json={"rating": 2}, headers=headers)
+
+    stats = (await api.get(url)).json()
+    assert (stats["count"], stats["average_rating"]) == (2, 3.5)
+    book_json = (await api.get(f"/api/books/{book.id}")).json()
+    assert (book_json["review_count"], book_json["average_rating"]) == (2, 3.5)
+
+    assert (await api.delete(f"/api/books/reviews/{first.json()['id']}")).status_code == 204
+    stats = (await api.get(url)).json()
+    assert (stats["count"], stats["average_rating"]) == (1, 2.0)
+
+
+async def test_review_for_missing_book_is_404(api, make_user):
+    _, headers = await make_user()
+    resp = await api.post(
+        "/api/books/00000000-0000-0000-0000-000000000000/reviews",
+        json={"rating": 3},
+        headers=headers,
+    )
+    assert resp.status_code == 404
+
+
+async def test_catalog_sorted_by_rating_pages_stably(api, session):
+    ratings = [(4, 17), (1, 5), (0, 0), (2, 10), (3, 9), (2, 10)]
+    for i, (count, total) in enumerate(ratings):
+        session.add(Book(title=f"B{i}", author="A", isbn=f"r-{i}", total_copies=1,
+                         review_count=count, rating_sum=total))
+    await session.commit()
+
+    items, cursor = [], None
+    while True:
+        params = {"sort": "rating", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await api.get("/api/books/", params=params)).json()
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    averages = [b["average_rating"] for b in items]
+    assert len(items) == len(ratings)
+    assert averages == sorted(averages, reverse=True)
+    assert averages[0] == 5.0 and averages[-1] == 0.0
+
+    # курсор від іншого сортування не приймається
+    title_cursor = (await api.get("/api/books/", params={"limit": 1})).json()["next_cursor"]
+    resp = await api.get("/api/books/", params={"sort": "rating", "cursor": title_cursor})
+    assert resp.status_code == 400
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from src.api.models.mail_outbox import MailOutbox
+from src.api.models.reservation import Reservation
+from src.api.models.user import UserRole
+from src.services import reminder_service
+from src.services.reminder_service import send_reminders
+
+
+async def _reserve(session, user, book, days_left):
+    reservation = Reservation(user_id=user.id, book_id=book.id, until=date.today() + timedelta(days=days_left))
+    session.add(reservation)
+    await session.commit()
+    return reservation
+
+
+async def test_digest_per_user_and_incremental_reruns(session, make_books, make_user):
+    alice, _ = await make_user("alice@test.com")
+    bob, _ = await make_user("bob@test.com")
+    books = await make_books(4)
+    await _reserve(session, alice, books[0], 0)
+    await _reserve(session, alice, books[1], 2)
+    await _reserve(session, alice, books[2], 10)
+    late = await _reserve(session, bob, books[3], -1)
+
+    first = await send_reminders(session)
+    again = await send_reminders(session)
+
+    assert first == {"users": 2, "reservations": 3, "skipped": False}
+    assert again == {"users": 0, "reservations": 0, "skipped": False}
+
+    mails = {m.to_email: m for m in (await session.scalars(select(MailOutbox))).all()}
+    assert set(mails) == {"alice@test.com", "bob@test.com"}
+    assert "Book 000" in mails["alice@test.com"].body and "Book 001" in mails["alice@test.com"].body
+    assert "Book 002" not in mails["alice@test.com"].body
+    assert "термін минув" in mails["bob@test.com"].body
+
+    # продовження резервації — нове нагадування
+    late.until = date.today() + timedelta(days=1)
+    await session.commit()
+    assert (await send_reminders(session))["reservations"] == 1
+
+
+async def test_digest_spans_stream_batches(session, make_books, make_user, monkeypatch):
+    monkeypatch.setattr(reminder_service, "REMINDER_BATCH_SIZE", 3)
+    users = [(await make_user(f"u{i}@test.com"))[0] for i in range(3)]
+    books = await make_books(12)
+    for i, book in enumerate(books):
+        await _reserve(session, users[i % 3], book, 1)
+
+    result = await send_reminders(session)
+
+    assert result == {"users": 3, "reservations": 12, "skipped": False}
+    assert await session.scalar(select(Reservation).where(Reservation.reminder_sent_for.is_(None))) is None
+
+
+async def test_reminder_endpoints(api, session, make_books, make_user):
+    reader, reader_headers = await make_user()
+    _, librarian_headers = await make_user("lib@test.com", role=UserRole.librarian)
+    [book] = await make_books(1)
+    await _reserve(session, reader, book, 1)
+
+    listed = await api.get("/api/reminders/")
+    forbidden = await api.post("/api/reminders/send", headers=reader_headers)
+    sent = await api.post("/api/reminders/send", headers=librarian_headers)
+
+    assert [r["days_left"] for r in listed.json()] == [1]
+    assert forbidden.status_code == 403
+    assert sent.json()["users"] == 1
@@ -0,0 +1,70 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, func
+
+from src.core.database import async_session_maker
+from src.api.models.bookdb import Book
+from src.api.models.reservation import Reservation
+from src.api.routes import reservations as reservations_route
+from src.services.reservations_service import create_reservation_for_user
+
+
+async def test_concurrent_reservations_never_oversell(session, make_books, make_user):
+    """Стрес-тест: 60 корутин б'ють в одну книгу з 5 копіями."""
+    [book] = await make_books(1, total_copies=5, reserved_count=0)
+    book_id = book.id
+    user, _ = await make_user()
+    user_id = user.id
+
+    async def attempt():
+        async with async_session_maker() as s:
+            try:
+                await create_reservation_for_user(s, user_id, book_id)
+                return "ok"
+            except HTTPException as exc:
+                return exc.status_code
+
+    outcomes = await asyncio.gather(*(attempt() for _ in range(60)))
+
+    assert outcomes.count("ok") == 5
+    assert outcomes.count(409) == 55
+
+    reserved = await session.scalar(select(Book.reserved_count).where(Book.id == book_id))
+    rows = await session.scalar(select(func.count(Reservation.id)).where(Reservation.book_id == book_id))
+    assert reserved == rows == 5
+
+
+async def test_unknown_book_and_user(session, make_books):
+    [book] = await make_books(1, total_copies=1, reserved_count=0)
+    book_id = book.id
+
+    with pytest.raises(HTTPException) as exc:
+        await create_reservation_for_user(session, uuid4(), uuid4())
+    assert exc.value.status_code == 404
+
+    with pytest.raises(HTTPException) as exc:
+        await create_reservation_for_user(session, uuid4(), book_id)
+    assert exc.value.detail == "User not found"
+
+    assert await session.scalar(select(Book.reserved_count).where(Book.id == book_id)) == 0
+
+
+async def test_reserve_and_cancel_via_api(api, session, make_books, monkeypatch):
+    monkeypatch.setattr(reservations_route.mail_worker, "notify", lambda: None)
+    [book] = await make_books(1, total_copies=2, reserved_count=0)
+    book_id = book.id
+
+    resp = await api.post(
+        "/api/reservations/",
+        json={"book_id": str(book_id)},
+        headers={"X-User-Email": "New@Reader.com"},
+    )
+    assert resp.status_code == 201
+    assert await session.scalar(select(Book.reserved_count).where(Book.id == book_id)) == 1
+
+    resp = await api.delete(f"/api/reservations/{resp.json()['id']}")
+    assert resp.status_code == 204
+    assert await session.scalar(select(Book.reserved_count).where(Book.id == book_id)) == 0
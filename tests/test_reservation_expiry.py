@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import DBAPIError
+
+from src.core.database import engine
+from src.api.models.bookdb import Book
+from src.api.models.reservation import Reservation
+from src.services import reservation_expiry_service
+from src.services.reservation_expiry_service import ReservationSweeper, EXPIRY_LOCK_ID
+
+
+async def _reserve(session, user, book, days_left):
+    session.add(Reservation(user_id=user.id, book_id=book.id, until=date.today() + timedelta(days=days_left)))
+    book.reserved_count = (book.reserved_count or 0) + 1
+    await session.commit()
+
+
+async def test_sweep_releases_lapsed_reservations_in_batches(session, make_books, make_user):
+    user, _ = await make_user()
+    books = await make_books(3, total_copies=5, reserved_count=0)
+    book_ids = [b.id for b in books]
+    for _ in range(3):
+        await _reserve(session, user, books[0], -1)
+    await _reserve(session, user, books[1], -3)
+    await _reserve(session, user, books[1], 0)
+    await _reserve(session, user, books[2], 1)
+
+    report = await ReservationSweeper(batch_size=2).sweep()
+
+    assert report["locked"] is True
+    assert report["reservations"] == 4
+    assert report["books"] == 2
+
+    session.expire_all()
+    counts = dict((await session.execute(
+        select(Book.id, Book.reserved_count).where(Book.id.in_(book_ids))
+    )).all())
+    assert [counts[i] for i in book_ids] == [0, 1, 1]
+    assert await session.scalar(select(func.count()).select_from(Reservation)) == 2
+
+
+async def test_sweep_skips_when_another_worker_holds_the_lock(db):
+    sweeper = ReservationSweeper()
+    async with engine.connect() as other:
+        await other.execute(text("SELECT pg_advisory_lock(:id)"), {"id": EXPIRY_LOCK_ID})
+        report = await sweeper.sweep()
+        await other.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": EXPIRY_LOCK_ID})
+
+    assert report == {"locked": False, "reservations": 0, "books": 0}
+    assert sweeper.metrics["skipped"] == 1
+    assert (await sweeper.sweep())["locked"] is True
+
+
+async def test_failed_batch_surfaces_its_error_and_releases_the_lock(db, monkeypatch):
+    monkeypatch.setattr(
+        reservation_expiry_service, "expire_batch_statement", lambda today, size: text("SELECT 1 / 0")
+    )
+
+    with pytest.raises(DBAPIError, match="division by zero"):
+        await ReservationSweeper().sweep()
+
+    async with engine.connect() as other:
+        assert await other.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": EXPIRY_LOCK_ID})
+        await other.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": EXPIRY_LOCK_ID})
@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+from dataclasses import replace
+from datetime import date
+
+from sqlalchemy import func, select
+
+from src.api.models.bookdb import Book
+from src.api.models.favorite import Favorite
+from src.api.models.reservation import Reservation
+from src.api.models.review import Review
+from src.core import synthetic_data
+from src.core.seed import seed_synthetic
+from src.core.synthetic_data import Dataset
+
+DATA = Dataset(seed=3, books=1_000, users=200, password_hash="x", today=date(2025, 1, 1))
+
+
+def test_rows_depend_only_on_seed_and_chunk():
+    first = synthetic_data.activity_rows(DATA, 1, 100, 200)
+    again = synthetic_data.activity_rows(DATA, 1, 100, 200)
+    other = synthetic_data.activity_rows(replace(DATA, seed=4), 1, 100, 200)
+
+    assert first == again
+    assert first[1] != other[1]
+    assert list(synthetic_data.book_rows(DATA, 0, 0, 50)) == list(synthetic_data.book_rows(DATA, 0, 0, 50))
+
+
+def test_book_popularity_is_skewed():
+    rng = random.Random(1)
+    picks = Counter(synthetic_data.zipf_index(rng, 10_000) for _ in range(20_000))
+
+    top = sum(count for index, count in picks.items() if index < 100)
+    assert top > 0.4 * 20_000
+    assert max(picks) < 10_000
+
+
+async def test_synthetic_seed_loads_consistent_dataset(session):
+    counts = await seed_synthetic("1k", seed_value=3, workers=1, truncate=True)
+
+    assert counts["books"] == 1_000 and counts["users"] == 200
+    for model in (Reservation, Review, Favorite):
+        total = await session.scalar(select(func.count()).select_from(model))
+        assert total == counts[model.__tablename__] > 0
+
+    reserved = select(func.count()).where(Reservation.book_id == Book.id).scalar_subquery()
+    reviewed = select(func.count()).where(Review.book_id == Book.id).scalar_subquery()
+    broken = await session.scalar(
+        select(func.count()).select_from(Book).where(
+            (Book.reserved_count > Book.total_copies)
+            | (Book.reserved_count != reserved)
+            | (Book.review_count != reviewed)
+        )
+    )
+    assert broken == 0